@@ -14,6 +14,14 @@ import { useSearchParams } from "next/navigation";
 import { useStore } from "@/lib/store";
 import { SimulationStatusModel } from "@/lib/types";
 
+function formatDuration(seconds: number): string {
+  const total = Math.ceil(seconds);
+  if (total < 60) return `${total}s`;
+  const minutes = Math.floor(total / 60);
+  if (minutes < 60) return `${minutes}m ${total % 60}s`;
+  return `${Math.floor(minutes / 60)}h ${minutes % 60}m`;
+}
+
 function SimulationLogDialog({ simulations, configName }: { 
   simulations: SimulationStatusModel[], 
   configName: string 
@@ -39,6 +47,9 @@ function SimulationLogDialog({ simulations, configName }: {
                     {sim.state}
                   </Badge>
                   <span className="text-sm">{sim.progress}%</span>
+                  {sim.reason && (
+                    <span className="text-xs text-muted-foreground">{sim.reason}</span>
+                  )}
                 </div>
                 <span className="text-xs text-muted-foreground">
                   {new Date(sim.created_at).toLocaleString()}
@@ -271,6 +282,14 @@ export function SimulationList() {
                         <span>{runningSimulation.progress}%</span>
                       </div>
                       <Progress value={runningSimulation.progress} className="h-3" />
+                      {runningSimulation.eta_seconds != null && (
+                        <div className="flex items-center justify-between text-sm text-muted-foreground">
+                          <span>
+                            {runningSimulation.completed_cases} of {runningSimulation.total_cases} cases
+                          </span>
+                          <span>About {formatDuration(runningSimulation.eta_seconds)} remaining</span>
+                        </div>
+                      )}
                     </div>
                   </div>
                 );
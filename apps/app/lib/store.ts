@@ -220,7 +220,13 @@ export const useStore = create<AppStore>()(
 
 				ws.onmessage = (event) => {
 					try {
-						const data: SimulationStatusModel = JSON.parse(event.data);
+						const message = JSON.parse(event.data);
+						// Reply to server heartbeats so the connection is not closed as idle
+						if (message.type === "heartbeat") {
+							ws.send("pong");
+							return;
+						}
+						const data: SimulationStatusModel = message;
 						// Ensure progress is properly handled - backend might send exact values
 						const normalizedData = {
 							...data,
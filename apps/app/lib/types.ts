@@ -23,6 +23,7 @@ export interface ParameterSweepConfigurationRequest {
 	name: string;
 	description: string;
 	parameters: ParameterModel[];
+	ordering?: "cartesian" | "grouped" | "gray";
 }
 
 export interface ParameterSweepConfigurationModel
@@ -34,7 +35,11 @@ export interface SimulationStatusModel {
 	id: string;
 	config_id: string;
 	progress: number;
-	state: "QUEUED" | "RUNNING" | "COMPLETED" | "FAILED";
+	completed_cases?: number | null;
+	total_cases?: number | null;
+	eta_seconds?: number | null;
+	state: "QUEUED" | "RUNNING" | "COMPLETED" | "FAILED" | "STOPPED";
+	reason?: string | null;
 	created_at: string;
 }
 
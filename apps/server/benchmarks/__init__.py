@@ -0,0 +1,4 @@
+"""Benchmarks for the server's hot paths.
+
+Run with `python -m benchmarks run` from `apps/server`; see `python -m benchmarks --help`.
+"""
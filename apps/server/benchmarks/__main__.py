@@ -0,0 +1,71 @@
+"""Command line entry point for the benchmark suite."""
+
+import argparse
+import importlib
+import pkgutil
+import sys
+from pathlib import Path
+
+from . import harness
+
+
+def _load_benchmarks() -> None:
+    """Import every `bench_*` module so its benchmarks register themselves."""
+    for module in pkgutil.iter_modules([str(Path(__file__).parent)]):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"{__package__}.{module.name}")
+
+
+def _print_comparison(rows: list[dict], threshold: float) -> bool:
+    """Print a comparison table and return whether any benchmark regressed."""
+    print(f"\n{'benchmark':<60} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<60} {row['baseline'] * 1e6:>10.2f}us {row['current'] * 1e6:>10.2f}us "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\n{len(regressions)} of {len(rows)} benchmarks regressed by more than {threshold:.0%}")
+    return bool(regressions)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run or compare benchmarks."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run benchmarks and write JSON results")
+    run_parser.add_argument("-k", "--filter", help="only run cases whose name contains this")
+    run_parser.add_argument("-o", "--output", type=Path, default=Path(".benchmarks/latest.json"))
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    run_parser.add_argument("--rounds", type=int, default=5)
+    run_parser.add_argument("--baseline", type=Path, help="compare against these results")
+    run_parser.add_argument("--threshold", type=float, default=0.1, help="regression fraction")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        _load_benchmarks()
+        results = harness.run(args.filter, min_time=args.min_time, rounds=args.rounds)
+        harness.save(results, args.output)
+        print(f"\nResults written to {args.output}")
+        if args.baseline is None:
+            return 0
+        baseline, current, threshold = harness.load(args.baseline), results, args.threshold
+    else:
+        baseline, current = harness.load(args.baseline), harness.load(args.current)
+        threshold = args.threshold
+
+    rows = harness.compare(baseline, current, threshold)
+    return 1 if _print_comparison(rows, threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
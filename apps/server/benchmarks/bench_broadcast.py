@@ -0,0 +1,39 @@
+"""Benchmarks for fanning out status updates to WebSocket listeners."""
+
+import uuid
+from datetime import UTC, datetime
+
+from psc.simulation import SimulationManager
+from psc.simulation.connections import ConnectionRegistry
+
+from .harness import benchmark
+
+
+class FakeWebSocket:
+    """WebSocket stand-in that accepts every message without I/O."""
+
+    async def send_text(self, message: str) -> None:
+        """Discard the message."""
+        pass
+
+
+@benchmark("broadcast_status", sockets=[1, 10, 100, 1_000, 10_000])
+def bench_broadcast_status(sockets: int):
+    """Broadcast one status update to `sockets` listeners of a configuration."""
+    manager = SimulationManager(ConnectionRegistry(max_connections=0, max_per_config=0))
+    config_id = uuid.uuid4()
+    for _ in range(sockets):
+        manager.add_connection(config_id, FakeWebSocket())
+
+    status = {
+        "id": str(uuid.uuid4()),
+        "config_id": str(config_id),
+        "progress": 42,
+        "state": "RUNNING",
+        "created_at": datetime.now(UTC).isoformat(),
+    }
+
+    async def run():
+        await manager.broadcast_status(config_id, status)
+
+    return run
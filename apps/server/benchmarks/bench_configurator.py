@@ -0,0 +1,41 @@
+"""Benchmarks for loading and validating parameters."""
+
+from psc.configurator.registry import ParameterRegistry
+
+from .harness import benchmark
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def _parameter_data(key: str, n: int) -> dict:
+    match key:
+        case "angle_of_attack":
+            return {"key": key, "type": "float", "values": [i * 90.0 / n for i in range(n)]}
+        case "speed":
+            return {"key": key, "type": "float", "values": [float(i) for i in range(n)]}
+        case _:
+            models = ["k-epsilon", "k-omega"]
+            return {"key": key, "type": "enum", "values": [models[i % 2] for i in range(n)]}
+
+
+@benchmark("registry.load", key=["angle_of_attack", "turbulence_model"], n=SIZES)
+def bench_registry_load(key: str, n: int):
+    """Load a parameter with `n` values from its serialized form."""
+    registry = ParameterRegistry()
+    data = _parameter_data(key, n)
+
+    def run():
+        registry.load(data)
+
+    return run
+
+
+@benchmark("parameter.validate", key=["angle_of_attack", "turbulence_model"], n=SIZES)
+def bench_parameter_validate(key: str, n: int):
+    """Validate a parameter with `n` values against its allowed values and rules."""
+    parameter = ParameterRegistry().load(_parameter_data(key, n))
+
+    def run():
+        parameter.validate()
+
+    return run
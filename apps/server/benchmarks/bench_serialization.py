@@ -0,0 +1,40 @@
+"""Benchmarks for serializing configuration lists as returned by `GET /configs`."""
+
+import uuid
+from datetime import UTC, datetime
+
+from psc.server import serialize_configs
+from psc.storage import ConfigRecord
+
+from .harness import benchmark
+
+
+def _config(values_per_parameter: int) -> ConfigRecord:
+    n = values_per_parameter
+    angles = [float(i % 90) for i in range(n)]
+    return ConfigRecord(
+        id=uuid.uuid4(),
+        name="Wing Study",
+        description="Benchmark configuration",
+        parameters=[
+            {"key": "angle_of_attack", "type": "float", "values": angles},
+            {"key": "speed", "type": "float", "values": [float(i) for i in range(n)]},
+            {"key": "turbulence_model", "type": "enum", "values": ["k-epsilon", "k-omega"]},
+        ],
+        parameter_count=3,
+        parameters_hash=None,
+        ordering="cartesian",
+        created_at=datetime.now(UTC),
+        updated_at=datetime.now(UTC),
+    )
+
+
+@benchmark("get_configs.serialize", configs=[10, 100, 1_000], values=[10, 100])
+def bench_serialize_configs(configs: int, values: int):
+    """Serialize a list of stored configurations into response models."""
+    rows = [_config(values) for _ in range(configs)]
+
+    def run():
+        serialize_configs(rows)
+
+    return run
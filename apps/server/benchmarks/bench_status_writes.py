@@ -0,0 +1,73 @@
+"""Benchmarks for simulation status write throughput against each storage backend."""
+
+import tempfile
+import uuid
+from pathlib import Path
+
+from psc.storage import (
+    CaseRunRecord,
+    MemoryRepository,
+    Repository,
+    SQLiteRepository,
+    StatusRecord,
+    create_repository,
+)
+
+from .harness import SkipBenchmark, benchmark
+
+
+async def _repository(backend: str, directory: Path) -> Repository:
+    match backend:
+        case "memory":
+            return MemoryRepository()
+        case "sqlite":
+            return SQLiteRepository(directory / "bench.sqlite3")
+        case _:
+            from psc.db import DATABASE_URL
+
+            repository = create_repository(backend)
+            try:
+                await repository.start(warm_connections=1)
+            except Exception as e:
+                raise SkipBenchmark(f"database unavailable at {DATABASE_URL}") from e
+            return repository
+
+
+@benchmark("status_write", backend=["memory", "sqlite", "postgres"], cases=[0, 10, 100])
+async def bench_status_write(backend: str, cases: int):
+    """Store a status update with `cases` finished case runs, as `run_simulation` does."""
+    directory = tempfile.TemporaryDirectory(prefix="psc-bench-")
+    repository = await _repository(backend, Path(directory.name))
+    config_id = uuid.uuid4()
+
+    async def run():
+        await repository.add_status(
+            StatusRecord(config_id=config_id, progress=50, state="RUNNING"),
+            [
+                CaseRunRecord(
+                    config_id=config_id,
+                    case_index=index,
+                    parameters={"angle_of_attack": 5.0, "speed": 10.0},
+                    duration=1.0,
+                )
+                for index in range(cases)
+            ],
+        )
+
+    async def teardown():
+        if backend == "postgres":
+            # Keep benchmark case runs out of the runtime model's history
+            from sqlalchemy import delete
+
+            from psc.db import async_session_factory
+            from psc.schemas import CaseRun, SimulationStatus
+
+            async with async_session_factory() as session:
+                for table in (SimulationStatus, CaseRun):
+                    await session.execute(delete(table).where(table.config_id == config_id))
+                await session.commit()
+        await repository.close()
+        directory.cleanup()
+
+    run.teardown = teardown
+    return run
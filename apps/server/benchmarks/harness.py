@@ -0,0 +1,198 @@
+"""Minimal benchmark harness with machine-readable results and baseline comparison."""
+
+import asyncio
+import inspect
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark setup when its environment is unavailable."""
+
+    pass
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark, parametrized over a grid of arguments."""
+
+    name: str
+    setup: Callable
+    params: dict[str, list] = field(default_factory=dict)
+
+    def cases(self) -> list[tuple[str, dict]]:
+        """Expand the parameter grid into (case name, kwargs) pairs."""
+        if not self.params:
+            return [(self.name, {})]
+
+        keys = list(self.params)
+        cases = []
+        for values in itertools.product(*(self.params[key] for key in keys)):
+            kwargs = dict(zip(keys, values, strict=True))
+            label = ",".join(f"{key}={value}" for key, value in kwargs.items())
+            cases.append((f"{self.name}[{label}]", kwargs))
+        return cases
+
+
+_benchmarks: list[Benchmark] = []
+
+
+def benchmark(name: str, **params: list) -> Callable:
+    """Register a benchmark.
+
+    The decorated setup function receives one value of each parameter and returns the
+    callable (sync or async) to time, or an async setup returning it. Setup may raise
+    `SkipBenchmark` when a required service is unavailable.
+    """
+
+    def decorator(setup: Callable) -> Callable:
+        _benchmarks.append(Benchmark(name=name, setup=setup, params=params))
+        return setup
+
+    return decorator
+
+
+def registered() -> list[Benchmark]:
+    """Get all registered benchmarks."""
+    return list(_benchmarks)
+
+
+async def _time_case(target: Callable, min_time: float, rounds: int) -> dict:
+    """Time a callable, calibrating iterations so each round lasts at least `min_time`."""
+    is_async = inspect.iscoroutinefunction(target)
+
+    async def run(iterations: int) -> float:
+        start = time.perf_counter()
+        if is_async:
+            for _ in range(iterations):
+                await target()
+        else:
+            for _ in range(iterations):
+                target()
+        return time.perf_counter() - start
+
+    # Warm up and calibrate
+    iterations = 1
+    elapsed = await run(iterations)
+    while elapsed < min_time and iterations < 1_000_000:
+        iterations *= 10 if elapsed < min_time / 10 else 2
+        elapsed = await run(iterations)
+
+    timings = [await run(iterations) / iterations for _ in range(rounds)]
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": rounds,
+        "iterations": iterations,
+        "ops_per_second": 1 / statistics.median(timings) if statistics.median(timings) else None,
+    }
+
+
+async def _run_case(bench: Benchmark, kwargs: dict, min_time: float, rounds: int) -> dict:
+    target = bench.setup(**kwargs)
+    if inspect.isawaitable(target):
+        target = await target
+
+    teardown = getattr(target, "teardown", None)
+    try:
+        return await _time_case(target, min_time, rounds)
+    finally:
+        if teardown is not None:
+            result = teardown()
+            if inspect.isawaitable(result):
+                await result
+
+
+def _git_commit() -> str | None:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+async def _run_all(pattern: str | None, min_time: float, rounds: int) -> list[dict]:
+    results = []
+    for bench in registered():
+        for case_name, kwargs in bench.cases():
+            if pattern and pattern not in case_name:
+                continue
+
+            entry = {"name": case_name, "benchmark": bench.name, "params": kwargs}
+            try:
+                entry["stats"] = await _run_case(bench, kwargs, min_time, rounds)
+                print(f"{case_name:<60} {entry['stats']['median'] * 1e6:>14.2f} us/op")
+            except SkipBenchmark as e:
+                entry["skipped"] = str(e)
+                print(f"{case_name:<60} {'skipped':>14} ({e})")
+            results.append(entry)
+    return results
+
+
+def run(pattern: str | None = None, min_time: float = 0.2, rounds: int = 5) -> dict:
+    """Run the registered benchmarks whose case names contain `pattern`."""
+    results = asyncio.run(_run_all(pattern, min_time, rounds))
+    return {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "min_time": min_time,
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list[dict]:
+    """Compare median timings against a baseline.
+
+    Returns one row per benchmark present in both runs; rows whose median slowed down by
+    more than `threshold` (a fraction) are flagged as regressions.
+    """
+    baseline_stats = {
+        entry["name"]: entry["stats"] for entry in baseline["results"] if "stats" in entry
+    }
+
+    rows = []
+    for entry in current["results"]:
+        if "stats" not in entry or entry["name"] not in baseline_stats:
+            continue
+
+        before = baseline_stats[entry["name"]]["median"]
+        after = entry["stats"]["median"]
+        change = (after - before) / before if before else 0.0
+        rows.append(
+            {
+                "name": entry["name"],
+                "baseline": before,
+                "current": after,
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+    return rows
+
+
+def load(path: Path) -> dict:
+    """Load benchmark results from a JSON file."""
+    return json.loads(path.read_text())
+
+
+def save(results: dict, path: Path) -> None:
+    """Save benchmark results to a JSON file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
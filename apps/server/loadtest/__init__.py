@@ -0,0 +1,4 @@
+"""Load-test harness for a locally running server.
+
+Run with `python -m loadtest loadtest/example.toml` from `apps/server`.
+"""
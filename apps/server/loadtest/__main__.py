@@ -0,0 +1,56 @@
+"""Command line entry point for the load-test harness."""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from .harness import LoadTest, LoadTestConfig
+
+
+def _format_latency(summary: dict | None) -> str:
+    if summary is None:
+        return "n/a"
+    return " ".join(f"{key}={summary[key] * 1000:.1f}ms" for key in ("p50", "p90", "p99", "max"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a load test described by a TOML file and write its report."""
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__)
+    parser.add_argument("config", type=Path, help="TOML load test configuration")
+    parser.add_argument("-o", "--report", type=Path, help="override the report path")
+    args = parser.parse_args(argv)
+
+    config = LoadTestConfig.from_file(args.config)
+    report = asyncio.run(LoadTest(config).run())
+
+    path = args.report or Path(config.report)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+    watchers, runs = report["watchers"], report["runs"]
+    print(f"Configs created:      {report['setup']['configs_created']}")
+    print(f"Runs triggered:       {runs['triggered']} ({runs['timed_out']} watchers timed out)")
+    print(f"Watchers connected:   {watchers['connected']}/{watchers['requested']}")
+    print(f"Messages received:    {watchers['messages']}")
+    print(f"Dropped updates:      {watchers['dropped_updates']}")
+    print(f"Progress latency:     {_format_latency(watchers['progress_latency'])}")
+    if report["create_phase"]:
+        phase = report["create_phase"]
+        print(
+            f"POST /configs:        {phase['achieved_rate']:.1f}/s "
+            f"(target {phase['target_rate']}/s) {_format_latency(phase['latency'])}"
+        )
+    rss = report["server_rss"]
+    if rss["peak"] is not None:
+        print(
+            f"Server RSS:           start={rss['start'] / 2**20:.1f}MiB "
+            f"peak={rss['peak'] / 2**20:.1f}MiB end={rss['end'] / 2**20:.1f}MiB"
+        )
+    print(f"Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""Load generator for concurrent sweeps, WebSocket watchers and configuration creation."""
+
+import asyncio
+import json
+import random
+import time
+import tomllib
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import UTC, datetime
+from pathlib import Path
+
+TERMINAL_STATES = ("COMPLETED", "FAILED", "STOPPED")
+
+
+@dataclass
+class LoadTestConfig:
+    """Load test settings, read from a TOML file."""
+
+    base_url: str = "http://localhost:8000"
+    ws_url: str = "ws://localhost:8000"
+    seed: int = 0
+    configs: int = 10
+    watchers: int = 100
+    timeout: float = 180.0
+    rss_interval: float = 1.0
+    create_rate: float = 0.0
+    create_duration: float = 10.0
+    create_concurrency: int = 10
+    report: str = ".loadtest/report.json"
+
+    @classmethod
+    def from_file(cls, path: Path) -> "LoadTestConfig":
+        """Load settings from a TOML file, rejecting unknown keys."""
+        data = tomllib.loads(path.read_text())
+        known = {field.name for field in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown load test settings: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+
+def summarize(values: list[float]) -> dict | None:
+    """Summarize samples with nearest-rank percentiles."""
+    if not values:
+        return None
+
+    ordered = sorted(values)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "p99": percentile(99),
+        "max": ordered[-1],
+    }
+
+
+@dataclass
+class Watcher:
+    """A WebSocket client following the progress of one configuration."""
+
+    config_id: str
+    connected: bool = False
+    error: str | None = None
+    final_state: str | None = None
+
+    def __post_init__(self):
+        """Initialize received update tracking."""
+        self.seqs_seen: set[int] = set()
+        self.messages = 0
+        self.latencies: list[float] = []
+
+    @property
+    def expected(self) -> int:
+        """Number of status updates broadcast between the first and last one received."""
+        return max(self.seqs_seen) - min(self.seqs_seen) + 1 if self.seqs_seen else 0
+
+    @property
+    def dropped(self) -> int:
+        """Number of status updates in that span that never reached this watcher."""
+        return self.expected - len(self.seqs_seen)
+
+    def receive(self, message: str | bytes) -> bool:
+        """Record a status message and its end-to-end latency; return True for heartbeats."""
+        received_at = datetime.now(UTC)
+        data = json.loads(message)
+        if data.get("type") == "heartbeat":
+            return True
+        if "progress" not in data or "created_at" not in data:
+            # Not a status row
+            return False
+
+        self.messages += 1
+        if "seq" in data:
+            self.seqs_seen.add(data["seq"])
+        # created_at is the database timestamp of the status insert
+        created_at = datetime.fromisoformat(data["created_at"])
+        self.latencies.append((received_at - created_at).total_seconds())
+        if data.get("state") in TERMINAL_STATES:
+            self.final_state = data["state"]
+        return False
+
+
+class LoadTest:
+    """Runs a load test against a local server and produces a summary report."""
+
+    def __init__(self, config: LoadTestConfig):
+        """Initialize the load test."""
+        self.config = config
+        self.random = random.Random(config.seed)
+        self._executor = ThreadPoolExecutor(max_workers=max(config.create_concurrency, 8))
+        self._rss_samples: list[float] = []
+
+    async def request(self, method: str, path: str, body: dict | None = None):
+        """Send an HTTP request from the thread pool; return (status, payload, seconds, headers)."""
+
+        def send():
+            request = urllib.request.Request(
+                f"{self.config.base_url}{path}",
+                data=json.dumps(body).encode() if body is not None else None,
+                method=method,
+                headers={"Content-Type": "application/json"},
+            )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    status, payload, headers = response.status, response.read(), response.headers
+            except urllib.error.HTTPError as e:
+                status, payload, headers = e.code, e.read(), e.headers
+            elapsed = time.perf_counter() - start
+
+            try:
+                return status, json.loads(payload), elapsed, headers
+            except ValueError:
+                return status, payload.decode(errors="replace"), elapsed, headers
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, send)
+
+    def parameters(self, index: int) -> list[dict]:
+        """Generate a reproducible parameter set, unique per index so it is not deduplicated."""
+        angles = sorted(self.random.sample(range(-20, 21), k=4))
+        return [
+            {"key": "angle_of_attack", "type": "float", "values": [float(a) for a in angles]},
+            {"key": "speed", "type": "float", "values": [10.0 + index, 20.0 + index]},
+            {"key": "turbulence_model", "type": "enum", "values": ["k-epsilon", "k-omega"]},
+        ]
+
+    async def create_config(self, index: int) -> tuple[int, str | None, float]:
+        """Create a configuration; return (status, id, seconds).
+
+        The parameter sets only depend on the seed, so a rerun against the same storage gets
+        409 Conflict; the existing configuration named in its `Location` header is reused.
+        """
+        status, payload, elapsed, headers = await self.request(
+            "POST",
+            "/configs",
+            {
+                "name": f"loadtest-{self.config.seed}-{index}",
+                "description": "Generated by the load-test harness",
+                "parameters": self.parameters(index),
+            },
+        )
+        if status == 409 and headers.get("Location"):
+            return status, headers["Location"].rsplit("/", 1)[-1], elapsed
+        config_id = payload.get("id") if isinstance(payload, dict) else None
+        return status, config_id, elapsed
+
+    async def watch(self, watcher: Watcher, connected: asyncio.Event) -> None:
+        """Follow a configuration's status stream until its run finishes."""
+        try:
+            import websockets
+        except ImportError as e:
+            raise RuntimeError("The load test requires the `websockets` package") from e
+
+        url = f"{self.config.ws_url}/ws/configs/{watcher.config_id}"
+        try:
+            async with websockets.connect(url, open_timeout=30, max_queue=None) as websocket:
+                watcher.connected = True
+                connected.set()
+                async for message in websocket:
+                    if watcher.receive(message):
+                        # Reply so the server does not close the watcher as idle
+                        await websocket.send("pong")
+                    if watcher.final_state is not None:
+                        break
+        except Exception as e:
+            watcher.error = f"{type(e).__name__}: {e}"
+        finally:
+            connected.set()
+
+    async def sample_rss(self, stop: asyncio.Event) -> None:
+        """Sample the server's resident memory from its metrics endpoint."""
+        while not stop.is_set():
+            status, payload, _, _ = await self.request("GET", "/metrics")
+            if status == 200 and isinstance(payload, str):
+                for line in payload.splitlines():
+                    if line.startswith("psc_process_resident_memory_bytes "):
+                        self._rss_samples.append(float(line.split()[1]))
+            try:
+                await asyncio.wait_for(stop.wait(), self.config.rss_interval)
+            except TimeoutError:
+                pass
+
+    async def create_phase(self) -> dict | None:
+        """Issue POST /configs at a fixed open-loop rate and measure throughput."""
+        if self.config.create_rate <= 0:
+            return None
+
+        semaphore = asyncio.Semaphore(self.config.create_concurrency)
+        latencies: list[float] = []
+        statuses: dict[str, int] = {}
+        total = int(self.config.create_rate * self.config.create_duration)
+        offset = self.config.configs
+
+        async def one(index: int, at: float) -> None:
+            await asyncio.sleep(max(0.0, at - time.perf_counter()))
+            async with semaphore:
+                status, _, elapsed = await self.create_config(offset + index)
+            latencies.append(elapsed)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i, start + i / self.config.create_rate) for i in range(total)))
+        elapsed = time.perf_counter() - start
+        return {
+            "target_rate": self.config.create_rate,
+            "achieved_rate": total / elapsed if elapsed else None,
+            "requests": total,
+            "statuses": statuses,
+            "latency": summarize(latencies),
+        }
+
+    async def run(self) -> dict:
+        """Run all phases and return the summary report."""
+        started_at = datetime.now(UTC)
+        start = time.perf_counter()
+        stop_sampling = asyncio.Event()
+        sampler = asyncio.create_task(self.sample_rss(stop_sampling))
+
+        # Create the configurations to run
+        created = await asyncio.gather(*(self.create_config(i) for i in range(self.config.configs)))
+        config_ids = [config_id for _, config_id, _ in created if config_id]
+        if not config_ids:
+            raise RuntimeError("No configurations could be created")
+
+        # Connect watchers round-robin across configurations before starting the runs
+        watchers = [
+            Watcher(config_id=config_ids[i % len(config_ids)]) for i in range(self.config.watchers)
+        ]
+        events = [asyncio.Event() for _ in watchers]
+        watch_tasks = [
+            asyncio.create_task(self.watch(watcher, event))
+            for watcher, event in zip(watchers, events, strict=True)
+        ]
+        await asyncio.gather(*(event.wait() for event in events))
+
+        # Trigger the runs and wait for every watcher to see a terminal state
+        triggered = await asyncio.gather(
+            *(self.request("POST", f"/configs/run/{config_id}") for config_id in config_ids)
+        )
+        done, pending = await asyncio.wait(watch_tasks, timeout=self.config.timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        create_phase = await self.create_phase()
+
+        stop_sampling.set()
+        await sampler
+        self._executor.shutdown()
+
+        connected = [watcher for watcher in watchers if watcher.connected]
+        dropped = sum(watcher.dropped for watcher in connected)
+        expected = sum(watcher.expected for watcher in connected)
+        return {
+            "config": asdict(self.config),
+            "started_at": started_at.isoformat(),
+            "duration": time.perf_counter() - start,
+            "setup": {
+                "configs_created": len(config_ids),
+                "create_latency": summarize([elapsed for _, _, elapsed in created]),
+            },
+            "runs": {
+                "triggered": sum(1 for status, *_ in triggered if status == 200),
+                "trigger_latency": summarize([elapsed for _, _, elapsed, _ in triggered]),
+                "watchers_finished": sum(1 for watcher in connected if watcher.final_state),
+                "timed_out": len(pending),
+            },
+            "watchers": {
+                "requested": len(watchers),
+                "connected": len(connected),
+                "errors": sum(1 for watcher in watchers if watcher.error),
+                "messages": sum(watcher.messages for watcher in connected),
+                "dropped_updates": dropped,
+                "drop_rate": dropped / expected if expected else None,
+                "progress_latency": summarize(
+                    [latency for watcher in connected for latency in watcher.latencies]
+                ),
+            },
+            "create_phase": create_phase,
+            "server_rss": {
+                "start": self._rss_samples[0] if self._rss_samples else None,
+                "peak": max(self._rss_samples, default=None),
+                "end": self._rss_samples[-1] if self._rss_samples else None,
+                "samples": len(self._rss_samples),
+            },
+        }
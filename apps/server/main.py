@@ -7,6 +7,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 if __name__ == "__main__":
     import uvicorn
 
+    from psc.lifecycle import SHUTDOWN_TIMEOUT
     from psc.server import app
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Open streams delay the lifespan shutdown, so bound their graceful close by the same deadline
+    uvicorn.run(app, host="0.0.0.0", port=8000, timeout_graceful_shutdown=int(SHUTDOWN_TIMEOUT))
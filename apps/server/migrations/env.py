@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 # Import your models here for autogenerate support
 from psc.db import Base
-from psc.schemas import ParameterSweepConfig, SimulationStatus  # noqa: F401
+from psc.schemas import CaseRun, ParameterSweepConfig, SimulationStatus  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,37 @@
+"""add config duplicate of.
+
+Revision ID: 1b6e3d8a4c92
+Revises: 5d2b8e4f7a19
+Create Date: 2026-10-19 23:58:12.604931
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "1b6e3d8a4c92"
+down_revision: str | Sequence[str] | None = "5d2b8e4f7a19"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "parameter_sweep_configs",
+        sa.Column(
+            "duplicate_of",
+            postgresql.UUID(as_uuid=True),
+            nullable=True,
+            comment="ID of the identical configuration this invalid one duplicates",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("parameter_sweep_configs", "duplicate_of")
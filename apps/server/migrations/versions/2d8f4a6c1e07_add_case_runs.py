@@ -0,0 +1,83 @@
+"""add case runs and run estimates.
+
+Revision ID: 2d8f4a6c1e07
+Revises: 7c3e1b2a9d54
+Create Date: 2026-10-19 14:03:27.904315
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "2d8f4a6c1e07"
+down_revision: str | Sequence[str] | None = "7c3e1b2a9d54"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "case_runs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("config_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "case_index", sa.Integer(), nullable=False, comment="Index of the case in the sweep"
+        ),
+        sa.Column(
+            "parameters",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            comment="Parameter values of the case",
+        ),
+        sa.Column("duration", sa.Float(), nullable=False, comment="Wall-clock duration in seconds"),
+        sa.Column("state", sa.String(length=20), nullable=False, comment="COMPLETED | FAILED"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_case_runs_config_id_case_index",
+        "case_runs",
+        ["config_id", "case_index"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_case_runs_created_at"), "case_runs", ["created_at"], unique=False)
+
+    op.add_column(
+        "simulation_status",
+        sa.Column(
+            "completed_cases", sa.Integer(), nullable=True, comment="Number of cases completed"
+        ),
+    )
+    op.add_column(
+        "simulation_status",
+        sa.Column("total_cases", sa.Integer(), nullable=True, comment="Number of cases in the run"),
+    )
+    op.add_column(
+        "simulation_status",
+        sa.Column(
+            "eta_seconds",
+            sa.Float(),
+            nullable=True,
+            comment="Estimated seconds until the run completes",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("simulation_status", "eta_seconds")
+    op.drop_column("simulation_status", "total_cases")
+    op.drop_column("simulation_status", "completed_cases")
+    op.drop_index(op.f("ix_case_runs_created_at"), table_name="case_runs")
+    op.drop_index("idx_case_runs_config_id_case_index", table_name="case_runs")
+    op.drop_table("case_runs")
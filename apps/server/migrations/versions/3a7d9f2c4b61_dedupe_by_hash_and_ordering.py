@@ -0,0 +1,44 @@
+"""dedupe by hash and ordering.
+
+Revision ID: 3a7d9f2c4b61
+Revises: 8c1e4b7a2d56
+Create Date: 2026-10-19 21:12:37.504183
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3a7d9f2c4b61"
+down_revision: str | Sequence[str] | None = "8c1e4b7a2d56"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("idx_parameters_hash", table_name="parameter_sweep_configs")
+    op.create_index(
+        "idx_parameters_hash_ordering",
+        "parameter_sweep_configs",
+        ["parameters_hash", "ordering"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Configurations differing only in their ordering can no longer coexist
+    op.execute(
+        "UPDATE parameter_sweep_configs SET parameters_hash = NULL "
+        "WHERE id IN (SELECT id FROM ("
+        "SELECT id, row_number() OVER (PARTITION BY parameters_hash ORDER BY created_at) AS n "
+        "FROM parameter_sweep_configs WHERE parameters_hash IS NOT NULL"
+        ") AS ranked WHERE n > 1)"
+    )
+    op.drop_index("idx_parameters_hash_ordering", table_name="parameter_sweep_configs")
+    op.create_index(
+        "idx_parameters_hash", "parameter_sweep_configs", ["parameters_hash"], unique=True
+    )
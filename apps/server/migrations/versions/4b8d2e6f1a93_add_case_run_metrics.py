@@ -0,0 +1,37 @@
+"""add case run metrics.
+
+Revision ID: 4b8d2e6f1a93
+Revises: 9e5a7c3b2f18
+Create Date: 2026-10-19 16:02:41.503126
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "4b8d2e6f1a93"
+down_revision: str | Sequence[str] | None = "9e5a7c3b2f18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "case_runs",
+        sa.Column(
+            "metrics",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+            comment="Output metrics of the case",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("case_runs", "metrics")
@@ -0,0 +1,52 @@
+"""add config total cases.
+
+Revision ID: 5d2b8e4f7a19
+Revises: 3a7d9f2c4b61
+Create Date: 2026-10-19 22:41:08.357214
+
+"""
+
+import json
+import math
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2b8e4f7a19"
+down_revision: str | Sequence[str] | None = "3a7d9f2c4b61"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "parameter_sweep_configs",
+        sa.Column(
+            "total_cases",
+            sa.BigInteger(),
+            nullable=True,
+            comment="Number of cases, counted once validated",
+        ),
+    )
+
+    # Count the cases of the configurations validated so far
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT id, parameters FROM parameter_sweep_configs WHERE status = 'READY'")
+    )
+    for id, parameters in rows.all():
+        if isinstance(parameters, str):
+            parameters = json.loads(parameters)
+        count = math.prod(len(param["values"]) for param in parameters) if parameters else 0
+        connection.execute(
+            sa.text("UPDATE parameter_sweep_configs SET total_cases = :count WHERE id = :id"),
+            {"count": count, "id": id},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("parameter_sweep_configs", "total_cases")
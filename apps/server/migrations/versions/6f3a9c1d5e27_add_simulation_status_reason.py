@@ -0,0 +1,36 @@
+"""add simulation status reason.
+
+Revision ID: 6f3a9c1d5e27
+Revises: 4b8d2e6f1a93
+Create Date: 2026-10-19 16:48:12.730415
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6f3a9c1d5e27"
+down_revision: str | Sequence[str] | None = "4b8d2e6f1a93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "simulation_status",
+        sa.Column(
+            "reason",
+            sa.String(length=200),
+            nullable=True,
+            comment="Why the run failed or was stopped",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("simulation_status", "reason")
@@ -0,0 +1,102 @@
+"""add parameters hash.
+
+Revision ID: 7c3e1b2a9d54
+Revises: 4af1d594909f
+Create Date: 2026-10-19 09:12:41.518203
+
+"""
+
+import hashlib
+import json
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e1b2a9d54"
+down_revision: str | Sequence[str] | None = "4af1d594909f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# Frozen copy of `psc.configurator.hashing` as of this revision, so later changes to the hash
+# do not change what this migration backfills
+def compute_parameters_hash(parameters: list[dict]) -> str:
+    """Compute the SHA-256 content hash of a serialized parameter set."""
+
+    def normalize(value, parameter_type: str):
+        match parameter_type:
+            case "float":
+                return float(value)
+            case "integer":
+                return int(value)
+            case _:
+                return str(value)
+
+    normalized = [
+        {
+            "key": param["key"],
+            "type": param["type"],
+            "values": [normalize(value, param["type"]) for value in param["values"]],
+        }
+        for param in parameters
+    ]
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "parameter_sweep_configs",
+        sa.Column(
+            "parameters_hash",
+            sa.String(length=64),
+            nullable=True,
+            comment="SHA-256 of the normalized parameter set",
+        ),
+    )
+    op.add_column(
+        "simulation_status",
+        sa.Column(
+            "parameters_hash",
+            sa.String(length=64),
+            nullable=True,
+            comment="Content hash of the parameter set that was simulated",
+        ),
+    )
+
+    # Backfill existing configurations; only the oldest of any duplicate set keeps its hash
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT id, parameters FROM parameter_sweep_configs ORDER BY created_at")
+    )
+    seen: set[str] = set()
+    for id, parameters in rows.fetchall():
+        parameters_hash = compute_parameters_hash(parameters)
+        if parameters_hash in seen:
+            continue
+        seen.add(parameters_hash)
+        connection.execute(
+            sa.text("UPDATE parameter_sweep_configs SET parameters_hash = :hash WHERE id = :id"),
+            {"hash": parameters_hash, "id": id},
+        )
+
+    op.create_index(
+        "idx_parameters_hash", "parameter_sweep_configs", ["parameters_hash"], unique=True
+    )
+    op.create_index(
+        op.f("ix_simulation_status_parameters_hash"),
+        "simulation_status",
+        ["parameters_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_simulation_status_parameters_hash"), table_name="simulation_status")
+    op.drop_index("idx_parameters_hash", table_name="parameter_sweep_configs")
+    op.drop_column("simulation_status", "parameters_hash")
+    op.drop_column("parameter_sweep_configs", "parameters_hash")
@@ -0,0 +1,47 @@
+"""add config validation status.
+
+Revision ID: 8c1e4b7a2d56
+Revises: 6f3a9c1d5e27
+Create Date: 2026-10-19 18:05:41.218907
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c1e4b7a2d56"
+down_revision: str | Sequence[str] | None = "6f3a9c1d5e27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "parameter_sweep_configs",
+        sa.Column(
+            "status",
+            sa.String(length=20),
+            server_default="READY",
+            nullable=False,
+            comment="Validation status: PENDING_VALIDATION | READY | INVALID",
+        ),
+    )
+    op.add_column(
+        "parameter_sweep_configs",
+        sa.Column(
+            "reason",
+            sa.String(length=200),
+            nullable=True,
+            comment="Why the configuration is invalid",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("parameter_sweep_configs", "reason")
+    op.drop_column("parameter_sweep_configs", "status")
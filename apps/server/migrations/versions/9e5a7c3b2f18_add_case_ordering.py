@@ -0,0 +1,37 @@
+"""add case ordering.
+
+Revision ID: 9e5a7c3b2f18
+Revises: 2d8f4a6c1e07
+Create Date: 2026-10-19 15:21:09.117842
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e5a7c3b2f18"
+down_revision: str | Sequence[str] | None = "2d8f4a6c1e07"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "parameter_sweep_configs",
+        sa.Column(
+            "ordering",
+            sa.String(length=20),
+            server_default="cartesian",
+            nullable=False,
+            comment="Case execution order: cartesian | grouped | gray",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("parameter_sweep_configs", "ordering")
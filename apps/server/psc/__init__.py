@@ -1,5 +1,10 @@
 """PSC (Parameter Sweep Configurator) package."""
 
-from psc.db import Base
+import time
+
+# When the package started importing, for measuring import-time work
+IMPORT_STARTED = time.perf_counter()
+
+from psc.db import Base  # noqa: E402
 
 __all__ = ["Base"]
@@ -0,0 +1,67 @@
+import math
+from collections.abc import Iterator, Sequence
+
+from .models import BaseParameter
+
+
+def case_count(parameters: Sequence[BaseParameter]) -> int:
+    """Get the number of cases in the cartesian product of the parameter values."""
+    return math.prod(len(param.values) for param in parameters) if parameters else 0
+
+
+def case_at(parameters: Sequence[BaseParameter], index: int) -> dict:
+    """Get the parameter values of the case at `index` without expanding the product.
+
+    Cases are numbered in cartesian order with the last parameter varying fastest, matching
+    `itertools.product`.
+    """
+    if not 0 <= index < case_count(parameters):
+        raise IndexError(f"Case index {index} out of range")
+
+    case = {}
+    for param in reversed(parameters):
+        index, position = divmod(index, len(param.values))
+        case[param.key] = param.values[position]
+    return {param.key: case[param.key] for param in parameters}
+
+
+def iter_cases(
+    parameters: Sequence[BaseParameter], start: int = 0, stop: int | None = None
+) -> Iterator[dict]:
+    """Iterate over the cases in `[start, stop)` lazily, in constant memory."""
+    total = case_count(parameters)
+    stop = total if stop is None else min(stop, total)
+    for index in range(max(start, 0), stop):
+        yield case_at(parameters, index)
+
+
+def iter_case_positions(
+    parameters: Sequence[BaseParameter], start: int = 0, stop: int | None = None
+) -> Iterator[tuple[int, ...]]:
+    """Iterate over the value positions of the cases in `[start, stop)`, in constant memory.
+
+    Yields one position per parameter for each case, in cartesian order. Cheaper than
+    `iter_cases` for long ranges, as consecutive cases are stepped to like an odometer
+    instead of being decoded from their index.
+    """
+    total = case_count(parameters)
+    start = max(start, 0)
+    stop = total if stop is None else min(stop, total)
+    if start >= stop:
+        return
+
+    sizes = [len(param.values) for param in parameters]
+    positions = [0] * len(sizes)
+    index = start
+    for i in range(len(sizes) - 1, -1, -1):
+        index, positions[i] = divmod(index, sizes[i])
+
+    for _ in range(stop - start):
+        yield tuple(positions)
+        i = len(positions) - 1
+        while i >= 0:
+            positions[i] += 1
+            if positions[i] < sizes[i]:
+                break
+            positions[i] = 0
+            i -= 1
@@ -1,12 +1,22 @@
-from uuid import UUID, uuid4
-
-from sqlalchemy import delete, select
-
-from psc.db import async_session_factory
-from psc.schemas import ParameterSweepConfig
-
-from .errors import ConfigurationNotFoundError
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from psc.storage import ConfigRecord, get_repository
+
+from .cases import case_count
+from .errors import (
+    ConfigurationExistsError,
+    ConfigurationNotFoundError,
+    ConfigurationNotReadyError,
+)
+from .hashing import compute_parameters_hash
+from .ordering import CaseOrdering
 from .registry import ParameterRegistry, ParameterUnion
+from .validation import ConfigStatus
+
+if TYPE_CHECKING:
+    from psc.simulation.adaptive import Refinement
+    from psc.simulation.policies import StopPolicy
 
 
 class ParameterSweepConfigurator:
@@ -18,72 +28,98 @@ class ParameterSweepConfigurator:
         name: str,
         description: str,
         parameters: list[ParameterUnion],
+        parameters_hash: str | None = None,
+        ordering: CaseOrdering = CaseOrdering.CARTESIAN,
     ):
         """Initialize parameter sweep configurator."""
         self.id = id
         self.name = name
         self.description = description
         self.parameters = parameters
+        self.parameters_hash = parameters_hash or compute_parameters_hash(parameters)
+        self.ordering = ordering
+
+    @classmethod
+    def from_record(cls, config: ConfigRecord) -> "ParameterSweepConfigurator":
+        """Create a configurator from a stored configuration."""
+        registry = ParameterRegistry()
+        return cls(
+            id=config.id,
+            name=config.name,
+            description=config.description,
+            parameters=[registry.load(param_data) for param_data in config.parameters],
+            parameters_hash=config.parameters_hash,
+            ordering=CaseOrdering(config.ordering),
+        )
 
     @classmethod
     async def create(
-        cls, name: str, description: str, parameters: list[ParameterUnion]
+        cls,
+        name: str,
+        description: str,
+        parameters: list[ParameterUnion],
+        ordering: CaseOrdering = CaseOrdering.CARTESIAN,
     ) -> "ParameterSweepConfigurator":
-        """Create a parameter sweep configurator."""
-        id = uuid4()
-
-        # Save to database
-        async with async_session_factory() as session:
-            config = ParameterSweepConfig(
-                id=id,
-                name=name,
-                description=description,
-                parameters=[param.serialize() for param in parameters],
-                parameter_count=len(parameters),
-            )
-            session.add(config)
-            await session.commit()
-
-        return cls(id=id, name=name, description=description, parameters=parameters)
+        """Create a parameter sweep configurator.
+
+        Configurations are deduplicated by the content hash of their normalized parameter
+        set and their ordering: if an identical configuration already exists,
+        `ConfigurationExistsError` is raised with its ID instead of storing a new one.
+        """
+        config = ConfigRecord(
+            name=name,
+            description=description,
+            parameters=[param.serialize() for param in parameters],
+            parameter_count=len(parameters),
+            parameters_hash=compute_parameters_hash(parameters),
+            ordering=ordering.value,
+            total_cases=case_count(parameters),
+        )
+        stored = await get_repository().upsert_config(config)
+        if stored.id != config.id:
+            raise ConfigurationExistsError(stored.id)
+        return cls.from_record(stored)
 
     @classmethod
-    async def load(cls, id: UUID) -> "ParameterSweepConfigurator":
-        """Load a parameter sweep configurator."""
-        async with async_session_factory() as session:
-            stmt = select(ParameterSweepConfig).where(ParameterSweepConfig.id == id)
-            result = await session.execute(stmt)
-            config = result.scalar_one_or_none()
-
-            if config is None:
-                raise ConfigurationNotFoundError(id)
-
-            registry = ParameterRegistry()
-            return cls(
-                id=config.id,
-                name=config.name,
-                description=config.description,
-                parameters=[registry.load(param_data) for param_data in config.parameters],
-            )
+    async def load(cls, id: UUID, primary: bool = False) -> "ParameterSweepConfigurator":
+        """Load a parameter sweep configurator.
+
+        Reads are served by the read replica unless `primary` is set or the configuration
+        was written within the read-your-writes window. Configurations that are pending
+        validation or invalid cannot be loaded.
+        """
+        config = await get_repository().get_config(id, primary=primary)
+        if config is None:
+            raise ConfigurationNotFoundError(id)
+        if config.status != ConfigStatus.READY.value:
+            raise ConfigurationNotReadyError(id, config.status, config.reason)
+        return cls.from_record(config)
 
     @classmethod
     async def delete(cls, id: UUID) -> None:
         """Delete a parameter sweep configurator."""
-        async with async_session_factory() as session:
-            # First check if the configuration exists
-            stmt = select(ParameterSweepConfig).where(ParameterSweepConfig.id == id)
-            result = await session.execute(stmt)
-            config = result.scalar_one_or_none()
-
-            if config is None:
-                raise ConfigurationNotFoundError(id)
+        if not await get_repository().delete_config(id):
+            raise ConfigurationNotFoundError(id)
 
-            # Delete the configuration
-            delete_stmt = delete(ParameterSweepConfig).where(ParameterSweepConfig.id == id)
-            await session.execute(delete_stmt)
-            await session.commit()
+    def run(
+        self,
+        refinement: "Refinement | None" = None,
+        stop_policy: "StopPolicy | None" = None,
+        profile: bool = False,
+    ):
+        """Run the parameter sweep.
 
-    def run(self):
-        """Run the parameter sweep."""
+        The run is optionally refined adaptively, ended early by a stop policy or recorded by
+        the run profiler.
+        """
         from psc.simulation.demo import simulation_manager
 
-        simulation_manager.start_simulation(self.id, self.parameters)
+        simulation_manager.start_simulation(
+            self.id,
+            self.parameters,
+            self.parameters_hash,
+            self.ordering,
+            refinement=refinement,
+            stop_policy=stop_policy,
+            profile=profile,
+        )
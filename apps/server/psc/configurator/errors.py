@@ -13,6 +13,27 @@ class ConfigurationNotFoundError(ConfigurationError):
         super().__init__(f"Configuration with id {id} not found")
 
 
+class ConfigurationExistsError(ConfigurationError):
+    """Exception raised when an identical configuration already exists."""
+
+    def __init__(self, id):
+        """Initialize with the ID of the existing configuration."""
+        self.id = id
+        super().__init__(f"An identical configuration already exists with id {id}")
+
+
+class ConfigurationNotReadyError(ConfigurationError):
+    """Exception raised when a configuration is pending validation or invalid."""
+
+    def __init__(self, id, status, reason=None):
+        """Initialize with configuration ID, validation status and invalidity reason."""
+        self.id = id
+        self.status = status
+        self.reason = reason
+        detail = f": {reason}" if reason else ""
+        super().__init__(f"Configuration with id {id} is {status}{detail}")
+
+
 class UnkownParameterTypeError(ConfigurationError):
     """Exception raised when a parameter type is unknown."""
 
@@ -0,0 +1,164 @@
+"""Streaming export of a sweep's expanded cases, e.g. as manifests for scheduler array jobs.
+
+Cases are numbered by their cartesian index (see `case_at`), whatever the sweep's ordering,
+so an array task can look its case up by index. Each value is encoded once per parameter
+and rows are joined from the encoded values, so memory stays constant in the number of
+cases exported.
+"""
+
+import json
+import os
+import struct
+from collections.abc import Callable, Iterator, Sequence
+from enum import Enum
+
+from .cases import case_count, iter_case_positions
+from .models import BaseParameter, ParameterType
+
+# Number of cases encoded per streamed chunk
+EXPORT_CHUNK_CASES = int(os.getenv("PSC_EXPORT_CHUNK_CASES", "4096"))
+
+NPY_MAGIC = b"\x93NUMPY"
+# The header is padded so the data starts at a multiple of this many bytes
+NPY_ALIGNMENT = 64
+
+
+class CaseFormat(Enum):
+    """Format of an exported case list."""
+
+    # Header row, then one row per case
+    CSV = "csv"
+    # One JSON object per line
+    NDJSON = "ndjson"
+    # NumPy `.npy` file holding a one-dimensional structured array
+    NPY = "npy"
+
+    @property
+    def media_type(self) -> str:
+        """Get the media type of the format."""
+        return {
+            CaseFormat.CSV: "text/csv",
+            CaseFormat.NDJSON: "application/x-ndjson",
+            CaseFormat.NPY: "application/octet-stream",
+        }[self]
+
+
+def _csv_field(value) -> str:
+    text = str(value)
+    if any(character in text for character in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _enum_width(param: BaseParameter) -> int:
+    return max((len(str(value)) for value in param.values), default=1) or 1
+
+
+def npy_fields(parameters: Sequence[BaseParameter]) -> list[tuple[str, str]]:
+    """Get the structured array fields of a case list: the case index, then each parameter.
+
+    Floats are stored as little-endian float64, integers and the index as int64 and enum
+    values as fixed-width unicode strings as long as the longest value.
+    """
+    fields = [("index", "<i8")]
+    for param in parameters:
+        match param.type:
+            case ParameterType.FLOAT:
+                fields.append((param.key, "<f8"))
+            case ParameterType.INTEGER:
+                fields.append((param.key, "<i8"))
+            case ParameterType.ENUM:
+                fields.append((param.key, f"<U{_enum_width(param)}"))
+    return fields
+
+
+def npy_header(parameters: Sequence[BaseParameter], count: int) -> bytes:
+    """Build the `.npy` header of a structured array of `count` cases.
+
+    Written by hand in the format's version 1.0 layout (version 2.0 for headers too long
+    for it), so exporting does not need NumPy.
+    """
+    header = repr(
+        {"descr": npy_fields(parameters), "fortran_order": False, "shape": (count,)}
+    ).encode("latin-1")
+    for version, length_format in ((1, "<H"), (2, "<I")):
+        preamble = len(NPY_MAGIC) + 2 + struct.calcsize(length_format)
+        # The header ends with a newline, padded with spaces up to the alignment
+        padding = -(preamble + len(header) + 1) % NPY_ALIGNMENT
+        length = len(header) + padding + 1
+        if length < 2 ** (8 * struct.calcsize(length_format)):
+            return (
+                NPY_MAGIC
+                + bytes((version, 0))
+                + struct.pack(length_format, length)
+                + header
+                + b" " * padding
+                + b"\n"
+            )
+    raise ValueError("Case list header is too large for the .npy format")
+
+
+def npy_size(parameters: Sequence[BaseParameter], count: int) -> int:
+    """Get the size in bytes of the `.npy` file of `count` cases."""
+    width = 8 + sum(
+        4 * _enum_width(param) if param.type is ParameterType.ENUM else 8 for param in parameters
+    )
+    return len(npy_header(parameters, count)) + width * count
+
+
+def _npy_value(param: BaseParameter) -> Callable[[object], bytes]:
+    match param.type:
+        case ParameterType.FLOAT:
+            return lambda value: struct.pack("<d", float(value))
+        case ParameterType.INTEGER:
+            return lambda value: struct.pack("<q", int(value))
+        case _:
+            width = 4 * _enum_width(param)
+            return lambda value: str(value).encode("utf-32-le").ljust(width, b"\0")
+
+
+def export_cases(
+    parameters: Sequence[BaseParameter],
+    format: CaseFormat,
+    start: int = 0,
+    stop: int | None = None,
+    chunk_cases: int = EXPORT_CHUNK_CASES,
+) -> Iterator[bytes]:
+    """Encode the cases in `[start, stop)` in `format`, lazily, `chunk_cases` cases per chunk."""
+    total = case_count(parameters)
+    start = min(max(start, 0), total)
+    stop = total if stop is None else min(max(stop, start), total)
+
+    # Encoded value of each parameter position, and how a row is built from them
+    if format is CaseFormat.CSV:
+        values = [[_csv_field(value) for value in param.values] for param in parameters]
+        header = ["index", *(_csv_field(param.key) for param in parameters)]
+        yield (",".join(header) + "\r\n").encode()
+
+        def row(index: int, fields: Iterator[str]) -> bytes:
+            return f"{index},{','.join(fields)}\r\n".encode()
+
+    elif format is CaseFormat.NDJSON:
+        values = [
+            [f"{json.dumps(param.key)}: {json.dumps(value)}" for value in param.values]
+            for param in parameters
+        ]
+
+        def row(index: int, fields: Iterator[str]) -> bytes:
+            return f'{{"index": {index}, {", ".join(fields)}}}\n'.encode()
+
+    else:
+        values = [[_npy_value(param)(value) for value in param.values] for param in parameters]
+        yield npy_header(parameters, stop - start)
+
+        def row(index: int, fields: Iterator[bytes]) -> bytes:
+            return struct.pack("<q", index) + b"".join(fields)
+
+    chunk = []
+    for index, positions in enumerate(iter_case_positions(parameters, start, stop), start):
+        chunk.append(row(index, (values[i][position] for i, position in enumerate(positions))))
+        if len(chunk) >= chunk_cases:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
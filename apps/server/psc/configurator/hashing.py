@@ -0,0 +1,38 @@
+import hashlib
+import json
+from collections.abc import Iterable
+
+from .models import BaseParameter, ParameterType
+
+
+def _normalize_value(value, parameter_type: str):
+    """Normalize a single parameter value for its declared type."""
+    match parameter_type:
+        case ParameterType.FLOAT.value:
+            return float(value)
+        case ParameterType.INTEGER.value:
+            return int(value)
+        case _:
+            return str(value)
+
+
+def normalize_parameters(parameters: Iterable[dict | BaseParameter]) -> list[dict]:
+    """Normalize serialized parameters into a canonical form.
+
+    Values are converted to their declared type, so `10` and `10.0` hash alike, but the
+    order of parameters and of their values is kept: it determines which case each case
+    index refers to, so reordered sweeps are different configurations.
+    """
+    normalized = []
+    for param in parameters:
+        data = param.serialize() if isinstance(param, BaseParameter) else param
+        parameter_type = data["type"]
+        values = [_normalize_value(value, parameter_type) for value in data["values"]]
+        normalized.append({"key": data["key"], "type": parameter_type, "values": values})
+    return normalized
+
+
+def compute_parameters_hash(parameters: Iterable[dict | BaseParameter]) -> str:
+    """Compute the canonical SHA-256 content hash of a parameter set."""
+    canonical = json.dumps(normalize_parameters(parameters), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
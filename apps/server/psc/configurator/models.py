@@ -82,6 +82,11 @@ class BaseParameter(BaseModel, Generic[T], ABC):
         """Validation rules for the parameter."""
         pass
 
+    @property
+    def expensive_to_switch(self) -> bool:
+        """Whether changing this parameter between cases forces a full reinitialisation."""
+        return False
+
     def validate(self) -> None:
         """Validate the parameter."""
 
@@ -0,0 +1,83 @@
+from collections.abc import Iterator, Sequence
+from enum import Enum
+
+from .cases import case_count
+from .models import BaseParameter, ParameterType
+
+
+class CaseOrdering(Enum):
+    """Order in which the cases of a sweep are executed."""
+
+    # Cartesian order, last parameter varying fastest
+    CARTESIAN = "cartesian"
+    # Expensive-to-switch parameters vary slowest, so they change as rarely as possible
+    GROUPED = "grouped"
+    # Grouped, as a reflected Gray code: consecutive cases differ in one parameter by one step
+    GRAY = "gray"
+
+
+def expensive_keys(parameters: Sequence[BaseParameter]) -> set[str]:
+    """Get the keys of the parameters that are expensive to switch between cases."""
+    return {param.key for param in parameters if param.expensive_to_switch}
+
+
+def _nesting(parameters: Sequence[BaseParameter]) -> list[int]:
+    """Get parameter positions from slowest to fastest varying, expensive-to-switch first."""
+    positions = range(len(parameters))
+    return [i for i in positions if parameters[i].expensive_to_switch] + [
+        i for i in positions if not parameters[i].expensive_to_switch
+    ]
+
+
+def _steps(param: BaseParameter, sort: bool) -> list[int]:
+    """Get the value positions of a parameter in traversal order."""
+    positions = list(range(len(param.values)))
+    if sort and param.type in (ParameterType.FLOAT, ParameterType.INTEGER):
+        positions.sort(key=param.values.__getitem__)
+    return positions
+
+
+def iter_case_indices(
+    parameters: Sequence[BaseParameter], ordering: CaseOrdering = CaseOrdering.CARTESIAN
+) -> Iterator[int]:
+    """Iterate over the cartesian case indices of a sweep in the given order, lazily.
+
+    Case indices keep their cartesian numbering (see `case_at`) whatever the ordering, so
+    progress, results and checkpoints refer to the same case. In Gray order numeric values
+    are traversed in ascending order, so one step is to the adjacent value.
+    """
+    total = case_count(parameters)
+    if ordering is CaseOrdering.CARTESIAN or total == 0:
+        yield from range(total)
+        return
+
+    # Stride of each parameter in the cartesian numbering
+    strides = [1] * len(parameters)
+    for i in range(len(parameters) - 2, -1, -1):
+        strides[i] = strides[i + 1] * len(parameters[i + 1].values)
+
+    nesting = _nesting(parameters)
+    reflect = ordering is CaseOrdering.GRAY
+    offsets = [
+        [position * strides[i] for position in _steps(parameters[i], sort=reflect)] for i in nesting
+    ]
+    digits = [0] * len(nesting)
+    directions = [1] * len(nesting)
+
+    while True:
+        yield sum(offsets[k][digit] for k, digit in enumerate(digits))
+
+        # Advance the fastest digit that can move; reflected digits reverse at their ends
+        k = len(digits) - 1
+        while k >= 0:
+            digit = digits[k] + directions[k]
+            if 0 <= digit < len(offsets[k]):
+                digits[k] = digit
+                break
+            if reflect:
+                directions[k] = -directions[k]
+            else:
+                digits[k] = 0
+            k -= 1
+        if k < 0:
+            return
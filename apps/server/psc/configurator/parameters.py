@@ -64,3 +64,8 @@ class TurbulenceModelParameter(BaseParameter[str]):
     def validation_rules(self) -> list[ValidationRule] | None:
         """Validation rules for turbulence model."""
         return None
+
+    @property
+    def expensive_to_switch(self) -> bool:
+        """Switching turbulence model discards the solver setup and converged fields."""
+        return True
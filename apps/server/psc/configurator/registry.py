@@ -22,7 +22,12 @@ class ParameterRegistry:
         parameter_class = self.parameters[key]
         return parameter_class.model_validate(parameter_data)
 
+    # Schemas of the registered parameters, built on first use
+    _schema: list[dict] | None = None
+
     @property
     def schema(self) -> list[dict]:
         """Get the schema for the parameters in the registry."""
-        return [param.get_schema() for param in self.parameters.values()]
+        if ParameterRegistry._schema is None:
+            ParameterRegistry._schema = [param.get_schema() for param in self.parameters.values()]
+        return ParameterRegistry._schema
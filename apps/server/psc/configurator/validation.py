@@ -0,0 +1,166 @@
+"""Accept-then-validate submission of large parameter sweep configurations.
+
+A large submission is stored right away with the PENDING_VALIDATION status and its ID is
+returned, so the request does not hold the event loop while its values are checked. The
+validator then loads and validates the parameters, normalizes them and counts the cases on
+a worker thread, and marks the configuration READY, or INVALID with the error. Validations
+interrupted by a restart are resumed on the next startup.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from enum import Enum
+from uuid import UUID
+
+from psc.storage import ConfigRecord, Repository, get_repository
+
+from .cases import case_count
+from .hashing import compute_parameters_hash
+from .registry import ParameterRegistry, ParameterUnion
+
+logger = logging.getLogger(__name__)
+
+# Submissions with more parameter values than this in total are validated asynchronously
+ASYNC_VALIDATION_VALUES = int(os.getenv("PSC_ASYNC_VALIDATION_VALUES", "10000"))
+
+# Maximum number of configurations validated at once
+VALIDATION_WORKERS = int(os.getenv("PSC_VALIDATION_WORKERS", "2"))
+
+# Seconds between status checks of a configuration validated by another process
+VALIDATION_POLL_INTERVAL = 1.0
+
+
+class ConfigStatus(Enum):
+    """Validation status of a stored configuration."""
+
+    PENDING_VALIDATION = "PENDING_VALIDATION"
+    READY = "READY"
+    INVALID = "INVALID"
+
+
+def prepare_parameters(data: list[dict]) -> tuple[list[ParameterUnion], str, int]:
+    """Load and validate serialized parameters.
+
+    Returns the parameters, their content hash and the number of cases; raises on the first
+    invalid parameter.
+    """
+    registry = ParameterRegistry()
+    parameters = [registry.load(param_data) for param_data in data]
+    for param in parameters:
+        param.validate()
+    return parameters, compute_parameters_hash(parameters), case_count(parameters)
+
+
+class ConfigValidator:
+    """Validates stored PENDING_VALIDATION configurations in the background."""
+
+    def __init__(self, workers: int = VALIDATION_WORKERS, repository: Repository | None = None):
+        """Initialize a validator running up to `workers` validations at once."""
+        self._repository = repository
+        self._workers = asyncio.Semaphore(workers)
+        # Config ID -> validation task
+        self._tasks: dict[UUID, asyncio.Task] = {}
+
+    @property
+    def repository(self) -> Repository:
+        """Get the repository results are stored in."""
+        return self._repository if self._repository is not None else get_repository()
+
+    async def start(self) -> None:
+        """Resume the validations left pending by a previous server process."""
+        for id in await self.repository.pending_config_ids():
+            self._schedule(id)
+
+    async def shutdown(self) -> None:
+        """Cancel running validations; they stay pending and resume on the next start."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(
+        self, name: str, description: str, parameters: list[dict], ordering: str
+    ) -> ConfigRecord:
+        """Store a configuration as PENDING_VALIDATION and validate it in the background."""
+        config = await self.repository.upsert_config(
+            ConfigRecord(
+                name=name,
+                description=description,
+                parameters=parameters,
+                parameter_count=len(parameters),
+                # Set once the parameters are normalized, so invalid ones never deduplicate
+                parameters_hash=None,
+                ordering=ordering,
+                status=ConfigStatus.PENDING_VALIDATION.value,
+            )
+        )
+        self._schedule(config.id, config)
+        return config
+
+    def _schedule(self, id: UUID, config: ConfigRecord | None = None) -> None:
+        if id in self._tasks:
+            return
+        task = asyncio.create_task(self._validate(id, config))
+        self._tasks[id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(id, None))
+
+    async def _validate(self, id: UUID, config: ConfigRecord | None) -> None:
+        """Validate a configuration, loading it first when it is resumed by ID."""
+        async with self._workers:
+            start = time.perf_counter()
+            if config is None:
+                config = await self.repository.get_config(id, primary=True)
+                if config is None or config.status != ConfigStatus.PENDING_VALIDATION.value:
+                    return
+            try:
+                parameters, parameters_hash, cases = await asyncio.to_thread(
+                    prepare_parameters, config.parameters
+                )
+            except Exception as e:
+                status, reason = ConfigStatus.INVALID, f"Parameter validation failed: {e}"
+                result = {"reason": reason[:200]}
+            else:
+                status = ConfigStatus.READY
+                result = {
+                    "parameters": [param.serialize() for param in parameters],
+                    "parameters_hash": parameters_hash,
+                    "total_cases": cases,
+                }
+
+            try:
+                stored = await self.repository.set_config_status(config.id, status.value, **result)
+            except Exception:
+                logger.exception("Failed to store the validation result of %s", config.id)
+                return
+            if stored is None:
+                # Deleted while it was being validated
+                return
+            if stored.duplicate_of is not None:
+                outcome = f"{stored.status} (duplicate of {stored.duplicate_of})"
+            elif status is ConfigStatus.READY:
+                outcome = f"{stored.status} ({cases} cases)"
+            else:
+                outcome = stored.status
+            logger.info(
+                "Validated configuration %s in %.3f s: %s",
+                config.id,
+                time.perf_counter() - start,
+                outcome,
+            )
+
+    async def wait(self, id: UUID, timeout: float = VALIDATION_POLL_INTERVAL) -> None:
+        """Wait up to `timeout` seconds for a configuration's validation to finish.
+
+        Configurations validated by another process are not tracked here, so this then
+        simply waits for the timeout before their status is checked again.
+        """
+        task = self._tasks.get(id)
+        if task is None:
+            await asyncio.sleep(timeout)
+        else:
+            await asyncio.wait({task}, timeout=timeout)
+
+
+config_validator = ConfigValidator()
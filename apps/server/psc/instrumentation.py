@@ -0,0 +1,99 @@
+"""Application metrics for the API, simulation and WebSocket hot paths."""
+
+import os
+import resource
+import sys
+import time
+
+from psc.metrics import Counter, Gauge, Histogram
+
+http_requests = Counter(
+    "psc_http_requests_total", "Number of HTTP requests", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "psc_http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+
+ws_active_connections = Gauge("psc_ws_active_connections", "Number of open WebSocket connections")
+ws_broadcast_duration = Histogram(
+    "psc_ws_broadcast_duration_seconds", "Time to fan out a status update to all listeners"
+)
+ws_messages_sent = Counter("psc_ws_messages_sent_total", "Number of WebSocket messages sent")
+ws_send_failures = Counter("psc_ws_send_failures_total", "Number of WebSocket sends that failed")
+ws_heartbeats_sent = Counter(
+    "psc_ws_heartbeats_sent_total", "Number of heartbeats sent to WebSocket subscribers"
+)
+ws_idle_reaped = Counter(
+    "psc_ws_idle_reaped_total", "Number of WebSocket connections closed for being idle"
+)
+ws_rejected_connections = Counter(
+    "psc_ws_rejected_connections_total", "Number of subscribers rejected by connection limits"
+)
+
+simulation_running_tasks = Gauge(
+    "psc_simulation_running_tasks", "Number of simulation tasks currently running"
+)
+simulation_status_commit_duration = Histogram(
+    "psc_simulation_status_commit_seconds", "Latency of committing a simulation status update"
+)
+
+rate_limited_requests = Counter(
+    "psc_rate_limited_requests_total",
+    "Number of requests rejected by rate limits or load shedding",
+    ("route_class", "reason"),
+)
+event_loop_lag = Gauge("psc_event_loop_lag_seconds", "Latest event loop lag sample")
+
+startup_duration = Gauge("psc_startup_seconds", "Time spent in each startup stage", ("stage",))
+server_ready = Gauge("psc_server_ready", "1 while the server is ready to serve traffic")
+
+process_resident_memory = Gauge(
+    "psc_process_resident_memory_bytes", "Resident memory size of the server process"
+)
+
+
+def _resident_memory_bytes() -> float:
+    """Get the current resident set size, falling back to the peak where unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+process_resident_memory.set_function(_resident_memory_bytes)
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records request counts and latency per route template."""
+
+    def __init__(self, app):
+        """Wrap an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Time HTTP requests and label them by method, route template and status."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by the matched route template to keep label cardinality bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            http_request_duration.labels(method, route_path).observe(time.perf_counter() - start)
+            http_requests.labels(method, route_path, str(status_code)).inc()
@@ -0,0 +1,149 @@
+"""Application lifecycle: startup warmup, readiness and graceful shutdown.
+
+Startup opens the storage backend's connections ahead of the first request, resumes pending
+configuration validations, builds the parameter schemas and the OpenAPI schema, and indexes
+existing checkpoints. The server
+reports ready once storage is open; if the database is unreachable, warmup is retried in the
+background while `/ready` keeps failing. Shutdown refuses new runs and subscribers, drains
+the simulation manager and then closes storage, all within `PSC_SHUTDOWN_TIMEOUT`.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import Enum
+
+from fastapi import FastAPI
+
+import psc
+from psc import instrumentation
+from psc.configurator.registry import ParameterRegistry
+from psc.configurator.validation import config_validator
+from psc.db import DB_POOL_SIZE
+from psc.ratelimit import RATE_LIMIT_ENABLED, bucket_store, load_shedder
+from psc.simulation import simulation_manager
+from psc.storage import get_repository
+
+logger = logging.getLogger(__name__)
+
+# Pooled connections opened per Postgres database at startup (0 connects lazily on first use)
+STARTUP_WARM_CONNECTIONS = int(os.getenv("PSC_STARTUP_WARM_CONNECTIONS", str(DB_POOL_SIZE)))
+
+# Seconds between warmup attempts while the database is unreachable
+STARTUP_RETRY_SECONDS = float(os.getenv("PSC_STARTUP_RETRY_SECONDS", "5"))
+
+# Seconds shutdown may take to drain runs and subscribers and close storage
+SHUTDOWN_TIMEOUT = float(os.getenv("PSC_SHUTDOWN_TIMEOUT", "10"))
+
+
+class Phase(Enum):
+    """Lifecycle phase of the server process."""
+
+    STARTING = "starting"
+    READY = "ready"
+    DRAINING = "draining"
+    STOPPED = "stopped"
+
+
+class Lifecycle:
+    """Tracks the server's phase and runs its startup and shutdown stages."""
+
+    def __init__(self):
+        """Initialize a lifecycle in the starting phase."""
+        self.phase = Phase.STARTING
+        # Stage name -> seconds taken
+        self.stages: dict[str, float] = {}
+        self._warmup_task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Check whether the server is ready to serve traffic."""
+        return self.phase is Phase.READY
+
+    def _record(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = seconds
+        instrumentation.startup_duration.labels(stage).set(seconds)
+
+    def _set_phase(self, phase: Phase) -> None:
+        self.phase = phase
+        instrumentation.server_ready.set(1 if phase is Phase.READY else 0)
+
+    def mark_imported(self) -> None:
+        """Record the time spent importing the application."""
+        self._record("import", time.perf_counter() - psc.IMPORT_STARTED)
+
+    async def _open_storage(self) -> None:
+        start = time.perf_counter()
+        await get_repository().start(STARTUP_WARM_CONNECTIONS)
+        await config_validator.start()
+        self._record("storage", time.perf_counter() - start)
+
+    async def _warm_until_ready(self) -> None:
+        """Retry opening storage until the database is reachable, then become ready."""
+        while self.phase is Phase.STARTING:
+            try:
+                await self._open_storage()
+            except Exception:
+                logger.warning(
+                    "Database warmup failed; retrying in %.0f s",
+                    STARTUP_RETRY_SECONDS,
+                    exc_info=True,
+                )
+                await asyncio.sleep(STARTUP_RETRY_SECONDS)
+            else:
+                self._set_phase(Phase.READY)
+
+    async def startup(self, app: FastAPI) -> None:
+        """Warm up the process before it serves traffic."""
+        start = time.perf_counter()
+        # Build the schemas that are otherwise built by the first request that needs them
+        _ = ParameterRegistry().schema
+        app.openapi()
+        await simulation_manager.start()
+        if RATE_LIMIT_ENABLED:
+            load_shedder.start()
+        self._record("precompute", time.perf_counter() - start)
+
+        self._warmup_task = asyncio.create_task(self._warm_until_ready())
+        # Serve liveness checks while the database is unreachable; `/ready` reports it
+        await asyncio.wait({self._warmup_task}, timeout=STARTUP_RETRY_SECONDS)
+        logger.info(
+            "Startup %s: %s",
+            self.phase.value,
+            ", ".join(f"{stage} {seconds:.3f} s" for stage, seconds in self.stages.items()),
+        )
+
+    async def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Drain runs and subscribers, then close storage, within `timeout`."""
+        deadline = time.monotonic() + timeout
+        self._set_phase(Phase.DRAINING)
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+
+        await simulation_manager.shutdown(timeout)
+        await config_validator.shutdown()
+        await load_shedder.stop()
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(get_repository().close(), bucket_store.close()),
+                max(0.0, deadline - time.monotonic()),
+            )
+        except TimeoutError:
+            logger.warning("Shutdown deadline reached before storage was closed")
+        self._set_phase(Phase.STOPPED)
+
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Run startup before the server accepts connections and shutdown after it stops."""
+        await self.startup(app)
+        try:
+            yield
+        finally:
+            await self.shutdown()
+
+
+lifecycle = Lifecycle()
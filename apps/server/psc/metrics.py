@@ -0,0 +1,248 @@
+"""Lightweight in-process metrics primitives."""
+
+import os
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+
+# Disabled metrics are never recorded; hot paths check this flag before timing anything
+METRICS_ENABLED = os.getenv("PSC_METRICS_ENABLED", "true").lower() in ("true", "1")
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default latency buckets in seconds, from 1ms to 10s
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def format_bound(bound: float) -> str:
+    """Format a histogram bucket upper bound as a label value."""
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class Metric:
+    """Base class for a metric family, optionally split by label values."""
+
+    type: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize the metric family and register it."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Metric] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def labels(self, *labelvalues: str) -> "Metric":
+        """Get the child metric for the given label values."""
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"Expected {len(self.labelnames)} label values for {self.name}")
+
+        child = self._children.get(labelvalues)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labelvalues, self._new_child())
+        return child
+
+    def samples(self) -> list[tuple[tuple[str, ...], "Metric"]]:
+        """Get the (label values, child) pairs of this family."""
+        if not self.labelnames:
+            return [((), self)]
+        return list(self._children.items())
+
+    def _new_child(self) -> "Metric":
+        child = object.__new__(type(self))
+        child._init_child(self)
+        return child
+
+    def _init_child(self, parent: "Metric") -> None:
+        self.name = parent.name
+        self.documentation = parent.documentation
+        self.labelnames = ()
+        self._children = {}
+        self._lock = threading.Lock()
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize the counter at zero."""
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def _init_child(self, parent: Metric) -> None:
+        super()._init_child(parent)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter."""
+        self.value += amount
+
+
+class Gauge(Metric):
+    """Gauge that can go up and down, or be computed on read."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize the gauge at zero."""
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def _init_child(self, parent: Metric) -> None:
+        super()._init_child(parent)
+        self._value = 0.0
+        self._function = None
+
+    @property
+    def value(self) -> float:
+        """Get the current value of the gauge."""
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+    def set(self, value: float) -> None:
+        """Set the gauge to a value."""
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the gauge."""
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement the gauge."""
+        self._value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the gauge value by calling `function` whenever it is read."""
+        self._function = function
+
+
+class Histogram(Metric):
+    """Histogram of observed values over fixed cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """Initialize the histogram with empty buckets."""
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+        self._reset()
+
+    def _init_child(self, parent: Metric) -> None:
+        super()._init_child(parent)
+        self.buckets = parent.buckets
+        self._reset()
+
+    def _reset(self) -> None:
+        # One slot per bucket plus the implicit +Inf bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        """Get the cumulative bucket counts, sum and count of the histogram."""
+        cumulative = []
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts, strict=True):
+            total += count
+            cumulative.append({"le": format_bound(bound), "count": total})
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class MetricsRegistry:
+    """Registry of all metric families in the process."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        """Register a metric family by name."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Metric | None:
+        """Get a registered metric family by name."""
+        return self._metrics.get(name)
+
+    def collect(self) -> list[Metric]:
+        """Get all registered metric families."""
+        return list(self._metrics.values())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(metrics_registry: "MetricsRegistry | None" = None) -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in (metrics_registry or registry).collect():
+        help_text = metric.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric.name} {help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+
+        for labelvalues, child in metric.samples():
+            if isinstance(child, Histogram):
+                snapshot = child.snapshot()
+                for bucket in snapshot["buckets"]:
+                    labels = _format_labels(
+                        (*metric.labelnames, "le"), (*labelvalues, bucket["le"])
+                    )
+                    lines.append(f"{metric.name}_bucket{labels} {bucket['count']}")
+                labels = _format_labels(metric.labelnames, labelvalues)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(snapshot['sum'])}")
+                lines.append(f"{metric.name}_count{labels} {snapshot['count']}")
+            else:
+                labels = _format_labels(metric.labelnames, labelvalues)
+                lines.append(f"{metric.name}{labels} {_format_value(child.value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+registry = MetricsRegistry()
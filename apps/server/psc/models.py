@@ -1,7 +1,7 @@
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class BaseResponse(BaseModel):
@@ -18,6 +18,13 @@ class HealthResponse(BaseResponse):
     message: str = "Server is running"
 
 
+class ReadinessResponse(BaseResponse):
+    """Readiness probe response model."""
+
+    status: str = "ready"
+    message: str = "Server is ready"
+
+
 class ValidationRule(BaseModel):
     """Validation rule model."""
 
@@ -54,6 +61,7 @@ class ParameterSweepConfigurationRequest(BaseModel):
     name: str
     description: str
     parameters: list[ParameterModel]
+    ordering: Literal["cartesian", "grouped", "gray"] = "cartesian"
 
 
 class ParameterSweepConfigurationModel(ParameterSweepConfigurationRequest):
@@ -62,11 +70,91 @@ class ParameterSweepConfigurationModel(ParameterSweepConfigurationRequest):
     id: UUID
 
 
+class ConfigStatusModel(BaseModel):
+    """Validation status of a parameter sweep configuration."""
+
+    id: UUID
+    status: Literal["PENDING_VALIDATION", "READY", "INVALID"]
+    reason: str | None = None
+    total_cases: int | None = None
+    # Set when the configuration is INVALID because an identical one was stored first
+    duplicate_of: UUID | None = None
+
+
+class AdaptiveRefinementModel(BaseModel):
+    """Adaptive refinement settings of a run."""
+
+    metric: str = "lift_coefficient"
+    budget: int = Field(ge=1, description="Maximum number of cases added to the grid")
+    tolerance: float = Field(0.0, ge=0.0, description="Stop once no cell's error exceeds this")
+    batch_size: int | None = Field(None, ge=1, description="Cases added per refinement pass")
+    max_depth: int = Field(6, ge=1, description="Maximum number of times a cell is split")
+
+
+class StopPolicyModel(BaseModel):
+    """Conditions that end a run early; unset conditions are not checked."""
+
+    max_failure_rate: float | None = Field(None, ge=0.0, le=1.0)
+    min_cases: int = Field(10, ge=1, description="Cases finished before the rate is checked")
+    max_consecutive_failures: int | None = Field(None, ge=1)
+    target_metric: str | None = None
+    target_value: float | None = None
+    target_mode: Literal["above", "below"] = "above"
+    max_wall_seconds: float | None = Field(None, gt=0.0)
+    max_cpu_seconds: float | None = Field(None, gt=0.0)
+
+
+class RunRequest(BaseModel):
+    """Options of a simulation run."""
+
+    adaptive: AdaptiveRefinementModel | None = None
+    stop: StopPolicyModel | None = None
+
+
 class SimulationStatusModel(BaseModel):
     """Response model for simulation status."""
 
     id: UUID
     config_id: UUID
     progress: int
+    completed_cases: int | None = None
+    total_cases: int | None = None
+    eta_seconds: float | None = None
     state: str
+    reason: str | None = None
+    created_at: str
+
+
+class HistogramBucketModel(BaseModel):
+    """Cumulative histogram bucket."""
+
+    le: str
+    count: int
+
+
+class HistogramModel(BaseModel):
+    """Histogram snapshot model."""
+
+    buckets: list[HistogramBucketModel]
+    sum: float
+    count: int
+
+
+class PoolStatsModel(BaseModel):
+    """Response model for database connection pool statistics."""
+
+    size: int
+    max_overflow: int
+    in_use: int
+    idle: int
+    overflow: int
+    checkout_wait: HistogramModel
+    slow_queries: int
+
+
+class ProfileModel(BaseModel):
+    """Response model for a stored profile file."""
+
+    name: str
+    size: int
     created_at: str
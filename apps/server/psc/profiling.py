@@ -0,0 +1,194 @@
+"""Opt-in profiling of individual requests and simulation runs."""
+
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from types import CodeType, FrameType
+from uuid import UUID
+
+# Profiling is enabled only when an output directory is configured
+PROFILE_DIR = Path(os.environ["PSC_PROFILE_DIR"]) if os.getenv("PSC_PROFILE_DIR") else None
+PROFILING_ENABLED = PROFILE_DIR is not None
+
+# Request header and query flag that opt a single request into profiling
+PROFILE_HEADER = b"x-psc-profile"
+PROFILE_QUERY_FLAG = re.compile(rb"(?:^|&)profile=request(?:&|$)")
+
+# Seconds between stack samples of a profiled simulation run
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PSC_PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# Code objects that mark the frames belonging to a simulation run
+_entrypoints: set[CodeType] = set()
+
+# Only one deterministic profiler can be active per interpreter
+_request_profile_lock = threading.Lock()
+
+
+def _timestamp() -> str:
+    return datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def _output_path(prefix: str, suffix: str) -> Path:
+    """Get a new file path in the profile directory."""
+    assert PROFILE_DIR is not None
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", prefix).strip("-")
+    return PROFILE_DIR / f"{slug}-{_timestamp()}{suffix}"
+
+
+def list_profiles() -> list[dict]:
+    """List the profile files in the profile directory, newest first."""
+    if PROFILE_DIR is None or not PROFILE_DIR.is_dir():
+        return []
+
+    files = [path for path in PROFILE_DIR.iterdir() if path.is_file()]
+    files.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    return [
+        {
+            "name": path.name,
+            "size": path.stat().st_size,
+            "created_at": datetime.fromtimestamp(path.stat().st_mtime, UTC).isoformat(),
+        }
+        for path in files
+    ]
+
+
+def get_profile_path(name: str) -> Path | None:
+    """Resolve a profile file by name, refusing anything outside the profile directory."""
+    if PROFILE_DIR is None or "/" in name or "\\" in name or name.startswith("."):
+        return None
+
+    path = PROFILE_DIR / name
+    return path if path.is_file() else None
+
+
+def register_entrypoint(function: Callable) -> Callable:
+    """Register a function whose frames belong to the run it works on.
+
+    The run is identified by the function's `config_id` argument, or else by the
+    `config_id` of its `run` argument, e.g. a `RunState`.
+    """
+    _entrypoints.add(function.__code__)
+    return function
+
+
+class RunProfiler:
+    """Sampling profiler that attributes event loop stacks to a single simulation run.
+
+    A background thread samples the calling thread's stack and keeps the samples that pass
+    through a registered entrypoint frame working on the run (see `register_entrypoint`),
+    such as a worker's batch task, whose stack does not include `run_simulation`. Samples
+    are written as collapsed stacks, ready for flame graph tools.
+    """
+
+    def __init__(self, config_id: UUID, interval: float = PROFILE_SAMPLE_INTERVAL):
+        """Initialize the profiler for a run."""
+        self.config_id = config_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self.path: Path | None = None
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def __enter__(self) -> "RunProfiler":
+        """Start sampling."""
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop sampling and write the collapsed stacks."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+        self.path = _output_path(f"run-{self.config_id}", ".collapsed")
+        with self.path.open("w") as output:
+            for stack, count in self.samples.most_common():
+                output.write(f"{stack} {count}\n")
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                stack = self._collapse(frame)
+                if stack:
+                    self.samples[stack] += 1
+
+    @staticmethod
+    def _run_id(frame: FrameType) -> UUID | None:
+        """Get the ID of the run an entrypoint frame works on."""
+        local_vars = frame.f_locals
+        if "config_id" in local_vars:
+            return local_vars["config_id"]
+        return getattr(local_vars.get("run"), "config_id", None)
+
+    def _collapse(self, frame: FrameType | None) -> str | None:
+        names = []
+        belongs_to_run = False
+        while frame is not None:
+            code = frame.f_code
+            if code in _entrypoints and self._run_id(frame) == self.config_id:
+                belongs_to_run = True
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names)) if belongs_to_run else None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that cProfiles requests carrying the profile header or query flag.
+
+    The profile file name is returned in the `X-PSC-Profile` response header and can be
+    downloaded from `GET /admin/profiles/{name}`. Concurrent requests on the event loop
+    are included in the profile, so profile under low load for clean results.
+    """
+
+    def __init__(self, app):
+        """Wrap an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Profile the request if it opted in and no other request is being profiled."""
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not _request_profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, "busy"))
+            return
+
+        import cProfile
+
+        path = _output_path(f"request-{scope['method']}-{scope['path']}", ".pstats")
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, self._with_header(send, path.name))
+            finally:
+                profiler.disable()
+            profiler.dump_stats(path)
+        finally:
+            _request_profile_lock.release()
+
+    @staticmethod
+    def _requested(scope) -> bool:
+        if PROFILE_QUERY_FLAG.search(scope.get("query_string", b"")):
+            return True
+        return any(name == PROFILE_HEADER for name, _ in scope.get("headers", []))
+
+    @staticmethod
+    def _with_header(send, value: str):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (b"x-psc-profile", value.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        return send_wrapper
@@ -0,0 +1,386 @@
+"""Per-client rate limiting and load shedding for the expensive endpoints.
+
+Requests are grouped into route classes (creating configurations, starting runs and
+subscribing to status streams), each with its own token bucket per client. A client that
+empties a bucket gets `429` with `Retry-After` set to when its next token arrives. Requests
+in a route class are also shed with `503` while the server is overloaded: too many of them
+in flight, the database pool nearly exhausted or the event loop lagging. Other endpoints
+(health, readiness, metrics and reads) are never limited.
+
+Buckets live in process memory by default, so each worker process limits on its own. Set
+`PSC_RATE_LIMIT_BACKEND=sqlite` to share them between the processes of one host through a
+SQLite file at `PSC_RATE_LIMIT_SQLITE_PATH`.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from psc import instrumentation
+from psc.storage import get_repository
+
+logger = logging.getLogger(__name__)
+
+# Set to false to disable rate limiting and load shedding entirely
+RATE_LIMIT_ENABLED = os.getenv("PSC_RATE_LIMIT_ENABLED", "true").lower() in ("true", "1")
+
+# Where token buckets are kept: "memory" (per process) or "sqlite" (shared by processes)
+RATE_LIMIT_BACKEND = os.getenv("PSC_RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_SQLITE_PATH = os.getenv("PSC_RATE_LIMIT_SQLITE_PATH", "psc-ratelimit.sqlite3")
+
+# Per-client limits per route class as "<requests>/<seconds>"; the bucket holds <requests>
+RATE_LIMIT_CREATE = os.getenv("PSC_RATE_LIMIT_CREATE", "30/60")
+RATE_LIMIT_RUN = os.getenv("PSC_RATE_LIMIT_RUN", "10/60")
+RATE_LIMIT_SUBSCRIBE = os.getenv("PSC_RATE_LIMIT_SUBSCRIBE", "60/60")
+
+# Identify clients by the first `X-Forwarded-For` address; only enable behind a proxy
+RATE_LIMIT_TRUST_PROXY = os.getenv("PSC_RATE_LIMIT_TRUST_PROXY", "false").lower() in (
+    "true",
+    "1",
+)
+
+# Maximum number of limited HTTP requests in flight per process, or 0 for no limit
+SHED_MAX_CONCURRENT = int(os.getenv("PSC_SHED_MAX_CONCURRENT", "64"))
+
+# Fraction of the database pool checked out above which limited requests are shed
+SHED_POOL_SATURATION = float(os.getenv("PSC_SHED_POOL_SATURATION", "0.9"))
+
+# Event loop lag in seconds above which limited requests are shed, or 0 to ignore lag
+SHED_LOOP_LAG = float(os.getenv("PSC_SHED_LOOP_LAG", "0.5"))
+
+# `Retry-After` seconds sent with shed requests
+SHED_RETRY_AFTER = int(os.getenv("PSC_SHED_RETRY_AFTER", "2"))
+
+# Seconds between event loop lag samples
+LOOP_LAG_INTERVAL = 0.25
+
+# Maximum number of client buckets kept in memory; the least recently used are dropped
+MAX_MEMORY_BUCKETS = 100_000
+
+if RATE_LIMIT_BACKEND not in ("memory", "sqlite"):
+    raise ValueError(f"Invalid PSC_RATE_LIMIT_BACKEND: {RATE_LIMIT_BACKEND}")
+
+
+@dataclass(frozen=True)
+class Limit:
+    """A token bucket that holds `burst` tokens and refills at `rate` tokens per second."""
+
+    rate: float
+    burst: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Limit":
+        """Parse a `<requests>/<seconds>` limit."""
+        try:
+            requests, seconds = (float(part) for part in value.split("/"))
+        except ValueError as e:
+            raise ValueError(f"Invalid rate limit {value!r}, expected <requests>/<seconds>") from e
+        if requests <= 0 or seconds <= 0:
+            raise ValueError(f"Invalid rate limit {value!r}, both parts must be positive")
+        return cls(rate=requests / seconds, burst=requests)
+
+    def take(self, tokens: float, elapsed: float) -> tuple[float, float]:
+        """Take a token from a bucket holding `tokens`, `elapsed` seconds after its last update.
+
+        Returns the tokens left and the seconds to wait, which is 0 if a token was taken.
+        """
+        tokens = min(self.burst, tokens + elapsed * self.rate)
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.rate
+
+
+# Route class -> limit
+LIMITS = {
+    "create": Limit.parse(RATE_LIMIT_CREATE),
+    "run": Limit.parse(RATE_LIMIT_RUN),
+    "subscribe": Limit.parse(RATE_LIMIT_SUBSCRIBE),
+}
+
+# (scope type, method, path) patterns of each route class; unmatched requests are not limited
+ROUTE_CLASSES = (
+    ("http", "POST", re.compile(r"^/configs/?$"), "create"),
+    ("http", "POST", re.compile(r"^/configs/run/[^/]+/?$"), "run"),
+    ("http", "GET", re.compile(r"^/sse/configs/[^/]+/?$"), "subscribe"),
+    ("websocket", None, re.compile(r"^/ws/configs/[^/]+/?$"), "subscribe"),
+)
+
+
+def route_class(scope) -> str | None:
+    """Get the route class of a request, or None if it is not limited."""
+    for scope_type, method, pattern, name in ROUTE_CLASSES:
+        if scope["type"] != scope_type or (method is not None and scope["method"] != method):
+            continue
+        if pattern.match(scope["path"]):
+            return name
+    return None
+
+
+def client_key(scope) -> str:
+    """Identify the client of a request by its address."""
+    if RATE_LIMIT_TRUST_PROXY:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class BucketStore(ABC):
+    """Storage of token buckets by key."""
+
+    @abstractmethod
+    async def take(self, key: str, limit: Limit) -> float:
+        """Take a token from the bucket at `key`; returns the seconds to wait, 0 if taken."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release the store's resources."""
+
+
+class MemoryBucketStore(BucketStore):
+    """Token buckets in process memory, bounded to the most recently used clients."""
+
+    def __init__(self, max_buckets: int = MAX_MEMORY_BUCKETS):
+        """Initialize an empty store keeping up to `max_buckets` buckets."""
+        self.max_buckets = max_buckets
+        # Key -> (tokens, monotonic time of the last update), least recently used first
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, limit: Limit) -> float:
+        """Take a token from the bucket at `key`; returns the seconds to wait, 0 if taken."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (limit.burst, now))
+        tokens, wait = limit.take(tokens, now - updated)
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_buckets:
+            # A dropped bucket starts full again, which only ever errs in the client's favor
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def close(self) -> None:
+        """Drop all buckets."""
+        self._buckets.clear()
+
+
+class SQLiteBucketStore(BucketStore):
+    """Token buckets in a SQLite file shared by the server processes of one host.
+
+    Each take is one immediate transaction, so concurrent processes never both spend the
+    same token. Buckets untouched for longer than it takes any bucket to refill are deleted
+    now and then, since a missing bucket starts full anyway.
+    """
+
+    def __init__(self, path: str | Path, ttl: float):
+        """Initialize a store backed by the database at `path`, expiring buckets after `ttl`."""
+        self.path = str(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._expired_at = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _take(self, key: str, limit: Limit) -> float:
+        with self._lock:
+            connection = self._connect()
+            # Wall-clock time, as monotonic clocks are not comparable between processes
+            now = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated = row if row is not None else (limit.burst, now)
+                tokens, wait = limit.take(tokens, max(0.0, now - updated))
+                connection.execute(
+                    "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, "
+                    "updated = excluded.updated",
+                    (key, tokens, now),
+                )
+                if now - self._expired_at > self.ttl:
+                    connection.execute(
+                        "DELETE FROM rate_limit_buckets WHERE updated < ?", (now - self.ttl,)
+                    )
+                    self._expired_at = now
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            return wait
+
+    async def take(self, key: str, limit: Limit) -> float:
+        """Take a token from the bucket at `key`; returns the seconds to wait, 0 if taken."""
+        return await asyncio.to_thread(self._take, key, limit)
+
+    async def close(self) -> None:
+        """Close the database connection."""
+
+        def close() -> None:
+            with self._lock:
+                if self._connection is not None:
+                    self._connection.close()
+                    self._connection = None
+
+        await asyncio.to_thread(close)
+
+
+def create_bucket_store(backend: str = RATE_LIMIT_BACKEND) -> BucketStore:
+    """Create a token bucket store for a rate limit backend."""
+    match backend:
+        case "memory":
+            return MemoryBucketStore()
+        case "sqlite":
+            ttl = max(limit.burst / limit.rate for limit in LIMITS.values())
+            return SQLiteBucketStore(RATE_LIMIT_SQLITE_PATH, ttl)
+        case _:
+            raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+class LoadShedder:
+    """Decides when the server is too busy to take on more expensive requests."""
+
+    def __init__(
+        self,
+        max_concurrent: int = SHED_MAX_CONCURRENT,
+        pool_saturation: float = SHED_POOL_SATURATION,
+        loop_lag: float = SHED_LOOP_LAG,
+    ):
+        """Initialize a shedder with its concurrency, pool saturation and loop lag limits."""
+        self.max_concurrent = max_concurrent
+        self.pool_saturation = pool_saturation
+        self.loop_lag = loop_lag
+        self.in_flight = 0
+        # Latest event loop lag sample, in seconds
+        self.lag = 0.0
+        self._monitor: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start sampling event loop lag."""
+        if self.loop_lag > 0 and self._monitor is None:
+            self._monitor = asyncio.create_task(self._sample_lag())
+
+    async def stop(self) -> None:
+        """Stop sampling event loop lag."""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+
+    async def _sample_lag(self) -> None:
+        """Measure how late the event loop wakes up a sleeping task."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.lag = max(0.0, loop.time() - start - LOOP_LAG_INTERVAL)
+            instrumentation.event_loop_lag.set(self.lag)
+
+    def overload(self, concurrent: bool = True) -> str | None:
+        """Get the reason the server is overloaded, or None if it can take more work.
+
+        `concurrent` counts the request against the in-flight limit; stream subscriptions
+        are long-lived and capped by the connection limits instead.
+        """
+        if concurrent and 0 < self.max_concurrent <= self.in_flight:
+            return "concurrency"
+        if 0 < self.loop_lag <= self.lag:
+            return "loop_lag"
+        if get_repository().saturation() >= self.pool_saturation:
+            return "pool"
+        return None
+
+
+class RateLimitMiddleware:
+    """ASGI middleware that rate limits clients and sheds load on the limited route classes.
+
+    Rejected HTTP requests get a JSON `detail` like other errors; rejected WebSockets get
+    the same response if the server supports denial responses, and are otherwise closed
+    with code 1013 before being accepted.
+    """
+
+    def __init__(self, app, store: BucketStore | None = None, shedder: LoadShedder | None = None):
+        """Wrap an ASGI application."""
+        self.app = app
+        self.store = store if store is not None else bucket_store
+        self.shedder = shedder if shedder is not None else load_shedder
+
+    async def __call__(self, scope, receive, send):
+        """Reject the request if its client is over the limit or the server is overloaded."""
+        name = route_class(scope) if scope["type"] in ("http", "websocket") else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Shed before taking a token, so clients are not charged for requests never served
+        concurrent = scope["type"] == "http" and name != "subscribe"
+        reason = self.shedder.overload(concurrent)
+        if reason is not None:
+            instrumentation.rate_limited_requests.labels(name, reason).inc()
+            await self._reject(scope, send, 503, "Server is overloaded", SHED_RETRY_AFTER)
+            return
+
+        try:
+            wait = await self.store.take(f"{name}:{client_key(scope)}", LIMITS[name])
+        except Exception:
+            # A broken shared store must not take the API down with it
+            logger.warning("Rate limit store failed; allowing request", exc_info=True)
+            wait = 0.0
+        if wait > 0:
+            instrumentation.rate_limited_requests.labels(name, "rate").inc()
+            await self._reject(scope, send, 429, "Rate limit exceeded", math.ceil(wait))
+            return
+
+        if not concurrent:
+            await self.app(scope, receive, send)
+            return
+        self.shedder.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.in_flight -= 1
+
+    @staticmethod
+    async def _reject(scope, send, status: int, detail: str, retry_after: int) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ]
+        if scope["type"] == "http":
+            prefix = "http.response"
+        elif "websocket.http.response" in scope.get("extensions", {}):
+            prefix = "websocket.http.response"
+        else:
+            await send({"type": "websocket.close", "code": 1013, "reason": detail})
+            return
+        await send({"type": f"{prefix}.start", "status": status, "headers": headers})
+        await send({"type": f"{prefix}.body", "body": body})
+
+
+bucket_store = create_bucket_store()
+load_shedder = LoadShedder()
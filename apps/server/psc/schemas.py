@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 
@@ -28,6 +28,39 @@ class ParameterSweepConfig(Base):
         Integer, nullable=False, comment="Number of parameters in this configuration"
     )
 
+    # Content hash of the normalized parameter set, used to deduplicate identical sweeps
+    parameters_hash = Column(
+        String(64),
+        nullable=True,
+        comment="SHA-256 of the normalized parameter set",
+    )
+
+    ordering = Column(
+        String(20),
+        nullable=False,
+        default="cartesian",
+        server_default="cartesian",
+        comment="Case execution order: cartesian | grouped | gray",
+    )
+
+    # Large submissions are stored before they are validated (see `psc.configurator.validation`)
+    status = Column(
+        String(20),
+        nullable=False,
+        default="READY",
+        server_default="READY",
+        comment="Validation status: PENDING_VALIDATION | READY | INVALID",
+    )
+    reason = Column(String(200), nullable=True, comment="Why the configuration is invalid")
+    total_cases = Column(
+        BigInteger, nullable=True, comment="Number of cases, counted once validated"
+    )
+    duplicate_of = Column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="ID of the identical configuration this invalid one duplicates",
+    )
+
     # Timestamps
     created_at = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
@@ -39,8 +72,11 @@ class ParameterSweepConfig(Base):
         onupdate=func.now(),
     )
 
-    # Add GIN index for JSONB queries
-    __table_args__ = (Index("idx_parameters_gin", "parameters", postgresql_using="gin"),)
+    # Add GIN index for JSONB queries and a unique index on the content hash and ordering
+    __table_args__ = (
+        Index("idx_parameters_gin", "parameters", postgresql_using="gin"),
+        Index("idx_parameters_hash_ordering", "parameters_hash", "ordering", unique=True),
+    )
 
     def __repr__(self):
         """Return string representation of ParameterSweepConfig."""
@@ -54,6 +90,10 @@ class ParameterSweepConfig(Base):
             "description": self.description,
             "parameters": self.parameters,
             "parameter_count": self.parameter_count,
+            "parameters_hash": self.parameters_hash,
+            "ordering": self.ordering,
+            "status": self.status,
+            "reason": self.reason,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
@@ -81,15 +121,28 @@ class SimulationStatus(Base):
 
     config_id = Column(UUID(as_uuid=True), nullable=False)
 
+    parameters_hash = Column(
+        String(64),
+        nullable=True,
+        index=True,
+        comment="Content hash of the parameter set that was simulated",
+    )
+
     progress = Column(Integer, nullable=False, default=0, comment="Progress from 0 to 100")
 
+    completed_cases = Column(Integer, nullable=True, comment="Number of cases completed")
+    total_cases = Column(Integer, nullable=True, comment="Number of cases in the run")
+    eta_seconds = Column(Float, nullable=True, comment="Estimated seconds until the run completes")
+
     state = Column(
         String(20),
         nullable=False,
         default="QUEUED",
-        comment="QUEUED | RUNNING | COMPLETED | FAILED",
+        comment="QUEUED | RUNNING | COMPLETED | FAILED | STOPPED",
     )
 
+    reason = Column(String(200), nullable=True, comment="Why the run failed or was stopped")
+
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
@@ -112,6 +165,60 @@ class SimulationStatus(Base):
             "id": str(self.id),
             "config_id": str(self.config_id),
             "progress": self.progress,
+            "completed_cases": self.completed_cases,
+            "total_cases": self.total_cases,
+            "eta_seconds": self.eta_seconds,
+            "state": self.state,
+            "reason": self.reason,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class CaseRun(Base):
+    """Table for per-case simulation durations and output metrics.
+
+    Used to learn how case runtimes depend on parameter values, and to refine adaptive
+    sweeps where their output metrics vary most.
+    """
+
+    __tablename__ = "case_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+
+    config_id = Column(UUID(as_uuid=True), nullable=False)
+
+    case_index = Column(Integer, nullable=False, comment="Index of the case in the sweep")
+
+    parameters = Column(JSONB, nullable=False, comment="Parameter values of the case")
+
+    duration = Column(Float, nullable=False, comment="Wall-clock duration in seconds")
+
+    state = Column(String(20), nullable=False, default="COMPLETED", comment="COMPLETED | FAILED")
+
+    metrics = Column(JSONB, nullable=True, comment="Output metrics of the case")
+
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
+    )
+
+    __table_args__ = (Index("idx_case_runs_config_id_case_index", "config_id", "case_index"),)
+
+    def __repr__(self):
+        """Return string representation of CaseRun."""
+        return (
+            f"<CaseRun(id={self.id}, config_id={self.config_id}, case_index={self.case_index}, "
+            f"duration={self.duration}, state={self.state})>"
+        )
+
+    def to_dict(self):
+        """Convert to dictionary for API responses."""
+        return {
+            "id": str(self.id),
+            "config_id": str(self.config_id),
+            "case_index": self.case_index,
+            "parameters": self.parameters,
+            "duration": self.duration,
+            "metrics": self.metrics,
             "state": self.state,
             "created_at": self.created_at.isoformat(),
         }
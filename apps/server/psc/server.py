@@ -1,30 +1,65 @@
+import time
+from typing import Literal
 from uuid import UUID
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import (
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import select
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 
+from psc import metrics, profiling, ratelimit
+from psc.configurator.cases import case_count
 from psc.configurator.configurator import ParameterSweepConfigurator
-from psc.configurator.errors import ConfigurationNotFoundError
+from psc.configurator.errors import (
+    ConfigurationExistsError,
+    ConfigurationNotFoundError,
+    ConfigurationNotReadyError,
+)
+from psc.configurator.export import CaseFormat, export_cases, npy_size
+from psc.configurator.ordering import CaseOrdering
 from psc.configurator.registry import ParameterRegistry
-from psc.db import async_session_factory
+from psc.configurator.validation import ASYNC_VALIDATION_VALUES, ConfigStatus, config_validator
+from psc.db import engine, get_pool_stats, read_engine
+from psc.instrumentation import MetricsMiddleware
+from psc.lifecycle import lifecycle
 from psc.models import (
     BaseResponse,
+    ConfigStatusModel,
     HealthResponse,
     ParameterDefinition,
     ParameterSweepConfigurationModel,
     ParameterSweepConfigurationRequest,
+    PoolStatsModel,
+    ProfileModel,
+    ReadinessResponse,
+    RunRequest,
     SimulationStatusModel,
 )
-from psc.schemas import ParameterSweepConfig, SimulationStatus
-from psc.simulation import simulation_manager
+from psc.simulation import ConnectionLimitError, ServerDrainingError, simulation_manager
+from psc.simulation.adaptive import Refinement
+from psc.simulation.policies import StopPolicy
+from psc.simulation.protocol import negotiate_subprotocol
+from psc.simulation.sse import SSE_KEEPALIVE_SECONDS, EventStreamSubscriber, format_event
+from psc.storage import ConfigRecord, get_repository
 
 app = FastAPI(
     title="Parameter-Sweep Configurator",
     description="API for configuring and managing parameter sweeps",
     version="0.1.0",
+    lifespan=lifecycle.lifespan,
 )
 
+# Rate limit and shed load on expensive endpoints; CORS wraps it so rejections carry its headers
+if ratelimit.RATE_LIMIT_ENABLED:
+    app.add_middleware(ratelimit.RateLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +69,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route request metrics; skipped entirely when metrics are disabled
+if metrics.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Profile requests that opt in; only installed when a profile directory is configured
+if profiling.PROFILING_ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 
 @app.get("/", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
@@ -41,6 +84,55 @@ async def health_check() -> HealthResponse:
     return HealthResponse(status="healthy", message="Server is running")
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness_check() -> ReadinessResponse:
+    """Readiness probe: fails while the server is warming up or shutting down."""
+    if not lifecycle.ready:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server is {lifecycle.phase.value}",
+            headers={"Retry-After": "5"},
+        )
+    return ReadinessResponse()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """Expose metrics in the Prometheus text exposition format."""
+    if not metrics.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/admin/profiles", response_model=list[ProfileModel])
+async def get_profiles() -> list[ProfileModel]:
+    """List stored request and run profiles."""
+    if not profiling.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    return [ProfileModel.model_validate(profile) for profile in profiling.list_profiles()]
+
+
+@app.get("/admin/profiles/{name}")
+async def get_profile(name: str) -> FileResponse:
+    """Download a stored profile (`.pstats` for requests, `.collapsed` stacks for runs)."""
+    if not profiling.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    path = profiling.get_profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
+
+
+@app.get("/db/pool", response_model=PoolStatsModel)
+async def get_db_pool_stats(pool: Literal["primary", "replica"] = "primary") -> PoolStatsModel:
+    """Get database connection pool statistics for pool sizing."""
+    if get_repository().name != "postgres":
+        raise HTTPException(status_code=404, detail="Storage backend has no connection pool")
+    if pool == "replica" and read_engine is engine:
+        raise HTTPException(status_code=404, detail="No read replica configured")
+    return PoolStatsModel.model_validate(get_pool_stats(pool))
+
+
 @app.get("/parameters", response_model=list[ParameterDefinition])
 async def get_parameters() -> list[ParameterDefinition]:
     """Get all available parameter definitions."""
@@ -49,11 +141,39 @@ async def get_parameters() -> list[ParameterDefinition]:
     return [ParameterDefinition.model_validate(schema) for schema in schemas]
 
 
-@app.post("/configs", response_model=ParameterSweepConfigurationModel)
+@app.post(
+    "/configs",
+    response_model=ParameterSweepConfigurationModel,
+    responses={202: {"model": ConfigStatusModel}},
+)
 async def create_config(
     config: ParameterSweepConfigurationRequest,
-) -> ParameterSweepConfigurationModel:
-    """Create a new parameter sweep configuration."""
+    mode: Literal["auto", "sync", "async"] = "auto",
+) -> ParameterSweepConfigurationModel | JSONResponse:
+    """Create a new parameter sweep configuration.
+
+    A configuration identical to an existing one is not stored again: the request fails with
+    `409` and the `Location` of the existing configuration.
+
+    Submissions with more than `PSC_ASYNC_VALIDATION_VALUES` parameter values in total, or
+    any submission with `?mode=async`, are accepted with `202` and the configuration ID
+    before they are validated. Follow their validation with `GET /configs/{id}/status` or
+    `GET /sse/configs/{id}/status`. Pass `?mode=sync` to always validate within the request.
+    """
+    values = sum(len(param.values) for param in config.parameters)
+    if mode == "async" or (mode == "auto" and values > ASYNC_VALIDATION_VALUES):
+        record = await config_validator.submit(
+            name=config.name,
+            description=config.description,
+            parameters=[param.model_dump() for param in config.parameters],
+            ordering=config.ordering,
+        )
+        return JSONResponse(
+            status_code=202,
+            content=config_status(record).model_dump(mode="json"),
+            headers={"Location": f"/configs/{record.id}/status"},
+        )
+
     # Convert request parameters to internal parameter models
     registry = ParameterRegistry()
     parameters = [registry.load(param.model_dump()) for param in config.parameters]
@@ -65,9 +185,17 @@ async def create_config(
     except Exception as e:
         raise HTTPException(status_code=422, detail=f"Parameter validation failed: {str(e)}") from e
 
-    configurator = await ParameterSweepConfigurator.create(
-        name=config.name, description=config.description, parameters=parameters
-    )
+    try:
+        configurator = await ParameterSweepConfigurator.create(
+            name=config.name,
+            description=config.description,
+            parameters=parameters,
+            ordering=CaseOrdering(config.ordering),
+        )
+    except ConfigurationExistsError as e:
+        raise HTTPException(
+            status_code=409, detail=str(e), headers={"Location": f"/configs/{e.id}"}
+        ) from e
 
     # Convert response back to API format
     return ParameterSweepConfigurationModel(
@@ -78,6 +206,7 @@ async def create_config(
             {"key": param.key, "type": param.key, "values": param.values}
             for param in configurator.parameters
         ],
+        ordering=configurator.ordering.value,
     )
 
 
@@ -87,23 +216,28 @@ async def get_configs() -> list[ParameterSweepConfigurationModel]:
 
     # TODO: this is a demo to query all the configs from the database
     # In practice, we should use query params to paginate the configs
-    async with async_session_factory() as session:
-        stmt = select(ParameterSweepConfig).order_by(ParameterSweepConfig.created_at.desc())
-        result = await session.execute(stmt)
-        configs = result.scalars().all()
-
-        registry = ParameterRegistry()
-        return [
-            ParameterSweepConfigurationModel(
-                id=config.id,
-                name=config.name,
-                description=config.description,
-                parameters=[
-                    registry.load(param_data).serialize() for param_data in config.parameters
-                ],
-            )
-            for config in configs
-        ]
+    configs = await get_repository().list_configs()
+    # Configurations are listed once they are validated
+    return serialize_configs(
+        [config for config in configs if config.status == ConfigStatus.READY.value]
+    )
+
+
+def serialize_configs(
+    configs: list[ConfigRecord],
+) -> list[ParameterSweepConfigurationModel]:
+    """Serialize stored configurations into API response models."""
+    registry = ParameterRegistry()
+    return [
+        ParameterSweepConfigurationModel(
+            id=config.id,
+            name=config.name,
+            description=config.description,
+            parameters=[registry.load(param_data).serialize() for param_data in config.parameters],
+            ordering=config.ordering,
+        )
+        for config in configs
+    ]
 
 
 @app.get("/configs/{id}", response_model=ParameterSweepConfigurationModel)
@@ -113,12 +247,126 @@ async def get_config(id: UUID) -> ParameterSweepConfigurationModel:
         configurator = await ParameterSweepConfigurator.load(id)
     except ConfigurationNotFoundError as e:
         raise HTTPException(status_code=404, detail="Configuration not found") from e
+    except ConfigurationNotReadyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
 
     return ParameterSweepConfigurationModel(
         id=configurator.id,
         name=configurator.name,
         description=configurator.description,
         parameters=[param.serialize() for param in configurator.parameters],
+        ordering=configurator.ordering.value,
+    )
+
+
+def config_status(config: ConfigRecord) -> ConfigStatusModel:
+    """Get the validation status of a stored configuration."""
+    return ConfigStatusModel(
+        id=config.id,
+        status=config.status,
+        reason=config.reason,
+        total_cases=config.total_cases,
+        duplicate_of=config.duplicate_of,
+    )
+
+
+@app.get("/configs/{id}/status", response_model=ConfigStatusModel)
+async def get_config_status(id: UUID, response: Response) -> ConfigStatusModel:
+    """Get the validation status of a parameter sweep configuration.
+
+    A configuration found identical to one stored while it was validated is INVALID, with
+    the `Location` of the existing configuration.
+    """
+    # Read from the primary, as the validation result may have just been written
+    config = await get_repository().get_config(id, primary=True)
+    if config is None:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+    if config.duplicate_of is not None:
+        response.headers["Location"] = f"/configs/{config.duplicate_of}"
+    return config_status(config)
+
+
+@app.get("/sse/configs/{id}/status")
+async def stream_config_status_changes(id: UUID) -> StreamingResponse:
+    """Stream the validation status of a parameter sweep configuration as Server-Sent Events.
+
+    Sends a `status` event with the current status, and another when it changes. The
+    stream ends once the configuration is READY or INVALID.
+    """
+    if simulation_manager.draining:
+        raise HTTPException(
+            status_code=503, detail=str(ServerDrainingError()), headers={"Retry-After": "5"}
+        )
+    config = await get_repository().get_config(id, primary=True)
+    if config is None:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+
+    async def events():
+        nonlocal config
+        message = None
+        sent_at = time.monotonic()
+        while config is not None:
+            status = config_status(config).model_dump_json()
+            if status != message:
+                message = status
+                sent_at = time.monotonic()
+                yield format_event(message)
+            elif time.monotonic() - sent_at >= SSE_KEEPALIVE_SECONDS:
+                sent_at = time.monotonic()
+                yield ": keep-alive\n\n"
+            if config.status != ConfigStatus.PENDING_VALIDATION.value:
+                return
+            await config_validator.wait(id)
+            config = await get_repository().get_config(id, primary=True)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/configs/{id}/cases")
+async def get_config_cases(
+    id: UUID,
+    format: CaseFormat = CaseFormat.CSV,
+    start: int = Query(default=0, ge=0),
+    stop: int | None = Query(default=None, ge=0),
+) -> StreamingResponse:
+    """Stream the expanded cases of a parameter sweep as CSV, NDJSON or a `.npy` array.
+
+    Each case carries its cartesian case index, whatever the sweep's ordering. Pass
+    `?start=&stop=` to export only the cases in `[start, stop)`, e.g. one slice per array
+    task; the range is clipped to the sweep. Cases are encoded in chunks as they are sent,
+    so memory use does not grow with the number of cases.
+    """
+    if stop is not None and stop < start:
+        raise HTTPException(status_code=400, detail="stop must not be less than start")
+
+    try:
+        configurator = await ParameterSweepConfigurator.load(id)
+    except ConfigurationNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Configuration not found") from e
+    except ConfigurationNotReadyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+    parameters = configurator.parameters
+    total = case_count(parameters)
+    start = min(start, total)
+    stop = total if stop is None else min(stop, total)
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{id}-cases-{start}-{stop}.{format.value}"',
+        "X-PSC-Total-Cases": str(total),
+    }
+    if format is CaseFormat.NPY:
+        headers["Content-Length"] = str(npy_size(parameters, stop - start))
+
+    # A sync iterator, so the encoding runs in the threadpool instead of on the event loop
+    return StreamingResponse(
+        export_cases(parameters, format, start, stop),
+        media_type=format.media_type,
+        headers=headers,
     )
 
 
@@ -133,69 +381,145 @@ async def delete_config(id: UUID) -> BaseResponse:
 
 
 @app.post("/configs/run/{id}", response_model=BaseResponse)
-async def run_config(id: UUID) -> BaseResponse:
+async def run_config(
+    id: UUID,
+    request: RunRequest | None = None,
+    profile: Literal["run", "request"] | None = None,
+) -> BaseResponse:
     """Run a parameter sweep configuration.
 
     This endpoint will start a background task to run the simulation.
     Monitor the status of the simulation with `WS /ws/configs/{id}`.
+    Pass `?profile=run` to record a sampling profile of the run under `/admin/profiles`.
+
+    Pass `{"adaptive": {"metric": ..., "budget": ...}}` to refine the sweep adaptively: after
+    the configured grid, up to `budget` cases are added where the metric varies most.
+    Pass `{"stop": {...}}` to end the run early on failures, a target metric value or a time
+    budget, with a FAILED or STOPPED state and the reason.
     """
+    if profile is not None and not profiling.PROFILING_ENABLED:
+        raise HTTPException(status_code=400, detail="Profiling is disabled")
 
     try:
         configurator = await ParameterSweepConfigurator.load(id)
     except ConfigurationNotFoundError as e:
         raise HTTPException(status_code=404, detail="Configuration not found") from e
+    except ConfigurationNotReadyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
 
-    if simulation_manager.is_running(id):
+    if simulation_manager.is_running(id, configurator.parameters_hash, configurator.ordering):
         return BaseResponse(
             status="already_running",
             message="Simulation is already running for this configuration",
         )
 
-    configurator.run()
+    refinement = stop_policy = None
+    if request is not None and request.adaptive is not None:
+        refinement = Refinement(**request.adaptive.model_dump())
+    if request is not None and request.stop is not None:
+        stop_policy = StopPolicy(**request.stop.model_dump())
+    try:
+        configurator.run(refinement=refinement, stop_policy=stop_policy, profile=profile == "run")
+    except ServerDrainingError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"}) from e
     return BaseResponse(status="started", message="Simulation started successfully")
 
 
 @app.get("/configs/run/{id}", response_model=list[SimulationStatusModel])
 async def get_simulation_runs(id: UUID) -> list[SimulationStatusModel]:
     """Get simulation runs for a specific configuration."""
-    async with async_session_factory() as session:
-        stmt = (
-            select(SimulationStatus)
-            .where(SimulationStatus.config_id == id)
-            .order_by(SimulationStatus.created_at.desc())
+    simulations = await get_repository().list_statuses(id)
+    return [
+        SimulationStatusModel(
+            id=sim.id,
+            config_id=sim.config_id,
+            progress=sim.progress,
+            completed_cases=sim.completed_cases,
+            total_cases=sim.total_cases,
+            eta_seconds=sim.eta_seconds,
+            state=sim.state,
+            reason=sim.reason,
+            created_at=sim.created_at.isoformat(),
         )
-        result = await session.execute(stmt)
-        simulations = result.scalars().all()
-
-        return [
-            SimulationStatusModel(
-                id=sim.id,
-                config_id=sim.config_id,
-                progress=sim.progress,
-                state=sim.state,
-                created_at=sim.created_at.isoformat(),
-            )
-            for sim in simulations
-        ]
+        for sim in simulations
+    ]
 
 
 @app.websocket("/ws/configs/{id}")
-async def stream_config_status(websocket: WebSocket, id: UUID):
+async def stream_config_status(websocket: WebSocket, id: UUID, last_seq: int | None = None):
     """Stream the status of a parameter sweep configuration.
 
-    Call `POST /configs/{id}` to start the simulation.
-    """
-    await websocket.accept()
+    Call `POST /configs/{id}` to start the simulation. Status rows are sent as JSON unless
+    the client offers the `psc.progress.v1` subprotocol, in which case compact binary
+    progress frames are sent instead (see `psc.simulation.protocol`).
 
-    # Add connection to simulation manager
-    simulation_manager.add_connection(id, websocket)
+    The latest status is sent on connect. Reconnecting clients pass the `seq` of the last
+    update they received as `?last_seq=` to receive only the updates they missed.
+
+    The server sends heartbeats and closes connections that send nothing for
+    `PSC_WS_IDLE_TIMEOUT` seconds, so clients reply to each heartbeat with any message.
+    Connections over the server or per-configuration limit are closed with code 1013.
+    """
+    subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
 
     try:
-        # Keep connection alive
+        # Send the snapshot or missed updates, then add connection to simulation manager
+        await simulation_manager.subscribe(
+            id, websocket, binary=subprotocol is not None, last_seq=last_seq
+        )
+
+        # Keep connection alive; any client message counts as a heartbeat reply
         while True:
-            await websocket.receive_text()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            simulation_manager.touch_connection(websocket)
+    except (ConnectionLimitError, ServerDrainingError) as e:
+        await websocket.close(code=1013, reason=str(e))
     except WebSocketDisconnect:
         pass
     finally:
         # Remove connection when disconnected
         simulation_manager.remove_connection(id, websocket)
+
+
+@app.get("/sse/configs/{id}")
+async def stream_config_status_events(
+    id: UUID,
+    last_event_id: int | None = None,
+    last_event_id_header: int | None = Header(default=None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Stream the status of a parameter sweep configuration as Server-Sent Events.
+
+    Each status update is a `status` event whose ID is its `seq`. Browsers resume
+    automatically by sending the `Last-Event-ID` header on reconnect; other clients can pass
+    `?last_event_id=` instead.
+    """
+    try:
+        if simulation_manager.draining:
+            raise ServerDrainingError()
+        simulation_manager.connections.check(id)
+    except (ConnectionLimitError, ServerDrainingError) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"}) from e
+
+    subscriber = EventStreamSubscriber()
+    last_seq = last_event_id_header if last_event_id_header is not None else last_event_id
+
+    async def events():
+        try:
+            # SSE streams send their own keep-alive comments instead of heartbeats
+            await simulation_manager.subscribe(id, subscriber, last_seq=last_seq, heartbeat=False)
+            async for event in subscriber.events():
+                yield event
+        finally:
+            simulation_manager.remove_connection(id, subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+lifecycle.mark_imported()
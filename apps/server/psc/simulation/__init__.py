@@ -1,3 +1,4 @@
-from .demo import SimulationManager, simulation_manager
+from .connections import ConnectionLimitError
+from .demo import ServerDrainingError, SimulationManager, simulation_manager
 
-__all__ = ["SimulationManager", "simulation_manager"]
+__all__ = ["ConnectionLimitError", "ServerDrainingError", "SimulationManager", "simulation_manager"]
@@ -0,0 +1,229 @@
+"""Adaptive refinement of sweeps over their numeric parameters.
+
+The configured grid is the coarse pass. Its numeric parameters span boxes ("cells") between
+adjacent values, one set of cells per combination of enum values. A cell's error is
+estimated as the largest change of the output metric between adjacent corners, i.e. the
+local gradient times the cell size. The cells with the largest errors are split at their
+midpoints along the axes responsible for most of the error, which adds the cases at the new
+corners, and the refinement repeats until the case budget is spent or no cell's error
+exceeds the tolerance.
+"""
+
+import itertools
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from psc.configurator.models import BaseParameter, ParameterType
+
+NUMERIC_TYPES = (ParameterType.FLOAT, ParameterType.INTEGER)
+
+
+@dataclass(frozen=True)
+class Refinement:
+    """Settings of an adaptive run.
+
+    Refinement passes add up to `budget` cases to the configured grid, `batch_size` at a
+    time (one per worker slot by default), or more when splitting even a single cell needs
+    more cases than that.
+    """
+
+    metric: str
+    budget: int
+    tolerance: float = 0.0
+    batch_size: int | None = None
+    max_depth: int = 6
+
+
+def parameter_bounds(param: BaseParameter) -> tuple[float, float]:
+    """Get the range refinement may explore for a numeric parameter.
+
+    This is the span of the configured values, clipped to the parameter's `value`
+    validation rules so refined values are always valid.
+    """
+    low, high = min(param.values), max(param.values)
+    for rule in param.validation_rules or []:
+        if rule.type == "value":
+            if rule.min_value is not None:
+                low = max(low, rule.min_value)
+            if rule.max_value is not None:
+                high = min(high, rule.max_value)
+    return low, high
+
+
+@dataclass(frozen=True)
+class Cell:
+    """A box between grid points of the numeric parameters, within one enum layer."""
+
+    layer: tuple
+    bounds: tuple[tuple[float, float], ...]
+    depth: int = 0
+
+    def corners(self) -> list[tuple[float, ...]]:
+        """Get the numeric coordinates of the cell's corners."""
+        return list(itertools.product(*self.bounds))
+
+
+class AdaptiveRefiner:
+    """Chooses the cases of each refinement pass from the metric values seen so far."""
+
+    def __init__(
+        self,
+        parameters: Sequence[BaseParameter],
+        metric: str,
+        tolerance: float = 0.0,
+        max_depth: int = 6,
+    ):
+        """Initialize the cells spanned by the configured values of the numeric parameters."""
+        self.parameters = list(parameters)
+        self.metric = metric
+        self.tolerance = tolerance
+        self.max_depth = max_depth
+        self.numeric = [param for param in self.parameters if param.type in NUMERIC_TYPES]
+        self.enums = [param for param in self.parameters if param.type not in NUMERIC_TYPES]
+        self.bounds = [parameter_bounds(param) for param in self.numeric]
+
+        # (layer, numeric coordinates) -> metric value, or None while pending or failed
+        self.values: dict[tuple[tuple, tuple[float, ...]], float | None] = {}
+        self.cells: list[Cell] = []
+        if self.numeric:
+            axes = [sorted(set(param.values)) for param in self.numeric]
+            for layer in itertools.product(*(param.values for param in self.enums)):
+                for lows in itertools.product(*(range(len(axis) - 1) for axis in axes)):
+                    bounds = tuple(
+                        (axis[low], axis[low + 1]) for axis, low in zip(axes, lows, strict=True)
+                    )
+                    self.cells.append(Cell(layer=layer, bounds=bounds))
+
+    def _split(self, case: dict) -> tuple[tuple, tuple[float, ...]]:
+        layer = tuple(case[param.key] for param in self.enums)
+        point = tuple(case[param.key] for param in self.numeric)
+        return layer, point
+
+    def add_result(self, case: dict, metrics: dict | None) -> None:
+        """Record the metrics of a completed case, or None if it failed."""
+        value = (metrics or {}).get(self.metric)
+        self.values[self._split(case)] = float(value) if value is not None else None
+
+    def variations(self, cell: Cell) -> list[float] | None:
+        """Get the largest change of the metric along each axis between adjacent corners.
+
+        Returns None if any corner has no metric value yet.
+        """
+        corners = {corner: self.values.get((cell.layer, corner)) for corner in cell.corners()}
+        if any(value is None for value in corners.values()):
+            return None
+
+        variations = [0.0] * len(cell.bounds)
+        for corner, value in corners.items():
+            for axis, (low, high) in enumerate(cell.bounds):
+                if corner[axis] == low:
+                    neighbour = corner[:axis] + (high,) + corner[axis + 1 :]
+                    change = abs(corners[neighbour] - value)
+                    variations[axis] = max(variations[axis], change)
+        return variations
+
+    def error(self, cell: Cell) -> float | None:
+        """Estimate a cell's error, or None if any corner has no metric value yet."""
+        variations = self.variations(cell)
+        return max(variations, default=0.0) if variations is not None else None
+
+    def max_error(self) -> float | None:
+        """Get the largest estimated error over the cells that can be estimated."""
+        errors = [error for error in map(self.error, self.cells) if error is not None]
+        return max(errors, default=None)
+
+    def _midpoint(self, axis: int, low: float, high: float) -> float | None:
+        """Get the midpoint of an interval, or None if it cannot be split further."""
+        if self.numeric[axis].type is ParameterType.INTEGER:
+            middle = (low + high) // 2
+            return middle if low < middle < high else None
+        middle = (low + high) / 2
+        bound_low, bound_high = self.bounds[axis]
+        return middle if bound_low <= middle <= bound_high and low < middle < high else None
+
+    def refine(self, limit: int, budget: int | None = None) -> list[dict]:
+        """Split the cells with the largest errors and get the up to `limit` new cases.
+
+        A cell whose split would exceed the limit is split along its axis of largest
+        variation only, or else skipped for smaller cells. If no cell can be split within
+        the limit, the cell with the largest error is split within `budget` cases instead.
+        Returns an empty list once no cell's error exceeds the tolerance or no split fits.
+        """
+        ranked = sorted(
+            (
+                (error, cell)
+                for cell in self.cells
+                if cell.depth < self.max_depth
+                and (error := self.error(cell)) is not None
+                and error > self.tolerance
+            ),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+
+        new_cases: list[dict] = []
+        for error, cell in ranked:
+            axes = self._split_axes(cell, error, limit - len(new_cases))
+            if axes is not None:
+                new_cases.extend(self._split_cell(cell, axes))
+
+        if not new_cases and budget is not None and budget > limit:
+            for error, cell in ranked:
+                axes = self._split_axes(cell, error, budget)
+                if axes is not None:
+                    return self._split_cell(cell, axes)
+        return new_cases
+
+    def _split_axes(self, cell: Cell, error: float, room: int) -> list[tuple] | None:
+        """Get the points along each axis to split a cell at, adding at most `room` cases.
+
+        Returns None if the cell cannot be split within `room` new cases.
+        """
+        # Split only along the axes that account for most of the error
+        variations = self.variations(cell)
+        axes = []
+        for axis, (low, high) in enumerate(cell.bounds):
+            middle = self._midpoint(axis, low, high)
+            if middle is None or variations[axis] < error / 2:
+                axes.append((low, high))
+            else:
+                axes.append((low, middle, high))
+        if all(len(axis_points) == 2 for axis_points in axes):
+            return None
+
+        if len(self._new_points(cell, axes)) > room:
+            split = max(
+                (axis for axis, axis_points in enumerate(axes) if len(axis_points) == 3),
+                key=variations.__getitem__,
+            )
+            axes = [
+                axis_points if axis == split else (axis_points[0], axis_points[-1])
+                for axis, axis_points in enumerate(axes)
+            ]
+            if len(self._new_points(cell, axes)) > room:
+                return None
+        return axes
+
+    def _split_cell(self, cell: Cell, axes: list[tuple]) -> list[dict]:
+        """Replace a cell with its children and get the cases at their new corners."""
+        new_cases = []
+        for point in self._new_points(cell, axes):
+            self.values[(cell.layer, point)] = None
+            new_cases.append(self._case(cell.layer, point))
+
+        self.cells.remove(cell)
+        children = (itertools.pairwise(axis_points) for axis_points in axes)
+        for child in itertools.product(*children):
+            self.cells.append(Cell(layer=cell.layer, bounds=child, depth=cell.depth + 1))
+        return new_cases
+
+    def _new_points(self, cell: Cell, axes: list[tuple]) -> list[tuple[float, ...]]:
+        """Get the points of a split cell that have no case yet."""
+        return [
+            point for point in itertools.product(*axes) if (cell.layer, point) not in self.values
+        ]
+
+    def _case(self, layer: tuple, point: tuple[float, ...]) -> dict:
+        values = dict(zip((param.key for param in self.enums), layer, strict=True))
+        values.update(zip((param.key for param in self.numeric), point, strict=True))
+        return {param.key: values[param.key] for param in self.parameters}
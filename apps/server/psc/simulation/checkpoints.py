@@ -0,0 +1,327 @@
+"""Local store of converged case states for seeding neighbouring cases.
+
+Each checkpoint holds named array fields of one case of a configuration, written as raw
+files and memory-mapped on read, so large fields are paged in lazily and shared with the
+page cache instead of being copied into the process. The store keeps the total size of its
+checkpoints within a byte budget by evicting the least recently used ones.
+
+    <PSC_CHECKPOINT_DIR>/<config id>/<case index>/meta.json
+    <PSC_CHECKPOINT_DIR>/<config id>/<case index>/<field>.bin
+"""
+
+import array
+import json
+import logging
+import mmap
+import os
+import shutil
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from uuid import UUID
+
+from psc.configurator.models import BaseParameter, ParameterType
+
+logger = logging.getLogger(__name__)
+
+# Checkpointing is enabled only when a directory is configured
+CHECKPOINT_DIR = Path(os.environ["PSC_CHECKPOINT_DIR"]) if os.getenv("PSC_CHECKPOINT_DIR") else None
+CHECKPOINTS_ENABLED = CHECKPOINT_DIR is not None
+
+# Total bytes of checkpoint fields kept on disk before the least recently used are evicted
+CHECKPOINT_BUDGET = int(os.getenv("PSC_CHECKPOINT_BUDGET", str(1024**3)))
+
+META_FILE = "meta.json"
+FIELD_SUFFIX = ".bin"
+
+
+def parameter_key(case: Mapping) -> tuple:
+    """Get the hashable parameter tuple of a case."""
+    return tuple(sorted(case.items()))
+
+
+def _fixed_values(case: Mapping, names: Sequence[str]) -> tuple:
+    """Get the values of the parameters `names` of a case, None where a case has none."""
+    return tuple(case.get(name) for name in names)
+
+
+def grid_position(grid: Sequence[float], value: float) -> float:
+    """Get the position of a numeric value on an ascending grid, in grid steps.
+
+    Values between grid points (e.g. of cases added by adaptive refinement) are interpolated
+    linearly between their neighbours; values outside the grid are one step beyond its ends.
+    """
+    index = bisect_left(grid, value)
+    if index < len(grid) and grid[index] == value:
+        return float(index)
+    if index == 0:
+        return -1.0
+    if index == len(grid):
+        return float(len(grid))
+    low, high = grid[index - 1], grid[index]
+    return index - 1 + (value - low) / (high - low)
+
+
+def _as_array(values) -> tuple[str, bytes]:
+    """Get the typecode and raw bytes of a field value."""
+    if isinstance(values, array.array):
+        return values.typecode, values.tobytes()
+    if isinstance(values, bytes | bytearray):
+        return "B", bytes(values)
+    if isinstance(values, memoryview):
+        return values.format, values.tobytes()
+    return "d", array.array("d", values).tobytes()
+
+
+class Checkpoint:
+    """The stored state of one case, with its fields memory-mapped on first access."""
+
+    def __init__(self, path: Path, case_index: int, case: dict, fields: dict[str, str]):
+        """Initialize a checkpoint stored at `path` with field typecodes `fields`."""
+        self.path = path
+        self.case_index = case_index
+        self.case = case
+        self.fields = fields
+        self._views: dict[str, memoryview] = {}
+
+    @property
+    def key(self) -> tuple:
+        """Get the parameter tuple of the checkpointed case."""
+        return parameter_key(self.case)
+
+    def field(self, name: str) -> memoryview:
+        """Get a read-only memory-mapped view of a field, typed by its typecode."""
+        if name not in self._views:
+            typecode = self.fields[name]
+            with open(self.path / f"{name}{FIELD_SUFFIX}", "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    self._views[name] = memoryview(b"").cast(typecode)
+                else:
+                    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._views[name] = memoryview(mapped).cast(typecode)
+        return self._views[name]
+
+
+class CheckpointStore:
+    """Checkpoints keyed by configuration and case index, with a byte-budget LRU.
+
+    Checkpoints can also be found by parameter tuple and by nearest neighbour on the
+    parameter grid. The store is safe to use from worker threads.
+    """
+
+    def __init__(self, directory: Path, budget: int = CHECKPOINT_BUDGET, load: bool = True):
+        """Initialize a store in `directory`.
+
+        Checkpoints left by earlier processes are indexed now, or by `load` when `load` is
+        False, so servers can defer the directory scan to startup.
+        """
+        self.directory = directory
+        self.budget = budget
+        self.size = 0
+        self._lock = threading.Lock()
+        # (config id, case index) -> size in bytes, least recently used first
+        self._sizes: OrderedDict[tuple[UUID, int], int] = OrderedDict()
+        self._checkpoints: dict[tuple[UUID, int], Checkpoint] = {}
+        # Config id -> parameter tuple -> case index
+        self._keys: dict[UUID, dict[tuple, int]] = {}
+        # Config id -> fixed parameter names -> their values -> parameter tuple -> case index,
+        # built by the first `nearest` lookup with those fixed parameters
+        self._groups: dict[UUID, dict[tuple[str, ...], dict[tuple, dict[tuple, int]]]] = {}
+        if load:
+            self.load()
+
+    def load(self) -> None:
+        """Index the checkpoints in the directory that are not indexed yet."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found = []
+        for meta_path in self.directory.glob(f"*/*/{META_FILE}"):
+            try:
+                config_id = UUID(meta_path.parent.parent.name)
+                meta = json.loads(meta_path.read_text())
+            except (ValueError, OSError):
+                continue
+            found.append((meta_path.stat().st_mtime, config_id, meta_path.parent, meta))
+
+        with self._lock:
+            # Newest first, each moved to the front, so the oldest are evicted first and
+            # checkpoints written by this process stay the most recently used
+            for _, config_id, path, meta in sorted(found, key=lambda item: item[0], reverse=True):
+                entry = (config_id, meta["case_index"])
+                if entry in self._checkpoints:
+                    continue
+                checkpoint = Checkpoint(path, meta["case_index"], meta["case"], meta["fields"])
+                self._index(config_id, checkpoint, meta["size"])
+                self._sizes.move_to_end(entry, last=False)
+            self._evict()
+
+    def _index(self, config_id: UUID, checkpoint: Checkpoint, size: int) -> None:
+        entry = (config_id, checkpoint.case_index)
+        self._drop(entry)
+        self._sizes[entry] = size
+        self._checkpoints[entry] = checkpoint
+        self._keys.setdefault(config_id, {})[checkpoint.key] = checkpoint.case_index
+        for names, groups in self._groups.get(config_id, {}).items():
+            group = groups.setdefault(_fixed_values(checkpoint.case, names), {})
+            group[checkpoint.key] = checkpoint.case_index
+        self.size += size
+
+    def _drop(self, entry: tuple[UUID, int]) -> Checkpoint | None:
+        """Remove a checkpoint from the index; its files are left in place."""
+        checkpoint = self._checkpoints.pop(entry, None)
+        if checkpoint is not None:
+            self.size -= self._sizes.pop(entry)
+            keys = self._keys.get(entry[0], {})
+            keys.pop(checkpoint.key, None)
+            if not keys:
+                self._keys.pop(entry[0], None)
+                self._groups.pop(entry[0], None)
+            for names, groups in self._groups.get(entry[0], {}).items():
+                values = _fixed_values(checkpoint.case, names)
+                group = groups.get(values, {})
+                group.pop(checkpoint.key, None)
+                if not group:
+                    groups.pop(values, None)
+        return checkpoint
+
+    def _group(self, config_id: UUID, names: tuple[str, ...]) -> dict[tuple, dict[tuple, int]]:
+        """Get a configuration's checkpoints grouped by the values of the parameters `names`.
+
+        Call with the lock held.
+        """
+        keys = self._keys.get(config_id)
+        if keys is None:
+            return {}
+        groups = self._groups.setdefault(config_id, {})
+        if names not in groups:
+            grouped: dict[tuple, dict[tuple, int]] = {}
+            for key, case_index in keys.items():
+                grouped.setdefault(_fixed_values(dict(key), names), {})[key] = case_index
+            groups[names] = grouped
+        return groups[names]
+
+    def _evict(self) -> None:
+        """Delete least recently used checkpoints until the store is within its budget."""
+        while self.size > self.budget and self._sizes:
+            entry = next(iter(self._sizes))
+            checkpoint = self._drop(entry)
+            # Mapped views stay valid after the files are unlinked
+            shutil.rmtree(checkpoint.path, ignore_errors=True)
+
+    def put(
+        self,
+        config_id: UUID,
+        case_index: int,
+        case: dict,
+        fields: Mapping[str, Sequence[float] | array.array | bytes | memoryview],
+    ) -> Checkpoint:
+        """Store the fields of a case, replacing any previous checkpoint of it.
+
+        Sequences of numbers are stored as float64; arrays, bytes and memoryviews keep
+        their own item type.
+        """
+        path = self.directory / str(config_id) / str(case_index)
+        staging = path.with_name(f".{case_index}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        typecodes: dict[str, str] = {}
+        size = 0
+        for name, values in fields.items():
+            typecode, data = _as_array(values)
+            (staging / f"{name}{FIELD_SUFFIX}").write_bytes(data)
+            typecodes[name] = typecode
+            size += len(data)
+
+        meta = {"case_index": case_index, "case": case, "fields": typecodes, "size": size}
+        (staging / META_FILE).write_text(json.dumps(meta))
+
+        with self._lock:
+            # Swap in the complete checkpoint so readers never see a partial one
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(staging, path)
+            checkpoint = Checkpoint(path, case_index, case, typecodes)
+            self._index(config_id, checkpoint, size)
+            self._evict()
+        return checkpoint
+
+    def get(self, config_id: UUID, case_index: int) -> Checkpoint | None:
+        """Get the checkpoint of a case, marking it as recently used."""
+        entry = (config_id, case_index)
+        with self._lock:
+            checkpoint = self._checkpoints.get(entry)
+            if checkpoint is not None:
+                self._sizes.move_to_end(entry)
+            return checkpoint
+
+    def find(self, config_id: UUID, case: Mapping) -> Checkpoint | None:
+        """Get the checkpoint of a case by its parameter tuple."""
+        case_index = self._keys.get(config_id, {}).get(parameter_key(case))
+        return self.get(config_id, case_index) if case_index is not None else None
+
+    def nearest(
+        self,
+        config_id: UUID,
+        parameters: Sequence[BaseParameter],
+        case: Mapping,
+        fixed: Iterable[str] = (),
+        max_distance: float | None = None,
+    ) -> tuple[Checkpoint, float] | None:
+        """Find the checkpoint closest to a case on the parameter grid.
+
+        The distance is the number of grid steps between the cases, summed over
+        parameters: numeric values are stepped through in ascending order (see
+        `grid_position`) and differing enum values count as one step. Checkpoints whose
+        values of the `fixed` parameters differ from the case are never returned, and only
+        those sharing them are compared, through an index by their values. Returns the
+        checkpoint and its distance.
+        """
+        names = tuple(sorted(set(fixed)))
+        grids = {
+            param.key: sorted(param.values)
+            for param in parameters
+            if param.type in (ParameterType.FLOAT, ParameterType.INTEGER)
+        }
+
+        with self._lock:
+            if names:
+                group = self._group(config_id, names).get(_fixed_values(case, names), {})
+            else:
+                group = self._keys.get(config_id, {})
+            candidates = list(group.items())
+
+        best: tuple[float, int] | None = None
+        for key, case_index in candidates:
+            other = dict(key)
+            distance = 0.0
+            for param in parameters:
+                value, other_value = case.get(param.key), other.get(param.key)
+                if value == other_value:
+                    continue
+                if param.key in names or value is None or other_value is None:
+                    break
+                grid = grids.get(param.key)
+                if grid is None:
+                    distance += 1
+                else:
+                    distance += abs(grid_position(grid, value) - grid_position(grid, other_value))
+            else:
+                if (max_distance is None or distance <= max_distance) and (
+                    best is None or distance < best[0]
+                ):
+                    best = (distance, case_index)
+                    if distance == 0:
+                        break
+
+        if best is None:
+            return None
+        checkpoint = self.get(config_id, best[1])
+        return (checkpoint, best[0]) if checkpoint is not None else None
+
+    def discard(self, config_id: UUID) -> None:
+        """Delete all checkpoints of a configuration."""
+        with self._lock:
+            for entry in [entry for entry in self._sizes if entry[0] == config_id]:
+                self._drop(entry)
+        shutil.rmtree(self.directory / str(config_id), ignore_errors=True)
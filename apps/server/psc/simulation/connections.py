@@ -0,0 +1,139 @@
+"""Sharded registry of status subscribers with connection limits and idle reaping."""
+
+import os
+import time
+from collections.abc import Iterator
+from uuid import UUID
+
+from .protocol import ProgressEncoder
+
+# Maximum number of status subscribers per process, or 0 for no limit
+WS_MAX_CONNECTIONS = int(os.getenv("PSC_WS_MAX_CONNECTIONS", "10000"))
+
+# Maximum number of status subscribers per configuration, or 0 for no limit
+WS_MAX_CONNECTIONS_PER_CONFIG = int(os.getenv("PSC_WS_MAX_CONNECTIONS_PER_CONFIG", "1000"))
+
+# Seconds between heartbeats sent to each WebSocket subscriber
+WS_HEARTBEAT_INTERVAL = float(os.getenv("PSC_WS_HEARTBEAT_INTERVAL", "20"))
+
+# Seconds without any client message after which a WebSocket subscriber is closed
+WS_IDLE_TIMEOUT = float(os.getenv("PSC_WS_IDLE_TIMEOUT", "60"))
+
+# Number of registry shards; heartbeats and reaping visit one shard at a time
+WS_SHARDS = int(os.getenv("PSC_WS_SHARDS", "16"))
+
+
+class ConnectionLimitError(Exception):
+    """Exception raised when a subscriber would exceed a connection limit."""
+
+    def __init__(self, limit: int, config_id: UUID | None = None):
+        """Initialize with the exceeded limit and, for per-config limits, the configuration."""
+        self.limit = limit
+        self.config_id = config_id
+        scope = f"configuration {config_id}" if config_id is not None else "server"
+        super().__init__(f"Connection limit of {limit} reached for {scope}")
+
+
+class Connection:
+    """A registered status subscriber."""
+
+    __slots__ = ("websocket", "config_id", "encoder", "heartbeat", "last_seen")
+
+    def __init__(self, websocket, config_id: UUID, binary: bool = False, heartbeat: bool = True):
+        """Initialize a subscriber, seen now."""
+        self.websocket = websocket
+        self.config_id = config_id
+        self.encoder = ProgressEncoder() if binary else None
+        self.heartbeat = heartbeat
+        self.last_seen = time.monotonic()
+
+
+class ConnectionRegistry:
+    """Status subscribers grouped by configuration, spread over shards by configuration ID.
+
+    Registration, removal and lookup by socket are constant time. Sharding lets heartbeats
+    and idle reaping work through a bounded slice of the subscribers at a time instead of
+    walking every connection at once.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = WS_MAX_CONNECTIONS,
+        max_per_config: int = WS_MAX_CONNECTIONS_PER_CONFIG,
+        shards: int = WS_SHARDS,
+    ):
+        """Initialize an empty registry."""
+        self.max_connections = max_connections
+        self.max_per_config = max_per_config
+        self._shards: list[dict[UUID, dict[object, Connection]]] = [
+            {} for _ in range(max(shards, 1))
+        ]
+        self._connections: dict[object, Connection] = {}
+
+    def __len__(self) -> int:
+        """Get the total number of subscribers."""
+        return len(self._connections)
+
+    @property
+    def shard_count(self) -> int:
+        """Get the number of shards."""
+        return len(self._shards)
+
+    def _shard(self, config_id: UUID) -> dict[UUID, dict[object, Connection]]:
+        return self._shards[hash(config_id) % len(self._shards)]
+
+    def check(self, config_id: UUID) -> None:
+        """Raise `ConnectionLimitError` if another subscriber of a configuration would not fit."""
+        if self.max_connections and len(self._connections) >= self.max_connections:
+            raise ConnectionLimitError(self.max_connections)
+        if self.max_per_config and self.count(config_id) >= self.max_per_config:
+            raise ConnectionLimitError(self.max_per_config, config_id)
+
+    def add(
+        self, config_id: UUID, websocket, binary: bool = False, heartbeat: bool = True
+    ) -> Connection:
+        """Register a subscriber of a configuration, enforcing the connection limits."""
+        existing = self._connections.get(websocket)
+        if existing is not None:
+            return existing
+
+        self.check(config_id)
+        connection = Connection(websocket, config_id, binary=binary, heartbeat=heartbeat)
+        self._shard(config_id).setdefault(config_id, {})[websocket] = connection
+        self._connections[websocket] = connection
+        return connection
+
+    def remove(self, websocket) -> Connection | None:
+        """Unregister a subscriber, if registered."""
+        connection = self._connections.pop(websocket, None)
+        if connection is not None:
+            shard = self._shard(connection.config_id)
+            listeners = shard.get(connection.config_id)
+            if listeners is not None:
+                listeners.pop(websocket, None)
+                if not listeners:
+                    del shard[connection.config_id]
+        return connection
+
+    def get(self, websocket) -> Connection | None:
+        """Get a subscriber's registration."""
+        return self._connections.get(websocket)
+
+    def touch(self, websocket) -> None:
+        """Mark a subscriber as alive after receiving a message from it."""
+        connection = self._connections.get(websocket)
+        if connection is not None:
+            connection.last_seen = time.monotonic()
+
+    def listeners(self, config_id: UUID) -> list[Connection]:
+        """Get a snapshot of the subscribers of a configuration."""
+        return list(self._shard(config_id).get(config_id, {}).values())
+
+    def count(self, config_id: UUID) -> int:
+        """Get the number of subscribers of a configuration."""
+        return len(self._shard(config_id).get(config_id, ()))
+
+    def shard(self, index: int) -> Iterator[Connection]:
+        """Iterate over a snapshot of the subscribers in one shard."""
+        for listeners in list(self._shards[index].values()):
+            yield from list(listeners.values())
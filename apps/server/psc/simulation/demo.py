@@ -1,98 +1,741 @@
+import array
 import asyncio
 import json
+import math
+import os
+import random
+import time
+from collections.abc import Iterable, Sequence
 from uuid import UUID
 
-from psc.db import async_session_factory
-from psc.schemas import SimulationStatus
+from psc import instrumentation, profiling
+from psc.configurator.cases import case_count
+from psc.configurator.ordering import CaseOrdering, expensive_keys, iter_case_indices
+from psc.metrics import METRICS_ENABLED
+from psc.storage import CaseRunRecord, Repository, StatusRecord, get_repository
+
+from .adaptive import AdaptiveRefiner, Refinement
+from .checkpoints import CHECKPOINT_DIR, CHECKPOINTS_ENABLED, Checkpoint, CheckpointStore
+from .connections import (
+    WS_HEARTBEAT_INTERVAL,
+    WS_IDLE_TIMEOUT,
+    ConnectionLimitError,
+    ConnectionRegistry,
+)
+from .estimator import (
+    ESTIMATOR_HISTORY,
+    RunEstimate,
+    RuntimeModel,
+    pack_batches,
+    partition_contiguous,
+)
+from .history import HistoryStore, ProgressEvent
+from .policies import RunStopped, StopMonitor, StopPolicy
+from .protocol import HEARTBEAT_FRAME, RunProgress
+from .runs import CaseResult, RunState
+
+# JSON heartbeat sent to WebSocket subscribers; clients reply with any message
+HEARTBEAT_MESSAGE = json.dumps({"type": "heartbeat"})
+
+# Seconds a single heartbeat send may take before the connection is skipped
+WS_SEND_TIMEOUT = 5.0
+
+# Close code for connections reaped after being idle
+WS_CLOSE_GOING_AWAY = 1001
+
+# Number of workers executing the cases of a run concurrently
+SIMULATION_WORKERS = int(os.getenv("PSC_SIMULATION_WORKERS", "4"))
+
+# Seconds between status updates of a running simulation
+STATUS_INTERVAL = float(os.getenv("PSC_STATUS_INTERVAL", "1.0"))
+
+# Scale in seconds of the demo's simulated case durations
+DEMO_CASE_SECONDS = float(os.getenv("PSC_DEMO_CASE_SECONDS", "1.0"))
+
+# Fraction of the cold-start duration a demo case takes when warm-started
+DEMO_WARM_START_FACTOR = 0.5
+
+# Probability that a demo case fails, as a stand-in for diverging solvers
+DEMO_FAILURE_RATE = float(os.getenv("PSC_DEMO_FAILURE_RATE", "0.0"))
+
+# Angle of attack in degrees beyond which the demo's airfoil stalls
+DEMO_STALL_ANGLE = 15.0
+
+# Number of float64 values in the demo's checkpointed solution field
+DEMO_FIELD_SIZE = 4096
+
+
+class CaseFailedError(Exception):
+    """Raised when a case fails to converge."""
+
+
+class ServerDrainingError(Exception):
+    """Raised when a run or subscriber arrives while the server is shutting down."""
+
+    def __init__(self):
+        """Initialize the error."""
+        super().__init__("Server is shutting down")
+
+
+def demo_case_duration(case: dict, warm_start: dict | None = None) -> float:
+    """Get a simulated case duration; faster flows and k-omega take longer, as in real CFD."""
+    speed = float(case.get("speed", 10.0))
+    angle = abs(float(case.get("angle_of_attack", 0.0)))
+    model = 3.0 if case.get("turbulence_model") == "k-omega" else 1.0
+    warm = DEMO_WARM_START_FACTOR if warm_start is not None else 1.0
+    jitter = random.uniform(0.9, 1.1)
+    return DEMO_CASE_SECONDS * (0.5 + speed / 20) * (1 + angle / 45) * model * warm * jitter
+
+
+def demo_metrics(case: dict) -> dict:
+    """Get stand-in output metrics of a case: thin-airfoil lift that stalls past 15 degrees."""
+    speed = float(case.get("speed", 10.0))
+    angle = float(case.get("angle_of_attack", 0.0))
+    lift = 2 * math.pi * math.sin(math.radians(angle))
+    if abs(angle) > DEMO_STALL_ANGLE:
+        # Lift collapses beyond the stall angle
+        lift *= math.exp(-(abs(angle) - DEMO_STALL_ANGLE) / 3)
+    # Slightly less lift at low Reynolds numbers
+    lift *= 1 - 0.5 / (1 + speed)
+    drag = 0.01 + 0.02 * lift**2 + (0.05 if abs(angle) > DEMO_STALL_ANGLE else 0.0)
+    return {"lift_coefficient": lift, "drag_coefficient": drag}
+
+
+def demo_solution(case: dict) -> array.array:
+    """Get a stand-in converged field for a case."""
+    speed = float(case.get("speed", 10.0))
+    angle = float(case.get("angle_of_attack", 0.0))
+    return array.array("d", [speed, angle]) * (DEMO_FIELD_SIZE // 2)
 
 
 class SimulationManager:
     """Manages simulation tasks and WebSocket connections."""
 
-    def __init__(self):
-        """Initialize simulation manager with empty connection and task tracking."""
-        self._active_connections: dict[UUID, set] = {}
+    def __init__(
+        self,
+        connections: ConnectionRegistry | None = None,
+        repository: Repository | None = None,
+    ):
+        """Initialize simulation manager with empty connection and task tracking.
+
+        Without a `repository`, the process-wide one (see `psc.storage`) is used.
+        """
+        self.connections = connections if connections is not None else ConnectionRegistry()
+        self._repository = repository
         self._running_tasks: dict[UUID, asyncio.Task] = {}
+        # (Content hash, ordering) -> config ID of the run currently simulating that sweep
+        self._running_hashes: dict[tuple[str, CaseOrdering], UUID] = {}
+        # Case-level progress of the latest run of each configuration
+        self._progress: dict[UUID, RunProgress] = {}
+        # Recent progress events per configuration, for snapshots and resumption
+        self._history = HistoryStore()
+        self._heartbeat_task: asyncio.Task | None = None
+        # Converged case states for seeding neighbouring cases, when enabled; existing
+        # checkpoints are indexed by `start` rather than at import
+        self.checkpoints = (
+            CheckpointStore(CHECKPOINT_DIR, load=False) if CHECKPOINTS_ENABLED else None
+        )
+        # Set once shutdown begins; no new runs or subscribers are accepted
+        self.draining = False
+
+    @property
+    def repository(self) -> Repository:
+        """Get the repository that statuses and case runs are persisted to."""
+        return self._repository if self._repository is not None else get_repository()
+
+    async def start(self) -> None:
+        """Prepare the manager before serving, indexing existing checkpoints off the loop."""
+        if self.checkpoints is not None:
+            await asyncio.to_thread(self.checkpoints.load)
+
+    async def shutdown(self, timeout: float) -> None:
+        """Drain the manager before the process exits, within `timeout` seconds.
+
+        New runs and subscribers are refused. Running simulations are cancelled: their
+        in-flight cases are checkpointed, and their finished case results and a final
+        STOPPED status are persisted. Subscribers are then disconnected.
+        """
+        self.draining = True
+        deadline = time.monotonic() + timeout
+        tasks = [task for task in self._running_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        closes = []
+        for shard in range(self.connections.shard_count):
+            for connection in self.connections.shard(shard):
+                self.connections.remove(connection.websocket)
+                closes.append(connection.websocket.close(code=WS_CLOSE_GOING_AWAY))
+        remaining = max(0.0, deadline - time.monotonic())
+        await asyncio.gather(
+            *(asyncio.wait_for(close, remaining) for close in closes), return_exceptions=True
+        )
 
-    def add_connection(self, config_id: UUID, websocket) -> None:
-        """Add a WebSocket connection for a configuration."""
-        if config_id not in self._active_connections:
-            self._active_connections[config_id] = set()
-        self._active_connections[config_id].add(websocket)
+    def add_connection(
+        self, config_id: UUID, websocket, binary: bool = False, heartbeat: bool = True
+    ) -> None:
+        """Add a WebSocket connection for a configuration.
+
+        Binary connections receive compact progress frames instead of JSON status rows.
+        Connections with `heartbeat` receive heartbeats and are closed when idle. Raises
+        `ConnectionLimitError` if the connection limits are reached.
+        """
+        self.connections.add(config_id, websocket, binary=binary, heartbeat=heartbeat)
 
     def remove_connection(self, config_id: UUID, websocket) -> None:
         """Remove a WebSocket connection for a configuration."""
-        if config_id in self._active_connections:
-            self._active_connections[config_id].discard(websocket)
-            if not self._active_connections[config_id]:
-                del self._active_connections[config_id]
+        self.connections.remove(websocket)
+
+    def touch_connection(self, websocket) -> None:
+        """Record that a message was received from a WebSocket connection."""
+        self.connections.touch(websocket)
+
+    def connection_count(self) -> int:
+        """Get the total number of active WebSocket connections."""
+        return len(self.connections)
+
+    def running_count(self) -> int:
+        """Get the number of simulation tasks that are still running."""
+        return sum(1 for task in self._running_tasks.values() if not task.done())
 
     def has_listeners(self, config_id: UUID) -> bool:
         """Check if there are active listeners for a configuration."""
-        return (
-            config_id in self._active_connections and len(self._active_connections[config_id]) > 0
+        return self.connections.count(config_id) > 0
+
+    def _ensure_heartbeats(self) -> None:
+        """Start the heartbeat loop if it is not running."""
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def _heartbeat_loop(self) -> None:
+        """Send heartbeats and close idle connections, one registry shard per tick.
+
+        Every shard is visited once per heartbeat interval. The loop exits when no
+        connections remain and is restarted by the next subscriber.
+        """
+        shard = 0
+        tick = WS_HEARTBEAT_INTERVAL / self.connections.shard_count
+        while len(self.connections):
+            await asyncio.sleep(tick)
+            await self._heartbeat_shard(shard)
+            shard = (shard + 1) % self.connections.shard_count
+
+    async def _heartbeat_shard(self, shard: int) -> None:
+        """Heartbeat the live connections of a shard and close the idle ones."""
+        now = time.monotonic()
+        sends = []
+        for connection in self.connections.shard(shard):
+            if not connection.heartbeat:
+                continue
+            websocket = connection.websocket
+            if now - connection.last_seen > WS_IDLE_TIMEOUT:
+                self.connections.remove(websocket)
+                sends.append(websocket.close(code=WS_CLOSE_GOING_AWAY))
+                if METRICS_ENABLED:
+                    instrumentation.ws_idle_reaped.inc()
+            elif connection.encoder is not None:
+                sends.append(websocket.send_bytes(HEARTBEAT_FRAME))
+            else:
+                sends.append(websocket.send_text(HEARTBEAT_MESSAGE))
+
+        # A stalled socket must not hold up the rest of the shard
+        results = await asyncio.gather(
+            *(asyncio.wait_for(send, WS_SEND_TIMEOUT) for send in sends), return_exceptions=True
+        )
+        if METRICS_ENABLED:
+            instrumentation.ws_heartbeats_sent.inc(
+                sum(1 for result in results if not isinstance(result, BaseException))
+            )
+
+    async def subscribe(
+        self,
+        config_id: UUID,
+        websocket,
+        binary: bool = False,
+        last_seq: int | None = None,
+        heartbeat: bool = True,
+    ) -> None:
+        """Catch a new subscriber up, then register it for broadcasts.
+
+        Without `last_seq` the subscriber immediately receives a snapshot: the latest status
+        row (or a full binary snapshot frame). With `last_seq` it receives only the events it
+        missed, falling back to a snapshot when they are no longer buffered or `last_seq`
+        belongs to an earlier history (after an eviction or a restart). Raises
+        `ConnectionLimitError` before sending anything if the connection limits are reached,
+        or `ServerDrainingError` once shutdown has begun.
+        """
+        if self.draining:
+            raise ServerDrainingError()
+        try:
+            self.connections.check(config_id)
+        except ConnectionLimitError:
+            if METRICS_ENABLED:
+                instrumentation.ws_rejected_connections.inc()
+            raise
+
+        # Nothing buffered in memory (e.g. after a restart): start from the latest row
+        if not binary and self._history.get(config_id) is None:
+            status = await self._latest_status(config_id)
+            if status is not None:
+                await websocket.send_text(json.dumps(status))
+
+        cursor = last_seq
+        # Events may be broadcast while catching up, so repeat until nothing new remains
+        while True:
+            history = self._history.get(config_id)
+            latest = history.latest() if history else None
+            if latest is None or cursor == latest.seq:
+                break
+
+            missed = history.since(cursor) if cursor is not None else None
+            run = self._progress.get(config_id)
+            if binary:
+                if missed and run is not None and all(event.run is run for event in missed):
+                    for event in missed:
+                        await websocket.send_bytes(event.delta)
+                elif run is not None:
+                    await websocket.send_bytes(run.snapshot_frame())
+            elif missed:
+                for event in missed:
+                    await websocket.send_text(json.dumps(event.status))
+            else:
+                await websocket.send_text(json.dumps(latest.status))
+            cursor = latest.seq
+
+        # No awaits between the final catch-up check and registration, so nothing is missed
+        connection = self.connections.add(config_id, websocket, binary=binary, heartbeat=heartbeat)
+        if connection.encoder is not None and cursor is not None:
+            connection.encoder.resume(self._progress.get(config_id), cursor)
+        if heartbeat:
+            self._ensure_heartbeats()
+
+    async def _latest_status(self, config_id: UUID) -> dict | None:
+        """Get the latest persisted status row of a configuration."""
+        status = await self.repository.latest_status(config_id)
+        return status.to_dict() if status is not None else None
+
+    async def broadcast_status(
+        self, config_id: UUID, status_data: dict, completed_cases: Iterable[int] = ()
+    ) -> None:
+        """Broadcast status update to all listeners of a configuration.
+
+        The update is assigned the configuration's next sequence number (added to the
+        status as `seq`) and kept in its history. `completed_cases` are the case indices
+        completed since the previous update; they are only sent to binary subscribers.
+        """
+        history = self._history.get_or_create(config_id)
+        seq = history.next_seq()
+        status_data = {**status_data, "seq": seq}
+
+        run = self._progress.get(config_id)
+        if run is not None:
+            run.update(seq, status_data["progress"], status_data["state"], completed_cases)
+        history.append(
+            ProgressEvent(
+                seq=seq,
+                status=status_data,
+                run=run,
+                delta=run.delta_frame() if run is not None else b"",
+            )
         )
 
-    async def broadcast_status(self, config_id: UUID, status_data: dict) -> None:
-        """Broadcast status update to all listeners of a configuration."""
-        if config_id not in self._active_connections:
+        listeners = self.connections.listeners(config_id)
+        if not listeners:
             return
 
-        message = json.dumps(status_data)
+        start = time.perf_counter() if METRICS_ENABLED else 0.0
+        message = None
         disconnected = set()
 
-        for websocket in self._active_connections[config_id]:
+        for connection in listeners:
+            websocket = connection.websocket
             try:
-                await websocket.send_text(message)
+                if connection.encoder is not None:
+                    if run is not None:
+                        await websocket.send_bytes(connection.encoder.encode(run))
+                else:
+                    if message is None:
+                        message = json.dumps(status_data)
+                    await websocket.send_text(message)
             except Exception:
                 disconnected.add(websocket)
 
+        if METRICS_ENABLED:
+            sent = len(listeners) - len(disconnected)
+            instrumentation.ws_broadcast_duration.observe(time.perf_counter() - start)
+            instrumentation.ws_messages_sent.inc(sent)
+            instrumentation.ws_send_failures.inc(len(disconnected))
+
         # Remove disconnected websockets
         for ws in disconnected:
             self.remove_connection(config_id, ws)
 
-    async def run_simulation(self, config_id: UUID, parameters: list) -> None:
-        """Run a demo simulation that sends status updates every second from 0 to 100."""
-        total_steps = 100
-
-        for step in range(total_steps + 1):
-            # Create new database entry for each state update
-            async with async_session_factory() as session:
-                simulation = SimulationStatus(
-                    config_id=config_id,
-                    progress=step,
-                    state="RUNNING" if step < total_steps else "COMPLETED",
+    async def _load_runtime_model(self) -> RuntimeModel:
+        """Fit the runtime model to the most recent completed case durations."""
+        samples = await self.repository.case_durations(ESTIMATOR_HISTORY)
+
+        # Fitting is CPU-bound, so keep it off the event loop
+        return await asyncio.to_thread(RuntimeModel.fit, samples)
+
+    async def execute_case(
+        self,
+        config_id: UUID,
+        case_index: int,
+        case: dict,
+        warm_start: dict | None = None,
+        seed: Checkpoint | None = None,
+    ) -> dict:
+        """Execute a single case of a sweep and get its output metrics.
+
+        The case warm-starts from a compatible previous case, or is seeded from the
+        checkpoint of the nearest computed case. Its converged state is checkpointed when
+        checkpointing is enabled, as is the partial state of a case interrupted by shutdown.
+        Raises `CaseFailedError` if the case fails to converge.
+        """
+        if warm_start is None and seed is not None:
+            # Seed the solver with the nearest case's converged field
+            initial = seed.field("solution")
+            warm_start = seed.case if len(initial) else None
+        try:
+            await asyncio.sleep(demo_case_duration(case, warm_start))
+        except asyncio.CancelledError:
+            if self.draining and self.checkpoints is not None:
+                # Keep the partially converged state, so the case and its neighbours can
+                # restart from it after the server comes back
+                await asyncio.to_thread(
+                    self.checkpoints.put,
+                    config_id,
+                    case_index,
+                    case,
+                    {"solution": demo_solution(case)},
                 )
-                session.add(simulation)
-                await session.commit()
-                await session.refresh(simulation)
+            raise
+        if random.random() < DEMO_FAILURE_RATE:
+            raise CaseFailedError(f"Case {case_index} diverged")
+
+        if self.checkpoints is not None:
+            await asyncio.to_thread(
+                self.checkpoints.put,
+                config_id,
+                case_index,
+                case,
+                {"solution": demo_solution(case)},
+            )
+        return demo_metrics(case)
+
+    async def _find_seed(
+        self, config_id: UUID, parameters: list, case: dict, expensive: set[str]
+    ) -> Checkpoint | None:
+        """Find the checkpoint of the nearest computed case sharing the expensive values.
+
+        The lookup and the mapping of the checkpoint's field run on a worker thread, so a
+        large store never blocks the event loop.
+        """
+        if self.checkpoints is None:
+            return None
+        checkpoints = self.checkpoints
+
+        def find() -> Checkpoint | None:
+            nearest = checkpoints.nearest(config_id, parameters, case, fixed=expensive)
+            if nearest is None:
+                return None
+            try:
+                nearest[0].field("solution")
+            except OSError:
+                # Evicted since it was found
+                return None
+            return nearest[0]
+
+        return await asyncio.to_thread(find)
+
+    @profiling.register_entrypoint
+    async def _run_batch(
+        self,
+        run: RunState,
+        worker: int,
+        batch: list[int],
+        expensive: set[str],
+        estimate: RunEstimate,
+        finished: list[CaseResult],
+    ) -> None:
+        """Execute a worker's batch of cases in order, appending their results to `finished`.
 
-                # Get the complete simulation object for broadcasting
-                simulation_data = simulation.to_dict()
+        A case warm-starts from the worker's previous case when they share the values of all
+        expensive-to-switch parameters; otherwise it is seeded from the nearest checkpoint.
+        Failed cases are recorded and the batch continues. Each result is checked against
+        the run's stop policy, raising `RunStopped` to end the run.
+        """
+        previous = None
+        for index in batch:
+            case = run.case(index)
+            warm_start = (
+                previous
+                if previous is not None and all(previous[key] == case[key] for key in expensive)
+                else None
+            )
+            seed = (
+                await self._find_seed(run.config_id, run.parameters, case, expensive)
+                if warm_start is None
+                else None
+            )
+            estimate.start(worker, index)
+            start = time.perf_counter()
+            try:
+                metrics = await self.execute_case(run.config_id, index, case, warm_start, seed)
+            except Exception:
+                result = CaseResult(index, time.perf_counter() - start, state="FAILED")
+                # Do not warm-start from a failed case
+                previous = None
+            else:
+                result = CaseResult(index, time.perf_counter() - start, metrics=metrics)
+                previous = case
+            estimate.finish(worker, index, result.duration)
+            finished.append(result)
+            if run.monitor is not None:
+                run.monitor.observe(result)
+
+    async def _report_status(
+        self, run: RunState, eta: float | None, state: str, reason: str | None = None
+    ) -> None:
+        """Persist a status update with the results of newly finished cases, then broadcast."""
+        results, run.unreported = run.unreported, []
+        total_cases = run.planned_cases
+        status = StatusRecord(
+            config_id=run.config_id,
+            parameters_hash=run.parameters_hash,
+            progress=run.completed * 100 // total_cases if total_cases else 100,
+            completed_cases=run.completed,
+            total_cases=total_cases,
+            eta_seconds=eta,
+            state=state,
+            reason=reason,
+        )
+        case_runs = [
+            CaseRunRecord(
+                config_id=run.config_id,
+                case_index=result.index,
+                parameters=run.case(result.index),
+                duration=result.duration,
+                state=result.state,
+                metrics=result.metrics,
+            )
+            for result in results
+        ]
+        commit_start = time.perf_counter() if METRICS_ENABLED else 0.0
+        status = await self.repository.add_status(status, case_runs)
+        if METRICS_ENABLED:
+            instrumentation.simulation_status_commit_duration.observe(
+                time.perf_counter() - commit_start
+            )
+        simulation_data = status.to_dict()
+
+        # Broadcast the complete simulation object with the cases completed since the last one
+        await self.broadcast_status(
+            run.config_id, simulation_data, [result.index for result in results]
+        )
 
-            # Broadcast the complete simulation object
-            await self.broadcast_status(config_id, simulation_data)
+    async def _run_pass(
+        self,
+        run: RunState,
+        indices: Sequence[int],
+        model: RuntimeModel,
+        expensive: set[str],
+        contiguous: bool = False,
+    ) -> None:
+        """Run a pass over some of a run's cases on parallel workers.
 
-            if step < total_steps:
-                await asyncio.sleep(1)
+        Cases are packed into one batch per worker by estimated runtime, longest first, so
+        the workers finish together. With `contiguous`, the given order is instead split
+        into contiguous batches of similar estimated runtime, so each worker can warm-start
+        from its previous case. A status update with the pass's ETA is persisted and
+        broadcast every `STATUS_INTERVAL` seconds until all batches are done. Raises the
+        first exception of any worker, or `RunStopped` once a time budget is spent.
+        """
+        costs = {index: model.predict(run.case(index)) for index in indices}
+        if contiguous:
+            batches = partition_contiguous(indices, costs, SIMULATION_WORKERS)
+        else:
+            batches = pack_batches(costs, SIMULATION_WORKERS)
+        estimate = RunEstimate(batches, costs)
+        await self._report_status(run, estimate.eta(), "RUNNING")
 
-        # Clean up task reference
-        if config_id in self._running_tasks:
-            del self._running_tasks[config_id]
+        finished: list[CaseResult] = []
+        workers = [
+            asyncio.create_task(self._run_batch(run, worker, batch, expensive, estimate, finished))
+            for worker, batch in enumerate(batches)
+        ]
+        all_done = asyncio.gather(*workers)
+        try:
+            while not all_done.done():
+                await asyncio.wait({all_done}, timeout=STATUS_INTERVAL)
+                newly_finished = finished[:]
+                del finished[:]
+                run.record(newly_finished)
+                if run.monitor is not None:
+                    run.monitor.check_budget()
+                if not all_done.done():
+                    await self._report_status(run, estimate.eta(), "RUNNING")
+            # Results of the last tick are reported by the next pass or the final status
+            all_done.result()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            # Keep results that finished after the last tick, e.g. when cancelled
+            run.record(finished)
 
-    def start_simulation(self, config_id: UUID, parameters: list) -> None:
-        """Start a simulation as a background task."""
-        if config_id in self._running_tasks:
+    @profiling.register_entrypoint
+    async def run_simulation(
+        self,
+        config_id: UUID,
+        parameters: list,
+        parameters_hash: str | None = None,
+        ordering: CaseOrdering = CaseOrdering.CARTESIAN,
+        refinement: Refinement | None = None,
+        stop_policy: StopPolicy | None = None,
+    ) -> None:
+        """Run the cases of a sweep on parallel workers, reporting status periodically.
+
+        In cartesian order, cases are packed into batches by estimated runtime; other
+        orderings split the ordered cases into contiguous batches (see `_run_pass`).
+
+        With `refinement`, the configured grid is a coarse pass: refinement passes then add
+        cases where the output metric varies most (see `AdaptiveRefiner`) until the case
+        budget is spent or the estimated error is within the tolerance.
+
+        With `stop_policy`, case results are checked as they arrive and the run is cancelled
+        with a FAILED or STOPPED state and the reason once a condition is met.
+        """
+        planned = case_count(parameters) + (refinement.budget if refinement is not None else 0)
+        run = RunState(config_id, parameters, parameters_hash, planned)
+        if refinement is not None:
+            run.refiner = AdaptiveRefiner(
+                parameters, refinement.metric, refinement.tolerance, refinement.max_depth
+            )
+        if stop_policy is not None:
+            run.monitor = StopMonitor(stop_policy)
+        self._progress[config_id] = RunProgress(planned)
+
+        try:
+            try:
+                model = await self._load_runtime_model()
+                expensive = expensive_keys(parameters)
+                if ordering is CaseOrdering.CARTESIAN:
+                    await self._run_pass(run, range(run.grid_cases), model, expensive)
+                else:
+                    order = list(iter_case_indices(parameters, ordering))
+                    await self._run_pass(run, order, model, expensive, contiguous=True)
+
+                while refinement is not None and run.case_count < planned:
+                    remaining = planned - run.case_count
+                    batch_size = refinement.batch_size or SIMULATION_WORKERS * 2
+                    new_cases = run.refiner.refine(min(batch_size, remaining), budget=remaining)
+                    if not new_cases:
+                        break
+                    indices = run.add_cases(new_cases)
+                    await self._run_pass(run, indices, model, expensive)
+            except asyncio.CancelledError:
+                reason = "Server shutting down" if self.draining else "Run cancelled"
+                await self._report_status(run, None, "STOPPED", reason)
+                raise
+            except RunStopped as e:
+                state, eta, reason = e.state, None, e.reason
+            except Exception as e:
+                state, eta, reason = "FAILED", None, str(e)[:200] or type(e).__name__
+            else:
+                # Measure progress against the cases actually run
+                run.planned_cases = run.case_count
+                state, eta, reason = "COMPLETED", 0.0, None
+            await self._report_status(run, eta, state, reason)
+        finally:
+            # Clean up task reference
+            if config_id in self._running_tasks:
+                del self._running_tasks[config_id]
+            if (
+                parameters_hash is not None
+                and self._running_hashes.get((parameters_hash, ordering)) == config_id
+            ):
+                del self._running_hashes[parameters_hash, ordering]
+
+    async def _run_profiled(
+        self,
+        config_id: UUID,
+        parameters: list,
+        parameters_hash: str | None = None,
+        ordering: CaseOrdering = CaseOrdering.CARTESIAN,
+        refinement: Refinement | None = None,
+        stop_policy: StopPolicy | None = None,
+    ) -> None:
+        """Run a simulation under the sampling run profiler."""
+        with profiling.RunProfiler(config_id):
+            await self.run_simulation(
+                config_id, parameters, parameters_hash, ordering, refinement, stop_policy
+            )
+
+    def start_simulation(
+        self,
+        config_id: UUID,
+        parameters: list,
+        parameters_hash: str | None = None,
+        ordering: CaseOrdering = CaseOrdering.CARTESIAN,
+        refinement: Refinement | None = None,
+        stop_policy: StopPolicy | None = None,
+        profile: bool = False,
+    ) -> None:
+        """Start a simulation as a background task.
+
+        Runs are deduplicated by config ID and, when given, by the content hash of the
+        parameter set and the ordering, so an identical sweep is never simulated twice
+        concurrently. Raises
+        `ServerDrainingError` once shutdown has begun.
+        """
+        if self.draining:
+            raise ServerDrainingError()
+        if self.is_running(config_id, parameters_hash, ordering):
             # Simulation already running
             return
 
-        task = asyncio.create_task(self.run_simulation(config_id, parameters))
+        run = self._run_profiled if profile else self.run_simulation
+        task = asyncio.create_task(
+            run(config_id, parameters, parameters_hash, ordering, refinement, stop_policy)
+        )
         self._running_tasks[config_id] = task
+        if parameters_hash is not None:
+            self._running_hashes[parameters_hash, ordering] = config_id
 
-    def is_running(self, config_id: UUID) -> bool:
-        """Check if simulation is currently running for a configuration."""
-        return config_id in self._running_tasks and not self._running_tasks[config_id].done()
+    def is_running(
+        self,
+        config_id: UUID,
+        parameters_hash: str | None = None,
+        ordering: CaseOrdering = CaseOrdering.CARTESIAN,
+    ) -> bool:
+        """Check if simulation is currently running for a configuration or identical sweep.
+
+        Sweeps with the same parameter set in another ordering are different sweeps: they
+        are stored as separate configurations and run in their own order.
+        """
+        config_ids = [config_id]
+        running_id = (
+            self._running_hashes.get((parameters_hash, ordering))
+            if parameters_hash is not None
+            else None
+        )
+        if running_id is not None:
+            config_ids.append(running_id)
+
+        return any(
+            running_id in self._running_tasks and not self._running_tasks[running_id].done()
+            for running_id in config_ids
+        )
 
 
 # Global simulation manager instance
 simulation_manager = SimulationManager()
+
+# Gauges are computed on scrape, so the connection and task hot paths pay nothing for them
+instrumentation.ws_active_connections.set_function(simulation_manager.connection_count)
+instrumentation.simulation_running_tasks.set_function(simulation_manager.running_count)
@@ -0,0 +1,181 @@
+"""Per-case runtime estimates, batch packing and run ETAs."""
+
+import heapq
+import math
+import os
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+
+# Number of most recent case durations used to fit the runtime model
+ESTIMATOR_HISTORY = int(os.getenv("PSC_ESTIMATOR_HISTORY", "10000"))
+
+# Estimated duration in seconds of a case when no history is available
+DEFAULT_CASE_SECONDS = float(os.getenv("PSC_DEFAULT_CASE_SECONDS", "1.0"))
+
+
+class RuntimeModel:
+    """Multiplicative model of case durations as a function of parameter values.
+
+    The log-duration of a case is modelled as an intercept plus one additive effect per
+    parameter value, fitted to historical durations by backfitting. Effects of numeric values
+    that were never observed are interpolated linearly between the nearest observed values;
+    unseen enum values have no effect.
+    """
+
+    def __init__(self, default_seconds: float = DEFAULT_CASE_SECONDS):
+        """Initialize a model that predicts `default_seconds` for every case."""
+        self.intercept = math.log(default_seconds)
+        self.effects: dict[str, dict] = {}
+        self.samples = 0
+
+    @classmethod
+    def fit(
+        cls,
+        samples: Iterable[tuple[dict, float]],
+        iterations: int = 10,
+        default_seconds: float = DEFAULT_CASE_SECONDS,
+    ) -> "RuntimeModel":
+        """Fit a model to `(case parameters, duration in seconds)` samples."""
+        model = cls(default_seconds)
+        data = [(case, math.log(duration)) for case, duration in samples if duration > 0]
+        if not data:
+            return model
+
+        model.samples = len(data)
+        model.intercept = sum(log_duration for _, log_duration in data) / len(data)
+        keys = sorted({key for case, _ in data for key in case})
+        model.effects = {key: {} for key in keys}
+
+        for _ in range(iterations):
+            for key in keys:
+                # Average residual of each value of this parameter, holding the others fixed
+                totals: dict = defaultdict(float)
+                counts: dict = defaultdict(int)
+                for case, log_duration in data:
+                    if key not in case:
+                        continue
+                    others = sum(
+                        model.effects[other].get(value, 0.0)
+                        for other, value in case.items()
+                        if other != key and other in model.effects
+                    )
+                    totals[case[key]] += log_duration - model.intercept - others
+                    counts[case[key]] += 1
+                model.effects[key] = {value: totals[value] / counts[value] for value in totals}
+
+        return model
+
+    def _effect(self, key: str, value) -> float:
+        effects = self.effects.get(key)
+        if not effects:
+            return 0.0
+        if value in effects:
+            return effects[value]
+        if isinstance(value, bool) or not isinstance(value, int | float):
+            return 0.0
+
+        # Interpolate between the nearest observed numeric values, clamping at the ends
+        numeric = sorted(
+            (observed, effect)
+            for observed, effect in effects.items()
+            if isinstance(observed, int | float) and not isinstance(observed, bool)
+        )
+        if not numeric:
+            return 0.0
+        if value <= numeric[0][0]:
+            return numeric[0][1]
+        if value >= numeric[-1][0]:
+            return numeric[-1][1]
+        for (low, low_effect), (high, high_effect) in zip(numeric, numeric[1:], strict=False):
+            if low <= value <= high:
+                return low_effect + (high_effect - low_effect) * (value - low) / (high - low)
+        return 0.0
+
+    def predict(self, case: dict) -> float:
+        """Predict the duration of a case in seconds."""
+        return math.exp(
+            self.intercept + sum(self._effect(key, value) for key, value in case.items())
+        )
+
+
+def pack_batches(costs: Mapping[int, float], workers: int) -> list[list[int]]:
+    """Pack case indices into `workers` batches with the longest-processing-time rule.
+
+    `costs` maps case indices to their estimated costs. Cases are assigned in decreasing
+    order of cost, each to the batch with the least total cost so far, so batches finish at
+    nearly the same time. Each batch lists its cases in the order they were assigned (most
+    expensive first).
+    """
+    batches: list[list[int]] = [[] for _ in range(max(1, min(workers, len(costs))))]
+    loads = [(0.0, worker) for worker in range(len(batches))]
+    for index in sorted(costs, key=costs.__getitem__, reverse=True):
+        load, worker = heapq.heappop(loads)
+        batches[worker].append(index)
+        heapq.heappush(loads, (load + costs[index], worker))
+    return batches
+
+
+def partition_contiguous(
+    order: Sequence[int], costs: Mapping[int, float], workers: int
+) -> list[list[int]]:
+    """Split an ordering of case indices into at most `workers` contiguous batches.
+
+    Each batch ends once the running total reaches its share of the total cost, so batches
+    have similar costs while consecutive cases stay on the same worker.
+    """
+    total = sum(costs[index] for index in order)
+    workers = max(1, min(workers, len(order)))
+    batches: list[list[int]] = [[]]
+    cumulative = 0.0
+    for index in order:
+        if batches[-1] and len(batches) < workers and cumulative >= total * len(batches) / workers:
+            batches.append([])
+        batches[-1].append(index)
+        cumulative += costs[index]
+    return batches
+
+
+class RunEstimate:
+    """Estimated time remaining of a run executing packed batches in parallel.
+
+    Estimates are corrected by the ratio of actual to estimated durations of the cases
+    completed so far in the run.
+    """
+
+    def __init__(self, batches: list[list[int]], costs: Mapping[int, float]):
+        """Initialize with the packed batches and the estimated cost of every case."""
+        self.costs = costs
+        self._pending = [sum(costs[index] for index in batch) for batch in batches]
+        self._current: list[tuple[int, float] | None] = [None] * len(batches)
+        self._estimated = 0.0
+        self._actual = 0.0
+
+    def start(self, worker: int, index: int) -> None:
+        """Record that a worker started a case."""
+        self._pending[worker] -= self.costs[index]
+        self._current[worker] = (index, time.monotonic())
+
+    def finish(self, worker: int, index: int, duration: float) -> None:
+        """Record that a worker finished a case in `duration` seconds."""
+        self._current[worker] = None
+        self._estimated += self.costs[index]
+        self._actual += duration
+
+    @property
+    def correction(self) -> float:
+        """Ratio of actual to estimated durations of the cases completed in this run."""
+        return self._actual / self._estimated if self._estimated > 0 else 1.0
+
+    def eta(self) -> float:
+        """Estimate the seconds until the slowest worker finishes its batch."""
+        now = time.monotonic()
+        correction = self.correction
+        remaining = 0.0
+        for pending, current in zip(self._pending, self._current, strict=True):
+            worker_remaining = pending * correction
+            if current is not None:
+                index, started = current
+                worker_remaining += max(0.0, self.costs[index] * correction - (now - started))
+            remaining = max(remaining, worker_remaining)
+        return remaining
@@ -0,0 +1,89 @@
+"""In-memory ring buffers of recent progress events for snapshots and resumption."""
+
+import os
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from uuid import UUID
+
+from .protocol import RunProgress
+
+# Progress events kept per configuration for resuming subscribers
+HISTORY_SIZE = int(os.getenv("PSC_PROGRESS_HISTORY_SIZE", "128"))
+
+# Configurations whose histories are kept; the least recently updated are evicted first
+HISTORY_CONFIGS = int(os.getenv("PSC_PROGRESS_HISTORY_CONFIGS", "1024"))
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """A progress update as broadcast to subscribers."""
+
+    seq: int
+    status: dict
+    run: RunProgress | None = None
+    delta: bytes = b""
+
+
+class ProgressHistory:
+    """Ring buffer of a configuration's recent progress events.
+
+    Sequence numbers increase monotonically across runs of the configuration for the
+    lifetime of the history. They start again from 1 when the history is evicted or the
+    process restarts, so a client may resume from a sequence number beyond the latest one.
+    """
+
+    def __init__(self, maxlen: int = HISTORY_SIZE):
+        """Initialize an empty history."""
+        self.seq = 0
+        self.events: deque[ProgressEvent] = deque(maxlen=maxlen)
+
+    def next_seq(self) -> int:
+        """Allocate the next sequence number."""
+        self.seq += 1
+        return self.seq
+
+    def append(self, event: ProgressEvent) -> None:
+        """Record an event, evicting the oldest one when the buffer is full."""
+        self.events.append(event)
+
+    def latest(self) -> ProgressEvent | None:
+        """Get the most recent event."""
+        return self.events[-1] if self.events else None
+
+    def since(self, last_seq: int) -> list[ProgressEvent] | None:
+        """Get the events after `last_seq`, or None if some of them are no longer buffered.
+
+        A `last_seq` beyond the latest sequence number belongs to an earlier history, so
+        the caller has to start over from a snapshot as well.
+        """
+        if last_seq > self.seq:
+            return None
+        if last_seq == self.seq:
+            return []
+        if not self.events or self.events[0].seq > last_seq + 1:
+            return None
+        return [event for event in self.events if event.seq > last_seq]
+
+
+class HistoryStore:
+    """Progress histories of the most recently updated configurations."""
+
+    def __init__(self, max_configs: int = HISTORY_CONFIGS):
+        """Initialize an empty store."""
+        self.max_configs = max_configs
+        self._histories: OrderedDict[UUID, ProgressHistory] = OrderedDict()
+
+    def get(self, config_id: UUID) -> ProgressHistory | None:
+        """Get a configuration's history if one is kept."""
+        return self._histories.get(config_id)
+
+    def get_or_create(self, config_id: UUID) -> ProgressHistory:
+        """Get a configuration's history, creating it and evicting old ones as needed."""
+        history = self._histories.get(config_id)
+        if history is None:
+            history = self._histories[config_id] = ProgressHistory()
+            while len(self._histories) > self.max_configs:
+                self._histories.popitem(last=False)
+        else:
+            self._histories.move_to_end(config_id)
+        return history
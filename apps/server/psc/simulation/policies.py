@@ -0,0 +1,100 @@
+"""Stop policies that end runs early as their case results arrive."""
+
+import time
+from dataclasses import dataclass
+from typing import Literal
+
+from .runs import CaseResult
+
+
+@dataclass(frozen=True)
+class StopPolicy:
+    """Conditions under which a run is stopped before all of its cases are executed.
+
+    Unset conditions are never checked. The failure rate is checked once `min_cases` cases
+    have finished, so a single early failure does not stop a run. CPU seconds are the case
+    execution seconds summed over all workers.
+    """
+
+    max_failure_rate: float | None = None
+    min_cases: int = 10
+    max_consecutive_failures: int | None = None
+    target_metric: str | None = None
+    target_value: float | None = None
+    target_mode: Literal["above", "below"] = "above"
+    max_wall_seconds: float | None = None
+    max_cpu_seconds: float | None = None
+
+
+class RunStopped(Exception):
+    """Raised to end a run early with a final state and reason."""
+
+    def __init__(self, state: str, reason: str):
+        """Initialize with the final state (FAILED or STOPPED) and a human-readable reason."""
+        self.state = state
+        self.reason = reason
+        super().__init__(reason)
+
+
+class StopMonitor:
+    """Evaluates a stop policy incrementally over a run's case results."""
+
+    def __init__(self, policy: StopPolicy):
+        """Initialize the monitor at the start of a run."""
+        self.policy = policy
+        self.started = time.monotonic()
+        self.finished = 0
+        self.failed = 0
+        self.consecutive_failures = 0
+        self.cpu_seconds = 0.0
+
+    def observe(self, result: CaseResult) -> None:
+        """Account for a finished case. Raises `RunStopped` if the run should end."""
+        policy = self.policy
+        self.finished += 1
+        self.cpu_seconds += result.duration
+        if result.state == "FAILED":
+            self.failed += 1
+            self.consecutive_failures += 1
+        else:
+            self.consecutive_failures = 0
+
+        if (
+            policy.max_consecutive_failures is not None
+            and self.consecutive_failures >= policy.max_consecutive_failures
+        ):
+            raise RunStopped("FAILED", f"{self.consecutive_failures} consecutive cases failed")
+        if (
+            policy.max_failure_rate is not None
+            and self.finished >= policy.min_cases
+            and self.failed / self.finished > policy.max_failure_rate
+        ):
+            raise RunStopped(
+                "FAILED",
+                f"{self.failed} of {self.finished} cases failed, "
+                f"over the maximum failure rate of {policy.max_failure_rate:.0%}",
+            )
+        if policy.target_metric is not None and policy.target_value is not None:
+            value = (result.metrics or {}).get(policy.target_metric)
+            if value is not None and (
+                value >= policy.target_value
+                if policy.target_mode == "above"
+                else value <= policy.target_value
+            ):
+                raise RunStopped(
+                    "STOPPED",
+                    f"{policy.target_metric} reached {value:g} at case {result.index}",
+                )
+        self.check_budget()
+
+    def check_budget(self) -> None:
+        """Check the time budgets. Raises `RunStopped` if one is spent."""
+        policy = self.policy
+        if policy.max_wall_seconds is not None:
+            elapsed = time.monotonic() - self.started
+            if elapsed >= policy.max_wall_seconds:
+                raise RunStopped(
+                    "STOPPED", f"Wall-clock budget of {policy.max_wall_seconds:g}s spent"
+                )
+        if policy.max_cpu_seconds is not None and self.cpu_seconds >= policy.max_cpu_seconds:
+            raise RunStopped("STOPPED", f"CPU budget of {policy.max_cpu_seconds:g}s spent")
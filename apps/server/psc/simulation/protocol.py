@@ -0,0 +1,291 @@
+"""Compact binary progress protocol for WebSocket subscribers.
+
+Clients opt in by offering the `psc.progress.v1` WebSocket subprotocol; everyone else keeps
+receiving JSON status rows. Binary frames are little-endian and built from unsigned LEB128
+varints (`uvarint`) and zigzag-encoded signed varints (`svarint`):
+
+    frame     := type:u8 state:u8 seq:uvarint body | HEARTBEAT
+    SNAPSHOT  := progress:uvarint total:uvarint completed:uvarint cases
+    DELTA     := d_progress:svarint d_completed:svarint cases
+    cases     := 0x00 count:uvarint (gap:uvarint length:uvarint)*   run-length ranges
+               | 0x01 offset:uvarint size:uvarint bitmap:u8*size    bitmap from offset
+
+A SNAPSHOT carries the full set of completed case indices; a DELTA carries only the cases
+completed since the previous frame. Range gaps are relative to the end of the previous
+range. Each frame uses whichever case encoding is smaller. Subscribers receive a SNAPSHOT
+first, at the start of each run, after any gap in sequence numbers and every
+`SNAPSHOT_INTERVAL` frames. Sequence numbers increase monotonically across runs of a
+configuration, so a reconnecting client can pass its last one to resume. A HEARTBEAT is
+the single byte 0x03 and carries no progress.
+"""
+
+import os
+from collections.abc import Iterable, Sequence
+
+SUBPROTOCOL = "psc.progress.v1"
+
+FRAME_SNAPSHOT = 0x01
+FRAME_DELTA = 0x02
+FRAME_HEARTBEAT = 0x03
+
+CASES_RANGES = 0x00
+CASES_BITMAP = 0x01
+
+STATE_CODES = {"QUEUED": 0, "RUNNING": 1, "COMPLETED": 2, "FAILED": 3, "STOPPED": 4}
+STATES = {code: state for state, code in STATE_CODES.items()}
+
+# Frames between periodic snapshots sent to each binary subscriber
+SNAPSHOT_INTERVAL = int(os.getenv("PSC_PROGRESS_SNAPSHOT_INTERVAL", "50"))
+
+
+def negotiate_subprotocol(offered: Sequence[str]) -> str | None:
+    """Pick the binary subprotocol if the client offered it."""
+    return SUBPROTOCOL if SUBPROTOCOL in offered else None
+
+
+def _uvarint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _svarint(value: int, out: bytearray) -> None:
+    _uvarint((value << 1) ^ (value >> 63), out)
+
+
+def _read_uvarint(data: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _read_svarint(data: bytes, pos: int) -> tuple[int, int]:
+    value, pos = _read_uvarint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def _ranges(indices: Iterable[int]) -> list[tuple[int, int]]:
+    """Collapse sorted case indices into (start, length) runs."""
+    if isinstance(indices, range) and indices.step == 1:
+        return [(indices.start, len(indices))] if len(indices) else []
+
+    runs: list[tuple[int, int]] = []
+    for index in sorted(indices):
+        if runs and index == runs[-1][0] + runs[-1][1]:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        elif not runs or index >= runs[-1][0] + runs[-1][1]:
+            runs.append((index, 1))
+    return runs
+
+
+def _encode_cases(runs: list[tuple[int, int]], out: bytearray) -> None:
+    """Append the smaller of the run-length and bitmap encodings of a case set."""
+    ranges = bytearray([CASES_RANGES])
+    _uvarint(len(runs), ranges)
+    end = 0
+    for start, length in runs:
+        _uvarint(start - end, ranges)
+        _uvarint(length, ranges)
+        end = start + length
+
+    # A bitmap costs one bit per index in the covered span; only build it if it can win
+    if runs:
+        offset, span = runs[0][0], runs[-1][0] + runs[-1][1] - runs[0][0]
+        if (span + 7) // 8 + 3 < len(ranges):
+            bitmap = bytearray((span + 7) // 8)
+            for start, length in runs:
+                for index in range(start - offset, start - offset + length):
+                    bitmap[index >> 3] |= 1 << (index & 7)
+            out.append(CASES_BITMAP)
+            _uvarint(offset, out)
+            _uvarint(len(bitmap), out)
+            out += bitmap
+            return
+
+    out += ranges
+
+
+def _decode_cases(data: bytes, pos: int) -> tuple[list[int], int]:
+    encoding = data[pos]
+    pos += 1
+    cases: list[int] = []
+    if encoding == CASES_RANGES:
+        count, pos = _read_uvarint(data, pos)
+        end = 0
+        for _ in range(count):
+            gap, pos = _read_uvarint(data, pos)
+            length, pos = _read_uvarint(data, pos)
+            start = end + gap
+            cases.extend(range(start, start + length))
+            end = start + length
+    elif encoding == CASES_BITMAP:
+        offset, pos = _read_uvarint(data, pos)
+        size, pos = _read_uvarint(data, pos)
+        for byte_index, byte in enumerate(data[pos : pos + size]):
+            for bit in range(8):
+                if byte & (1 << bit):
+                    cases.append(offset + byte_index * 8 + bit)
+        pos += size
+    else:
+        raise ValueError(f"Unknown case encoding: {encoding}")
+    return cases, pos
+
+
+class RunProgress:
+    """Progress of a run's cases, shared by all binary subscribers of a configuration.
+
+    Each `update` moves to a new sequence number and produces frames lazily: the delta frame
+    and the snapshot frame of a sequence number are each encoded at most once, however many
+    subscribers receive them. Deltas only chain within a run, so a new run starts every
+    subscriber with a snapshot.
+    """
+
+    def __init__(self, total_cases: int):
+        """Initialize progress for a run of `total_cases` cases."""
+        self.total_cases = total_cases
+        self.completed = bytearray((total_cases + 7) // 8)
+        self.completed_count = 0
+        self.progress = 0
+        self.state = "QUEUED"
+        self.seq = 0
+        self._delta: tuple[int, int, list[tuple[int, int]]] = (0, 0, [])
+        self._frames: dict[int, bytes] = {}
+
+    def update(self, seq: int, progress: int, state: str, new_cases: Iterable[int] = ()) -> None:
+        """Record progress tick `seq` and the cases completed since the previous one."""
+        runs = _ranges(new_cases)
+        added = 0
+        for start, length in runs:
+            for index in range(start, start + length):
+                mask = 1 << (index & 7)
+                if not self.completed[index >> 3] & mask:
+                    self.completed[index >> 3] |= mask
+                    added += 1
+
+        self._delta = (progress - self.progress, added, runs)
+        self.progress = progress
+        self.state = state
+        self.completed_count += added
+        self.seq = seq
+        self._frames = {}
+
+    def _header(self, frame_type: int) -> bytearray:
+        out = bytearray([frame_type, STATE_CODES.get(self.state, 0)])
+        _uvarint(self.seq, out)
+        return out
+
+    def snapshot_frame(self) -> bytes:
+        """Encode the full progress state at the current sequence number."""
+        if FRAME_SNAPSHOT not in self._frames:
+            out = self._header(FRAME_SNAPSHOT)
+            _uvarint(self.progress, out)
+            _uvarint(self.total_cases, out)
+            _uvarint(self.completed_count, out)
+            _encode_cases(self._completed_runs(), out)
+            self._frames[FRAME_SNAPSHOT] = bytes(out)
+        return self._frames[FRAME_SNAPSHOT]
+
+    def delta_frame(self) -> bytes:
+        """Encode the change from the previous sequence number."""
+        if FRAME_DELTA not in self._frames:
+            d_progress, d_completed, runs = self._delta
+            out = self._header(FRAME_DELTA)
+            _svarint(d_progress, out)
+            _svarint(d_completed, out)
+            _encode_cases(runs, out)
+            self._frames[FRAME_DELTA] = bytes(out)
+        return self._frames[FRAME_DELTA]
+
+    def _completed_runs(self) -> list[tuple[int, int]]:
+        """Collapse the completed bitmap into runs, skipping full and empty bytes quickly."""
+        runs: list[tuple[int, int]] = []
+        run_start = None
+        for byte_index, byte in enumerate(self.completed):
+            if (byte == 0xFF and run_start is not None) or (byte == 0 and run_start is None):
+                continue
+            for bit in range(8):
+                index = byte_index * 8 + bit
+                if byte & (1 << bit):
+                    if run_start is None:
+                        run_start = index
+                elif run_start is not None:
+                    runs.append((run_start, index - run_start))
+                    run_start = None
+        if run_start is not None:
+            runs.append((run_start, min(len(self.completed) * 8, self.total_cases) - run_start))
+        return runs
+
+
+class ProgressEncoder:
+    """Per-subscriber encoder deciding between snapshot and delta frames."""
+
+    def __init__(self, snapshot_interval: int = SNAPSHOT_INTERVAL):
+        """Initialize an encoder that has not sent anything yet."""
+        self.snapshot_interval = snapshot_interval
+        self.run: RunProgress | None = None
+        self.last_seq: int | None = None
+        self.frames_since_snapshot = 0
+
+    def resume(self, run: RunProgress | None, last_seq: int) -> None:
+        """Continue with deltas after frames up to `last_seq` of `run` were sent directly."""
+        self.run = run
+        self.last_seq = last_seq
+
+    def encode(self, run: RunProgress) -> bytes:
+        """Get the next frame for this subscriber."""
+        in_sync = self.run is run and self.last_seq == run.seq - 1
+        if in_sync and self.frames_since_snapshot < self.snapshot_interval:
+            frame = run.delta_frame()
+            self.frames_since_snapshot += 1
+        else:
+            frame = run.snapshot_frame()
+            self.frames_since_snapshot = 0
+        self.run = run
+        self.last_seq = run.seq
+        return frame
+
+
+HEARTBEAT_FRAME = bytes([FRAME_HEARTBEAT])
+
+
+def decode_frame(data: bytes) -> dict:
+    """Decode a binary progress frame, for clients and debugging."""
+    if data[0] == FRAME_HEARTBEAT:
+        return {"type": "heartbeat"}
+
+    frame_type, state = data[0], STATES.get(data[1], "UNKNOWN")
+    seq, pos = _read_uvarint(data, 2)
+
+    if frame_type == FRAME_SNAPSHOT:
+        progress, pos = _read_uvarint(data, pos)
+        total, pos = _read_uvarint(data, pos)
+        completed, pos = _read_uvarint(data, pos)
+        cases, pos = _decode_cases(data, pos)
+        return {
+            "type": "snapshot",
+            "seq": seq,
+            "state": state,
+            "progress": progress,
+            "total_cases": total,
+            "completed_count": completed,
+            "cases": cases,
+        }
+    if frame_type == FRAME_DELTA:
+        d_progress, pos = _read_svarint(data, pos)
+        d_completed, pos = _read_svarint(data, pos)
+        cases, pos = _decode_cases(data, pos)
+        return {
+            "type": "delta",
+            "seq": seq,
+            "state": state,
+            "d_progress": d_progress,
+            "d_completed": d_completed,
+            "cases": cases,
+        }
+    raise ValueError(f"Unknown frame type: {frame_type}")
@@ -0,0 +1,75 @@
+"""State of simulation runs and the results of their cases."""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from psc.configurator.cases import case_at, case_count
+
+from .adaptive import AdaptiveRefiner
+
+if TYPE_CHECKING:
+    from .policies import StopMonitor
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    """The outcome of one executed case."""
+
+    index: int
+    duration: float
+    state: str = "COMPLETED"
+    metrics: dict | None = None
+
+
+@dataclass
+class RunState:
+    """Cases and progress of a run, shared by its passes.
+
+    Cases of the configured grid are referred to by their cartesian index and their values
+    computed when needed (see `case_at`), so a run never holds the whole sweep. Refinement
+    passes add cases beyond the grid, numbered after it, which are kept in `refined`.
+    `planned_cases` is the most cases the run may execute, which progress is measured
+    against.
+    """
+
+    config_id: UUID
+    parameters: list
+    parameters_hash: str | None
+    planned_cases: int
+    completed: int = 0
+    refiner: AdaptiveRefiner | None = None
+    monitor: "StopMonitor | None" = None
+    # Case index -> parameter values of the cases added by refinement passes
+    refined: dict[int, dict] = field(default_factory=dict)
+    # Results collected but not yet persisted with a status update
+    unreported: list[CaseResult] = field(default_factory=list)
+
+    def __post_init__(self):
+        """Count the cases of the configured grid."""
+        self.grid_cases = case_count(self.parameters)
+
+    @property
+    def case_count(self) -> int:
+        """Get the number of cases in the run so far, refined ones included."""
+        return self.grid_cases + len(self.refined)
+
+    def case(self, index: int) -> dict:
+        """Get the parameter values of a case."""
+        if index < self.grid_cases:
+            return case_at(self.parameters, index)
+        return self.refined[index]
+
+    def add_cases(self, cases: list[dict]) -> list[int]:
+        """Add refined cases after the existing ones, returning their indices."""
+        indices = list(range(self.case_count, self.case_count + len(cases)))
+        self.refined.update(zip(indices, cases, strict=True))
+        return indices
+
+    def record(self, results: list[CaseResult]) -> None:
+        """Record newly finished cases."""
+        self.completed += len(results)
+        self.unreported.extend(results)
+        if self.refiner is not None:
+            for result in results:
+                self.refiner.add_result(self.case(result.index), result.metrics)
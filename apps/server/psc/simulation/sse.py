@@ -0,0 +1,74 @@
+"""Server-Sent Events subscribers of simulation status updates."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from functools import lru_cache
+
+# Status updates buffered per SSE subscriber before it is considered too slow and dropped
+SSE_QUEUE_SIZE = 256
+
+# Seconds between keep-alive comments on an idle stream
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+class SlowSubscriberError(Exception):
+    """Raised when an SSE subscriber's buffer is full."""
+
+    pass
+
+
+class EventStreamSubscriber:
+    """Buffers status messages for an SSE response.
+
+    Exposes the `send_text` method the simulation manager uses for WebSocket subscribers,
+    so it can be registered and broadcast to in the same way. SSE only carries JSON status
+    messages, so it is always registered as a text subscriber and has no `send_bytes`.
+    """
+
+    def __init__(self, maxsize: int = SSE_QUEUE_SIZE):
+        """Initialize an empty subscriber buffer."""
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+        self.closed = False
+
+    async def send_text(self, message: str) -> None:
+        """Queue a JSON status message as an event, failing if the client is not keeping up."""
+        try:
+            self._queue.put_nowait(format_event(message))
+        except asyncio.QueueFull as e:
+            self.dropped = True
+            raise SlowSubscriberError("SSE subscriber is not keeping up") from e
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        """End the stream once the queued messages are sent, like closing a WebSocket."""
+        self.closed = True
+        try:
+            # Wake the stream if it is waiting for a message
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def events(self, keepalive: float = SSE_KEEPALIVE_SECONDS) -> AsyncIterator[str]:
+        """Yield queued events, with keep-alive comments while idle.
+
+        The stream ends once the buffer of a dropped or closed subscriber is drained; the
+        client then reconnects with `Last-Event-ID` to resume.
+        """
+        while not ((self.dropped or self.closed) and self._queue.empty()):
+            try:
+                event = await asyncio.wait_for(self._queue.get(), keepalive)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is not None:
+                yield event
+
+
+# A broadcast sends the same message to every subscriber in turn, so it is parsed only once
+@lru_cache(maxsize=1)
+def format_event(message: str) -> str:
+    """Format a JSON status message as an SSE `status` event, using its `seq` as the ID."""
+    seq = json.loads(message).get("seq")
+    event_id = f"id: {seq}\n" if seq is not None else ""
+    return f"{event_id}event: status\ndata: {message}\n\n"
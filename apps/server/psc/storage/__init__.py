@@ -0,0 +1,66 @@
+"""Pluggable storage of configurations, run statuses and case runs.
+
+`PSC_STORAGE_BACKEND` selects the backend: `postgres` (default), `sqlite` (an embedded
+database at `PSC_SQLITE_PATH`) or `memory` (nothing persisted).
+"""
+
+import os
+
+from .base import Repository
+from .memory import MemoryRepository
+from .records import CaseRunRecord, ConfigRecord, StatusRecord
+from .sqlite import SQLiteRepository
+
+STORAGE_BACKEND = os.getenv("PSC_STORAGE_BACKEND", "postgres").lower()
+SQLITE_PATH = os.getenv("PSC_SQLITE_PATH", "psc.sqlite3")
+
+STORAGE_BACKENDS = ("postgres", "sqlite", "memory")
+
+if STORAGE_BACKEND not in STORAGE_BACKENDS:
+    raise ValueError(f"Invalid PSC_STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+
+def create_repository(backend: str = STORAGE_BACKEND) -> Repository:
+    """Create a repository for a storage backend."""
+    match backend:
+        case "postgres":
+            from .postgres import PostgresRepository
+
+            return PostgresRepository()
+        case "sqlite":
+            return SQLiteRepository(SQLITE_PATH)
+        case "memory":
+            return MemoryRepository()
+        case _:
+            raise ValueError(f"Unknown storage backend: {backend}")
+
+
+_repository: Repository | None = None
+
+
+def get_repository() -> Repository:
+    """Get the process-wide repository, creating it for `PSC_STORAGE_BACKEND` on first use."""
+    global _repository
+    if _repository is None:
+        _repository = create_repository()
+    return _repository
+
+
+def set_repository(repository: Repository) -> None:
+    """Replace the process-wide repository, e.g. with a `MemoryRepository` in tests."""
+    global _repository
+    _repository = repository
+
+
+__all__ = [
+    "CaseRunRecord",
+    "ConfigRecord",
+    "MemoryRepository",
+    "Repository",
+    "SQLiteRepository",
+    "STORAGE_BACKEND",
+    "StatusRecord",
+    "create_repository",
+    "get_repository",
+    "set_repository",
+]
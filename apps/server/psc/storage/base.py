@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from uuid import UUID
+
+from .records import CaseRunRecord, ConfigRecord, StatusRecord
+
+
+def duplicate_reason(id: UUID) -> str:
+    """Get the invalidity reason of a configuration identical to the one with this ID."""
+    return f"An identical configuration already exists with id {id}"
+
+
+class Repository(ABC):
+    """Storage of configurations, run statuses and case runs.
+
+    The configurator, the API endpoints and the simulation manager only persist through
+    this interface, so backends can be swapped without touching them.
+    """
+
+    # Backend name, as selected by `PSC_STORAGE_BACKEND`
+    name: str
+
+    @abstractmethod
+    async def start(self, warm_connections: int = 0) -> None:
+        """Prepare the backend before serving, opening up to `warm_connections` connections."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release the backend's connections."""
+
+    def saturation(self) -> float:
+        """Get the fraction of the backend's connection pool in use, 0 if it has no pool."""
+        return 0.0
+
+    @abstractmethod
+    async def upsert_config(self, config: ConfigRecord) -> ConfigRecord:
+        """Store a configuration, or get the stored one with the same parameters hash."""
+
+    @abstractmethod
+    async def set_config_status(
+        self,
+        id: UUID,
+        status: str,
+        reason: str | None = None,
+        parameters: list[dict] | None = None,
+        parameters_hash: str | None = None,
+        total_cases: int | None = None,
+    ) -> ConfigRecord | None:
+        """Record the outcome of validating a configuration, with its normalized parameters.
+
+        If another configuration with the same ordering already has the parameters hash, e.g.
+        an identical one submitted while this one was validated, this one is stored INVALID
+        instead, as a duplicate of it, and the other stays the deduplication target.
+        Returns None if the configuration does not exist.
+        """
+
+    @abstractmethod
+    async def get_config(self, id: UUID, primary: bool = False) -> ConfigRecord | None:
+        """Get a configuration, reading from the primary database when `primary` is set."""
+
+    @abstractmethod
+    async def list_configs(self) -> list[ConfigRecord]:
+        """Get all configurations, newest first."""
+
+    @abstractmethod
+    async def pending_config_ids(self) -> list[UUID]:
+        """Get the IDs of the configurations pending validation, from the primary database."""
+
+    @abstractmethod
+    async def delete_config(self, id: UUID) -> bool:
+        """Delete a configuration. Returns False if it does not exist."""
+
+    @abstractmethod
+    async def add_status(
+        self, status: StatusRecord, case_runs: Sequence[CaseRunRecord] = ()
+    ) -> StatusRecord:
+        """Store a status update together with the case runs finished since the last one.
+
+        Returns the stored status, with its creation time set.
+        """
+
+    @abstractmethod
+    async def latest_status(self, config_id: UUID) -> StatusRecord | None:
+        """Get the latest status update of a configuration."""
+
+    @abstractmethod
+    async def list_statuses(self, config_id: UUID) -> list[StatusRecord]:
+        """Get all status updates of a configuration, newest first."""
+
+    @abstractmethod
+    async def case_durations(self, limit: int) -> list[tuple[dict, float]]:
+        """Get the parameters and durations of the most recent completed case runs."""
@@ -0,0 +1,131 @@
+"""In-process storage backend, for tests, benchmarks and throwaway single-node servers."""
+
+import dataclasses
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from uuid import UUID
+
+from .base import Repository, duplicate_reason
+from .records import CaseRunRecord, ConfigRecord, StatusRecord
+
+
+class MemoryRepository(Repository):
+    """Keeps everything in dictionaries of the running process; nothing is persisted."""
+
+    name = "memory"
+
+    def __init__(self):
+        """Initialize an empty repository."""
+        self._configs: dict[UUID, ConfigRecord] = {}
+        # (Parameters hash, ordering) -> config ID
+        self._hashes: dict[tuple[str, str], UUID] = {}
+        # Config ID -> status updates, oldest first
+        self._statuses: dict[UUID, list[StatusRecord]] = {}
+        self._case_runs: list[CaseRunRecord] = []
+
+    async def start(self, warm_connections: int = 0) -> None:
+        """Do nothing: the repository has no connections to open."""
+
+    async def close(self) -> None:
+        """Do nothing: the repository has no connections to release."""
+
+    async def upsert_config(self, config: ConfigRecord) -> ConfigRecord:
+        """Store a configuration, or get the stored one with the same parameters and ordering."""
+        existing = self._hashes.get((config.parameters_hash, config.ordering))
+        if existing is not None:
+            return self._configs[existing]
+
+        now = datetime.now(UTC)
+        config = dataclasses.replace(config, created_at=now, updated_at=now)
+        self._configs[config.id] = config
+        if config.parameters_hash is not None:
+            self._hashes[config.parameters_hash, config.ordering] = config.id
+        return config
+
+    async def set_config_status(
+        self,
+        id: UUID,
+        status: str,
+        reason: str | None = None,
+        parameters: list[dict] | None = None,
+        parameters_hash: str | None = None,
+        total_cases: int | None = None,
+    ) -> ConfigRecord | None:
+        """Record the outcome of validating a configuration, with its normalized parameters."""
+        config = self._configs.get(id)
+        if config is None:
+            return None
+
+        duplicate_of = None
+        if parameters_hash is None:
+            parameters_hash = config.parameters_hash
+        elif (other := self._hashes.get((parameters_hash, config.ordering), id)) != id:
+            # Another configuration already has the hash: this one duplicates it
+            status, reason, total_cases = "INVALID", duplicate_reason(other), None
+            parameters_hash, duplicate_of = config.parameters_hash, other
+        elif config.parameters_hash not in (None, parameters_hash):
+            # The configuration no longer deduplicates under its previous hash
+            self._hashes.pop((config.parameters_hash, config.ordering), None)
+        config = dataclasses.replace(
+            config,
+            status=status,
+            reason=reason,
+            parameters=parameters if parameters is not None else config.parameters,
+            parameter_count=len(parameters) if parameters is not None else config.parameter_count,
+            parameters_hash=parameters_hash,
+            total_cases=total_cases,
+            duplicate_of=duplicate_of,
+            updated_at=datetime.now(UTC),
+        )
+        self._configs[id] = config
+        if config.parameters_hash is not None:
+            self._hashes[config.parameters_hash, config.ordering] = id
+        return config
+
+    async def get_config(self, id: UUID, primary: bool = False) -> ConfigRecord | None:
+        """Get a configuration."""
+        return self._configs.get(id)
+
+    async def list_configs(self) -> list[ConfigRecord]:
+        """Get all configurations, newest first."""
+        return list(reversed(self._configs.values()))
+
+    async def pending_config_ids(self) -> list[UUID]:
+        """Get the IDs of the configurations pending validation."""
+        return [id for id, config in self._configs.items() if config.status == "PENDING_VALIDATION"]
+
+    async def delete_config(self, id: UUID) -> bool:
+        """Delete a configuration. Returns False if it does not exist."""
+        config = self._configs.pop(id, None)
+        if config is None:
+            return False
+        self._hashes.pop((config.parameters_hash, config.ordering), None)
+        return True
+
+    async def add_status(
+        self, status: StatusRecord, case_runs: Sequence[CaseRunRecord] = ()
+    ) -> StatusRecord:
+        """Store a status update together with the case runs finished since the last one."""
+        status = dataclasses.replace(status, created_at=datetime.now(UTC))
+        self._statuses.setdefault(status.config_id, []).append(status)
+        self._case_runs.extend(case_runs)
+        return status
+
+    async def latest_status(self, config_id: UUID) -> StatusRecord | None:
+        """Get the latest status update of a configuration."""
+        statuses = self._statuses.get(config_id)
+        return statuses[-1] if statuses else None
+
+    async def list_statuses(self, config_id: UUID) -> list[StatusRecord]:
+        """Get all status updates of a configuration, newest first."""
+        return list(reversed(self._statuses.get(config_id, [])))
+
+    async def case_durations(self, limit: int) -> list[tuple[dict, float]]:
+        """Get the parameters and durations of the most recent completed case runs."""
+        samples = []
+        for case_run in reversed(self._case_runs):
+            if len(samples) >= limit:
+                break
+            if case_run.state == "COMPLETED":
+                samples.append((case_run.parameters, case_run.duration))
+        return samples
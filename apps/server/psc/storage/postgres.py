@@ -0,0 +1,304 @@
+"""Postgres storage backend, with an optional read replica (see `psc.db`)."""
+
+import asyncio
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import aliased
+
+from psc.db import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    async_session_factory,
+    engine,
+    read_engine,
+    read_session,
+    record_write,
+)
+from psc.schemas import CaseRun, ParameterSweepConfig, SimulationStatus
+
+from .base import Repository, duplicate_reason
+from .records import CaseRunRecord, ConfigRecord, StatusRecord
+
+
+async def warm_pool(pool_engine: AsyncEngine, connections: int) -> None:
+    """Open up to `connections` pooled connections concurrently and return them to the pool."""
+    connections = min(connections, pool_engine.pool.size())
+    if connections <= 0:
+        return
+
+    # Hold every connection until all are open, so each checkout opens a new one
+    opened = asyncio.Barrier(connections)
+
+    async def connect() -> None:
+        async with pool_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await opened.wait()
+
+    # A failed connection cancels the others instead of leaving them at the barrier
+    async with asyncio.TaskGroup() as group:
+        for _ in range(connections):
+            group.create_task(connect())
+
+
+def _config(config: ParameterSweepConfig) -> ConfigRecord:
+    return ConfigRecord(
+        id=config.id,
+        name=config.name,
+        description=config.description,
+        parameters=config.parameters,
+        parameter_count=config.parameter_count,
+        parameters_hash=config.parameters_hash,
+        ordering=config.ordering,
+        status=config.status,
+        reason=config.reason,
+        total_cases=config.total_cases,
+        duplicate_of=config.duplicate_of,
+        created_at=config.created_at,
+        updated_at=config.updated_at,
+    )
+
+
+def _status(simulation: SimulationStatus) -> StatusRecord:
+    return StatusRecord(
+        id=simulation.id,
+        config_id=simulation.config_id,
+        parameters_hash=simulation.parameters_hash,
+        progress=simulation.progress,
+        completed_cases=simulation.completed_cases,
+        total_cases=simulation.total_cases,
+        eta_seconds=simulation.eta_seconds,
+        state=simulation.state,
+        reason=simulation.reason,
+        created_at=simulation.created_at,
+    )
+
+
+class PostgresRepository(Repository):
+    """Stores everything in Postgres through the SQLAlchemy models in `psc.schemas`.
+
+    Reads go to the read replica, if configured, unless the same key was written within
+    the read-your-writes window.
+    """
+
+    name = "postgres"
+
+    def _engines(self) -> list[AsyncEngine]:
+        return [engine] if read_engine is engine else [engine, read_engine]
+
+    async def start(self, warm_connections: int = 0) -> None:
+        """Open `warm_connections` pooled connections per database."""
+        await asyncio.gather(
+            *(warm_pool(pool_engine, warm_connections) for pool_engine in self._engines())
+        )
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        await asyncio.gather(*(pool_engine.dispose() for pool_engine in self._engines()))
+
+    def saturation(self) -> float:
+        """Get the fraction of the busiest pool's connections, including overflow, in use."""
+        # A negative overflow lets the pools grow without bound, so they never saturate
+        if DB_MAX_OVERFLOW < 0:
+            return 0.0
+        capacity = DB_POOL_SIZE + DB_MAX_OVERFLOW
+        return max(pool_engine.pool.checkedout() for pool_engine in self._engines()) / capacity
+
+    async def upsert_config(self, config: ConfigRecord) -> ConfigRecord:
+        """Store a configuration, or get the stored one with the same parameters and ordering.
+
+        Both cases are resolved in a single upsert round-trip.
+        """
+        stmt = insert(ParameterSweepConfig).values(
+            id=config.id,
+            name=config.name,
+            description=config.description,
+            parameters=config.parameters,
+            parameter_count=config.parameter_count,
+            parameters_hash=config.parameters_hash,
+            ordering=config.ordering,
+            status=config.status,
+            reason=config.reason,
+            total_cases=config.total_cases,
+            duplicate_of=config.duplicate_of,
+        )
+        # A no-op update (rather than DO NOTHING) so RETURNING yields the existing row
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ParameterSweepConfig.parameters_hash, ParameterSweepConfig.ordering],
+            set_={"parameters_hash": stmt.excluded.parameters_hash},
+        ).returning(ParameterSweepConfig)
+
+        async with async_session_factory() as session:
+            result = await session.execute(stmt)
+            stored = _config(result.scalar_one())
+            await session.commit()
+        record_write(stored.id)
+        return stored
+
+    async def set_config_status(
+        self,
+        id: UUID,
+        status: str,
+        reason: str | None = None,
+        parameters: list[dict] | None = None,
+        parameters_hash: str | None = None,
+        total_cases: int | None = None,
+    ) -> ConfigRecord | None:
+        """Record the outcome of validating a configuration, with its normalized parameters."""
+        values = {"status": status, "reason": reason, "total_cases": total_cases}
+        if parameters is not None:
+            values.update(parameters=parameters, parameter_count=len(parameters))
+        other = aliased(ParameterSweepConfig)
+        duplicated = (
+            select(other.id)
+            .join(ParameterSweepConfig, other.ordering == ParameterSweepConfig.ordering)
+            .where(
+                ParameterSweepConfig.id == id,
+                other.parameters_hash == parameters_hash,
+                other.id != id,
+            )
+        )
+
+        async def store(session) -> ParameterSweepConfig | None:
+            hashed = {**values, "duplicate_of": None}
+            if parameters_hash is not None:
+                duplicate_of = await session.scalar(duplicated)
+                if duplicate_of is None:
+                    hashed["parameters_hash"] = parameters_hash
+                else:
+                    # Another configuration already has the hash: this one duplicates it
+                    hashed.update(
+                        status="INVALID",
+                        reason=duplicate_reason(duplicate_of),
+                        total_cases=None,
+                        duplicate_of=duplicate_of,
+                    )
+            result = await session.execute(
+                update(ParameterSweepConfig)
+                .where(ParameterSweepConfig.id == id)
+                .values(**hashed)
+                .returning(ParameterSweepConfig)
+            )
+            return result.scalar_one_or_none()
+
+        async with async_session_factory() as session:
+            try:
+                config = await store(session)
+            except IntegrityError:
+                # An identical configuration was stored concurrently; this one duplicates it
+                await session.rollback()
+                config = await store(session)
+            await session.commit()
+        record_write(id)
+        return _config(config) if config is not None else None
+
+    async def get_config(self, id: UUID, primary: bool = False) -> ConfigRecord | None:
+        """Get a configuration from the replica, or from the primary if `primary` is set."""
+        async with async_session_factory() if primary else read_session(id) as session:
+            stmt = select(ParameterSweepConfig).where(ParameterSweepConfig.id == id)
+            result = await session.execute(stmt)
+            config = result.scalar_one_or_none()
+            return _config(config) if config is not None else None
+
+    async def list_configs(self) -> list[ConfigRecord]:
+        """Get all configurations, newest first."""
+        async with read_session() as session:
+            stmt = select(ParameterSweepConfig).order_by(ParameterSweepConfig.created_at.desc())
+            result = await session.execute(stmt)
+            return [_config(config) for config in result.scalars()]
+
+    async def pending_config_ids(self) -> list[UUID]:
+        """Get the IDs of the configurations pending validation, from the primary database."""
+        async with async_session_factory() as session:
+            stmt = select(ParameterSweepConfig.id).where(
+                ParameterSweepConfig.status == "PENDING_VALIDATION"
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars())
+
+    async def delete_config(self, id: UUID) -> bool:
+        """Delete a configuration. Returns False if it does not exist."""
+        async with async_session_factory() as session:
+            stmt = (
+                delete(ParameterSweepConfig)
+                .where(ParameterSweepConfig.id == id)
+                .returning(ParameterSweepConfig.id)
+            )
+            result = await session.execute(stmt)
+            deleted = result.scalar_one_or_none() is not None
+            await session.commit()
+        record_write(id)
+        return deleted
+
+    async def add_status(
+        self, status: StatusRecord, case_runs: Sequence[CaseRunRecord] = ()
+    ) -> StatusRecord:
+        """Store a status update together with the case runs finished since the last one."""
+        async with async_session_factory() as session:
+            simulation = SimulationStatus(
+                id=status.id,
+                config_id=status.config_id,
+                parameters_hash=status.parameters_hash,
+                progress=status.progress,
+                completed_cases=status.completed_cases,
+                total_cases=status.total_cases,
+                eta_seconds=status.eta_seconds,
+                state=status.state,
+                reason=status.reason,
+            )
+            session.add(simulation)
+            session.add_all(
+                CaseRun(
+                    id=case_run.id,
+                    config_id=case_run.config_id,
+                    case_index=case_run.case_index,
+                    parameters=case_run.parameters,
+                    duration=case_run.duration,
+                    state=case_run.state,
+                    metrics=case_run.metrics,
+                )
+                for case_run in case_runs
+            )
+            await session.commit()
+            await session.refresh(simulation)
+            return _status(simulation)
+
+    async def latest_status(self, config_id: UUID) -> StatusRecord | None:
+        """Get the latest status update of a configuration."""
+        async with read_session(config_id) as session:
+            stmt = (
+                select(SimulationStatus)
+                .where(SimulationStatus.config_id == config_id)
+                .order_by(SimulationStatus.created_at.desc())
+                .limit(1)
+            )
+            result = await session.execute(stmt)
+            simulation = result.scalar_one_or_none()
+            return _status(simulation) if simulation is not None else None
+
+    async def list_statuses(self, config_id: UUID) -> list[StatusRecord]:
+        """Get all status updates of a configuration, newest first."""
+        async with read_session(config_id) as session:
+            stmt = (
+                select(SimulationStatus)
+                .where(SimulationStatus.config_id == config_id)
+                .order_by(SimulationStatus.created_at.desc())
+            )
+            result = await session.execute(stmt)
+            return [_status(simulation) for simulation in result.scalars()]
+
+    async def case_durations(self, limit: int) -> list[tuple[dict, float]]:
+        """Get the parameters and durations of the most recent completed case runs."""
+        async with read_session() as session:
+            stmt = (
+                select(CaseRun.parameters, CaseRun.duration)
+                .where(CaseRun.state == "COMPLETED")
+                .order_by(CaseRun.created_at.desc())
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
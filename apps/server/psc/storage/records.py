@@ -0,0 +1,101 @@
+"""Backend-independent records of stored configurations, statuses and case runs."""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class ConfigRecord:
+    """A stored parameter sweep configuration."""
+
+    name: str
+    description: str
+    parameters: list[dict]
+    parameter_count: int
+    parameters_hash: str | None
+    ordering: str = "cartesian"
+    # PENDING_VALIDATION, READY or INVALID, with the validation error of invalid ones
+    status: str = "READY"
+    reason: str | None = None
+    # Number of cases in the sweep, counted once the parameters are validated
+    total_cases: int | None = None
+    # ID of the identical configuration stored first, if this one turned out to duplicate it
+    duplicate_of: UUID | None = None
+    id: UUID = field(default_factory=uuid.uuid4)
+    # Set by the backend when the configuration is stored
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    def to_dict(self):
+        """Convert to dictionary for API responses."""
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "description": self.description,
+            "parameters": self.parameters,
+            "parameter_count": self.parameter_count,
+            "parameters_hash": self.parameters_hash,
+            "ordering": self.ordering,
+            "status": self.status,
+            "reason": self.reason,
+            "total_cases": self.total_cases,
+            "duplicate_of": str(self.duplicate_of) if self.duplicate_of is not None else None,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+    def to_preview(self):
+        """Convert to preview format for list endpoint."""
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "description": self.description,
+            "parameter_count": self.parameter_count,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+@dataclass(frozen=True)
+class StatusRecord:
+    """A status update of a simulation run."""
+
+    config_id: UUID
+    progress: int
+    state: str
+    parameters_hash: str | None = None
+    completed_cases: int | None = None
+    total_cases: int | None = None
+    eta_seconds: float | None = None
+    reason: str | None = None
+    id: UUID = field(default_factory=uuid.uuid4)
+    # Set by the backend when the status is stored
+    created_at: datetime | None = None
+
+    def to_dict(self):
+        """Convert to dictionary for API responses."""
+        return {
+            "id": str(self.id),
+            "config_id": str(self.config_id),
+            "progress": self.progress,
+            "completed_cases": self.completed_cases,
+            "total_cases": self.total_cases,
+            "eta_seconds": self.eta_seconds,
+            "state": self.state,
+            "reason": self.reason,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+@dataclass(frozen=True)
+class CaseRunRecord:
+    """The duration and output metrics of one executed case."""
+
+    config_id: UUID
+    case_index: int
+    parameters: dict
+    duration: float
+    state: str = "COMPLETED"
+    metrics: dict | None = None
+    id: UUID = field(default_factory=uuid.uuid4)
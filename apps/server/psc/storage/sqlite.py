@@ -0,0 +1,431 @@
+"""Embedded SQLite storage backend for single-node deployments.
+
+The database is opened in WAL mode, so readers in other processes (e.g. backups or ad-hoc
+queries) never block the server's writes, with `synchronous=NORMAL`, which stays durable
+across application crashes and only risks the last transactions on power loss. Queries
+run on a worker thread through one shared connection, so they never block the event loop.
+JSON columns are stored as text, UUIDs as text and timestamps as Unix seconds.
+"""
+
+import asyncio
+import dataclasses
+import json
+import math
+import sqlite3
+import threading
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from .base import Repository, duplicate_reason
+from .records import CaseRunRecord, ConfigRecord, StatusRecord
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parameter_sweep_configs (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    parameters TEXT NOT NULL,
+    parameter_count INTEGER NOT NULL,
+    parameters_hash TEXT,
+    ordering TEXT NOT NULL DEFAULT 'cartesian',
+    status TEXT NOT NULL DEFAULT 'READY',
+    reason TEXT,
+    total_cases INTEGER,
+    duplicate_of TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_configs_created_at ON parameter_sweep_configs (created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_parameters_hash_ordering
+    ON parameter_sweep_configs (parameters_hash, ordering);
+
+CREATE TABLE IF NOT EXISTS simulation_status (
+    id TEXT PRIMARY KEY,
+    config_id TEXT NOT NULL,
+    parameters_hash TEXT,
+    progress INTEGER NOT NULL,
+    completed_cases INTEGER,
+    total_cases INTEGER,
+    eta_seconds REAL,
+    state TEXT NOT NULL,
+    reason TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_config_id_created_at ON simulation_status (config_id, created_at);
+
+CREATE TABLE IF NOT EXISTS case_runs (
+    id TEXT PRIMARY KEY,
+    config_id TEXT NOT NULL,
+    case_index INTEGER NOT NULL,
+    parameters TEXT NOT NULL,
+    duration REAL NOT NULL,
+    state TEXT NOT NULL,
+    metrics TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_case_runs_created_at ON case_runs (created_at);
+"""
+
+# Columns added after a table was first created: (table, column, definition)
+ADDED_COLUMNS = (
+    ("parameter_sweep_configs", "status", "TEXT NOT NULL DEFAULT 'READY'"),
+    ("parameter_sweep_configs", "reason", "TEXT"),
+    ("parameter_sweep_configs", "total_cases", "INTEGER"),
+    ("parameter_sweep_configs", "duplicate_of", "TEXT"),
+)
+
+CONFIG_COLUMNS = (
+    "id, name, description, parameters, parameter_count, parameters_hash, ordering, status, "
+    "reason, total_cases, duplicate_of, created_at, updated_at"
+)
+STATUS_COLUMNS = (
+    "id, config_id, parameters_hash, progress, completed_cases, total_cases, eta_seconds, "
+    "state, reason, created_at"
+)
+
+
+def _timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, UTC)
+
+
+def _config(row: tuple) -> ConfigRecord:
+    id, name, description, parameters, count, parameters_hash, ordering, *validation = row
+    status, reason, total_cases, duplicate_of, created, updated = validation
+    return ConfigRecord(
+        id=UUID(id),
+        name=name,
+        description=description,
+        parameters=json.loads(parameters),
+        parameter_count=count,
+        parameters_hash=parameters_hash,
+        ordering=ordering,
+        status=status,
+        reason=reason,
+        total_cases=total_cases,
+        duplicate_of=UUID(duplicate_of) if duplicate_of is not None else None,
+        created_at=_timestamp(created),
+        updated_at=_timestamp(updated),
+    )
+
+
+def _status(row: tuple) -> StatusRecord:
+    id, config_id, parameters_hash, progress, completed, total, eta, state, reason, created = row
+    return StatusRecord(
+        id=UUID(id),
+        config_id=UUID(config_id),
+        parameters_hash=parameters_hash,
+        progress=progress,
+        completed_cases=completed,
+        total_cases=total,
+        eta_seconds=eta,
+        state=state,
+        reason=reason,
+        created_at=_timestamp(created),
+    )
+
+
+class SQLiteRepository(Repository):
+    """Stores everything in one SQLite database file."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str | Path):
+        """Initialize a repository backed by the database at `path` (or `:memory:`)."""
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create its tables on first use; call with the lock held."""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._add_columns(connection)
+            self._count_cases(connection)
+            self._drop_hash_constraint(connection)
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _add_columns(connection: sqlite3.Connection) -> None:
+        """Add the columns missing from tables created by an older version."""
+        for table, column, definition in ADDED_COLUMNS:
+            columns = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        connection.commit()
+
+    @staticmethod
+    def _count_cases(connection: sqlite3.Connection) -> None:
+        """Store the case count of READY configurations stored before it was counted."""
+        rows = connection.execute(
+            "SELECT id, parameters FROM parameter_sweep_configs "
+            "WHERE status = 'READY' AND total_cases IS NULL"
+        ).fetchall()
+        counts = []
+        for id, parameters in rows:
+            parameters = json.loads(parameters)
+            count = math.prod(len(param["values"]) for param in parameters) if parameters else 0
+            counts.append((count, id))
+        with connection:
+            connection.executemany(
+                "UPDATE parameter_sweep_configs SET total_cases = ? WHERE id = ?", counts
+            )
+
+    @staticmethod
+    def _drop_hash_constraint(connection: sqlite3.Connection) -> None:
+        """Rebuild a configuration table created with `parameters_hash` unique on its own.
+
+        Configurations are deduplicated by parameters hash and ordering together, and SQLite
+        can only drop a column constraint by copying the table.
+        """
+        for _, index, unique, origin, _ in connection.execute(
+            "PRAGMA index_list(parameter_sweep_configs)"
+        ):
+            columns = [row[2] for row in connection.execute(f"PRAGMA index_info({index})")]
+            if unique and origin == "u" and columns == ["parameters_hash"]:
+                break
+        else:
+            return
+
+        with connection:
+            connection.execute("ALTER TABLE parameter_sweep_configs RENAME TO old_configs")
+            connection.execute("DROP INDEX IF EXISTS idx_configs_created_at")
+            connection.execute("DROP INDEX IF EXISTS idx_parameters_hash_ordering")
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.execute(
+                f"INSERT INTO parameter_sweep_configs ({CONFIG_COLUMNS}) "
+                f"SELECT {CONFIG_COLUMNS} FROM old_configs"
+            )
+            connection.execute("DROP TABLE old_configs")
+
+    def _call(self, function: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock:
+            connection = self._connect()
+            # Commits on success and rolls back on error
+            with connection:
+                return function(connection)
+
+    async def _run(self, function: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.to_thread(self._call, function)
+
+    async def start(self, warm_connections: int = 0) -> None:
+        """Open the database and create its tables."""
+        await self._run(lambda connection: None)
+
+    async def close(self) -> None:
+        """Close the database connection."""
+
+        def close() -> None:
+            with self._lock:
+                if self._connection is not None:
+                    self._connection.close()
+                    self._connection = None
+
+        await asyncio.to_thread(close)
+
+    async def upsert_config(self, config: ConfigRecord) -> ConfigRecord:
+        """Store a configuration, or get the stored one with the same parameters and ordering."""
+
+        def upsert(connection: sqlite3.Connection) -> ConfigRecord:
+            now = datetime.now(UTC).timestamp()
+            connection.execute(
+                f"INSERT INTO parameter_sweep_configs ({CONFIG_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (parameters_hash, ordering) DO NOTHING",
+                (
+                    str(config.id),
+                    config.name,
+                    config.description,
+                    json.dumps(config.parameters),
+                    config.parameter_count,
+                    config.parameters_hash,
+                    config.ordering,
+                    config.status,
+                    config.reason,
+                    config.total_cases,
+                    str(config.duplicate_of) if config.duplicate_of is not None else None,
+                    now,
+                    now,
+                ),
+            )
+            # The inserted row, or else the existing one with the same hash and ordering
+            row = connection.execute(
+                f"SELECT {CONFIG_COLUMNS} FROM parameter_sweep_configs "
+                "WHERE id = ? OR (parameters_hash = ? AND ordering = ?)",
+                (str(config.id), config.parameters_hash, config.ordering),
+            ).fetchone()
+            return _config(row)
+
+        return await self._run(upsert)
+
+    async def set_config_status(
+        self,
+        id: UUID,
+        status: str,
+        reason: str | None = None,
+        parameters: list[dict] | None = None,
+        parameters_hash: str | None = None,
+        total_cases: int | None = None,
+    ) -> ConfigRecord | None:
+        """Record the outcome of validating a configuration, with its normalized parameters."""
+
+        def update(connection: sqlite3.Connection) -> ConfigRecord | None:
+            nonlocal status, reason, parameters_hash, total_cases
+            duplicate_of = None
+            if parameters_hash is not None:
+                row = connection.execute(
+                    "SELECT other.id FROM parameter_sweep_configs AS other "
+                    "JOIN parameter_sweep_configs AS config ON other.ordering = config.ordering "
+                    "WHERE config.id = ? AND other.parameters_hash = ? AND other.id != ?",
+                    (str(id), parameters_hash, str(id)),
+                ).fetchone()
+                if row is not None:
+                    # Another configuration already has the hash: this one duplicates it
+                    duplicate_of = row[0]
+                    status, reason = "INVALID", duplicate_reason(UUID(duplicate_of))
+                    parameters_hash = total_cases = None
+            connection.execute(
+                "UPDATE parameter_sweep_configs SET status = ?, reason = ?, total_cases = ?, "
+                "duplicate_of = ?, parameters = coalesce(?, parameters), "
+                "parameter_count = coalesce(?, parameter_count), "
+                "parameters_hash = coalesce(?, parameters_hash), updated_at = ? WHERE id = ?",
+                (
+                    status,
+                    reason,
+                    total_cases,
+                    duplicate_of,
+                    json.dumps(parameters) if parameters is not None else None,
+                    len(parameters) if parameters is not None else None,
+                    parameters_hash,
+                    datetime.now(UTC).timestamp(),
+                    str(id),
+                ),
+            )
+            row = connection.execute(
+                f"SELECT {CONFIG_COLUMNS} FROM parameter_sweep_configs WHERE id = ?", (str(id),)
+            ).fetchone()
+            return _config(row) if row is not None else None
+
+        return await self._run(update)
+
+    async def get_config(self, id: UUID, primary: bool = False) -> ConfigRecord | None:
+        """Get a configuration."""
+        row = await self._run(
+            lambda connection: connection.execute(
+                f"SELECT {CONFIG_COLUMNS} FROM parameter_sweep_configs WHERE id = ?", (str(id),)
+            ).fetchone()
+        )
+        return _config(row) if row is not None else None
+
+    async def list_configs(self) -> list[ConfigRecord]:
+        """Get all configurations, newest first."""
+        rows = await self._run(
+            lambda connection: connection.execute(
+                f"SELECT {CONFIG_COLUMNS} FROM parameter_sweep_configs "
+                "ORDER BY created_at DESC, rowid DESC"
+            ).fetchall()
+        )
+        return [_config(row) for row in rows]
+
+    async def pending_config_ids(self) -> list[UUID]:
+        """Get the IDs of the configurations pending validation."""
+        rows = await self._run(
+            lambda connection: connection.execute(
+                "SELECT id FROM parameter_sweep_configs WHERE status = 'PENDING_VALIDATION'"
+            ).fetchall()
+        )
+        return [UUID(id) for (id,) in rows]
+
+    async def delete_config(self, id: UUID) -> bool:
+        """Delete a configuration. Returns False if it does not exist."""
+        deleted = await self._run(
+            lambda connection: connection.execute(
+                "DELETE FROM parameter_sweep_configs WHERE id = ?", (str(id),)
+            ).rowcount
+        )
+        return deleted > 0
+
+    async def add_status(
+        self, status: StatusRecord, case_runs: Sequence[CaseRunRecord] = ()
+    ) -> StatusRecord:
+        """Store a status update together with the case runs finished since the last one."""
+        created_at = datetime.now(UTC)
+        timestamp = created_at.timestamp()
+
+        def insert(connection: sqlite3.Connection) -> None:
+            connection.execute(
+                f"INSERT INTO simulation_status ({STATUS_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(status.id),
+                    str(status.config_id),
+                    status.parameters_hash,
+                    status.progress,
+                    status.completed_cases,
+                    status.total_cases,
+                    status.eta_seconds,
+                    status.state,
+                    status.reason,
+                    timestamp,
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO case_runs (id, config_id, case_index, parameters, duration, state, "
+                "metrics, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(case_run.id),
+                        str(case_run.config_id),
+                        case_run.case_index,
+                        json.dumps(case_run.parameters),
+                        case_run.duration,
+                        case_run.state,
+                        json.dumps(case_run.metrics) if case_run.metrics is not None else None,
+                        timestamp,
+                    )
+                    for case_run in case_runs
+                ],
+            )
+
+        await self._run(insert)
+        return dataclasses.replace(status, created_at=created_at)
+
+    async def latest_status(self, config_id: UUID) -> StatusRecord | None:
+        """Get the latest status update of a configuration."""
+        row = await self._run(
+            lambda connection: connection.execute(
+                f"SELECT {STATUS_COLUMNS} FROM simulation_status WHERE config_id = ? "
+                "ORDER BY created_at DESC, rowid DESC LIMIT 1",
+                (str(config_id),),
+            ).fetchone()
+        )
+        return _status(row) if row is not None else None
+
+    async def list_statuses(self, config_id: UUID) -> list[StatusRecord]:
+        """Get all status updates of a configuration, newest first."""
+        rows = await self._run(
+            lambda connection: connection.execute(
+                f"SELECT {STATUS_COLUMNS} FROM simulation_status WHERE config_id = ? "
+                "ORDER BY created_at DESC, rowid DESC",
+                (str(config_id),),
+            ).fetchall()
+        )
+        return [_status(row) for row in rows]
+
+    async def case_durations(self, limit: int) -> list[tuple[dict, float]]:
+        """Get the parameters and durations of the most recent completed case runs."""
+        rows = await self._run(
+            lambda connection: connection.execute(
+                "SELECT parameters, duration FROM case_runs WHERE state = 'COMPLETED' "
+                "ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        )
+        return [(json.loads(parameters), duration) for parameters, duration in rows]
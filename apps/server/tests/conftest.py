@@ -0,0 +1,21 @@
+"""Test configuration: fast demo runs against a fresh in-memory storage backend per test."""
+
+import os
+
+# Settings are read when `psc` is imported, so set them before any test module imports it
+os.environ.setdefault("PSC_STORAGE_BACKEND", "memory")
+os.environ.setdefault("PSC_DEMO_CASE_SECONDS", "0.001")
+os.environ.setdefault("PSC_STATUS_INTERVAL", "0.01")
+os.environ.setdefault("PSC_METRICS_ENABLED", "false")
+
+import pytest  # noqa: E402
+
+from psc.storage import MemoryRepository, set_repository  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def repository() -> MemoryRepository:
+    """Install an empty in-memory repository as the process-wide one."""
+    repository = MemoryRepository()
+    set_repository(repository)
+    return repository
@@ -0,0 +1,64 @@
+import asyncio
+from uuid import uuid4
+
+from psc.configurator.registry import ParameterRegistry
+from psc.simulation import SimulationManager
+from psc.simulation.adaptive import AdaptiveRefiner, Refinement
+from psc.simulation.checkpoints import CheckpointStore
+
+
+def parameters() -> list:
+    registry = ParameterRegistry()
+    return [
+        registry.load({"key": "angle_of_attack", "type": "float", "values": [0.0, 10.0, 20.0]}),
+        registry.load({"key": "speed", "type": "float", "values": [10.0, 20.0]}),
+    ]
+
+
+def refiner(metric) -> AdaptiveRefiner:
+    refiner = AdaptiveRefiner(parameters(), "lift", tolerance=0.01)
+    for angle in (0.0, 10.0, 20.0):
+        for speed in (10.0, 20.0):
+            case = {"angle_of_attack": angle, "speed": speed}
+            refiner.add_result(case, {"lift": metric(angle, speed)})
+    return refiner
+
+
+def test_refine_splits_along_fewer_axes_to_fit_the_limit():
+    # Both axes matter, so a full split of a cell would add five cases
+    cases = refiner(lambda angle, speed: angle**2 * speed).refine(2)
+
+    assert len(cases) == 2
+    assert {case["angle_of_attack"] for case in cases} == {15.0}
+
+
+def test_refine_skips_cells_that_do_not_fit_and_falls_back_to_the_budget():
+    # Only the angle matters: each cell splits into two cases, one per speed
+    lift = refiner(lambda angle, speed: angle**2)
+
+    assert lift.refine(1) == []
+    cases = lift.refine(1, budget=3)
+    assert sorted((case["angle_of_attack"], case["speed"]) for case in cases) == [
+        (15.0, 10.0),
+        (15.0, 20.0),
+    ]
+
+
+def test_adaptive_run_with_checkpoints_seeds_refined_cases(repository, tmp_path):
+    manager = SimulationManager(repository=repository)
+    manager.checkpoints = CheckpointStore(tmp_path)
+    config_id = uuid4()
+
+    asyncio.run(
+        manager.run_simulation(
+            config_id,
+            parameters(),
+            refinement=Refinement(metric="lift_coefficient", budget=4, batch_size=1),
+        )
+    )
+
+    status = asyncio.run(repository.latest_status(config_id))
+    assert (status.state, status.reason) == ("COMPLETED", None)
+    assert status.completed_cases > 6
+    # Refined, off-grid cases are checkpointed and found again
+    assert manager.checkpoints.find(config_id, {"angle_of_attack": 15.0, "speed": 10.0})
@@ -0,0 +1,44 @@
+import asyncio
+import tempfile
+
+from benchmarks import harness
+from benchmarks.bench_status_writes import bench_status_write
+
+
+def results(**medians: float) -> dict:
+    return {
+        "results": [{"name": name, "stats": {"median": median}} for name, median in medians.items()]
+    }
+
+
+def test_compare_flags_regressions_over_threshold():
+    rows = harness.compare(
+        results(fast=1.0, slow=1.0, removed=1.0), results(fast=1.05, slow=1.5), threshold=0.1
+    )
+
+    assert [(row["name"], row["regression"]) for row in rows] == [
+        ("fast", False),
+        ("slow", True),
+    ]
+    assert rows[1]["change"] == 0.5
+
+
+def test_cases_expand_parameter_grid():
+    bench = harness.Benchmark("write", setup=lambda **_: None, params={"a": [1, 2], "b": ["x"]})
+
+    assert bench.cases() == [
+        ("write[a=1,b=x]", {"a": 1, "b": "x"}),
+        ("write[a=2,b=x]", {"a": 2, "b": "x"}),
+    ]
+
+
+def test_sqlite_status_write_removes_its_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    bench = harness.Benchmark("status_write", setup=bench_status_write)
+    stats = asyncio.run(
+        harness._run_case(bench, {"backend": "sqlite", "cases": 10}, min_time=0, rounds=2)
+    )
+
+    assert stats["rounds"] == 2
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,140 @@
+import array
+import asyncio
+import threading
+from uuid import uuid4
+
+from psc.configurator.registry import ParameterRegistry
+from psc.simulation import SimulationManager
+from psc.simulation.checkpoints import CheckpointStore, grid_position
+
+
+def parameters() -> list:
+    registry = ParameterRegistry()
+    return [
+        registry.load({"key": "speed", "type": "float", "values": [30.0, 10.0, 20.0]}),
+        registry.load(
+            {"key": "turbulence_model", "type": "enum", "values": ["k-epsilon", "k-omega"]}
+        ),
+    ]
+
+
+def case(speed: float, model: str = "k-epsilon") -> dict:
+    return {"speed": speed, "turbulence_model": model}
+
+
+def test_fields_round_trip_through_memory_maps(tmp_path):
+    store = CheckpointStore(tmp_path)
+    config_id = uuid4()
+    store.put(
+        config_id,
+        3,
+        case(10.0),
+        {"solution": [1.0, 2.0], "mask": b"\x01\x00", "cells": array.array("i", [7])},
+    )
+
+    checkpoint = store.get(config_id, 3)
+    assert checkpoint.field("solution").tolist() == [1.0, 2.0]
+    assert checkpoint.field("mask").tobytes() == b"\x01\x00"
+    assert checkpoint.field("cells").tolist() == [7]
+    assert store.find(config_id, case(10.0)) is checkpoint
+    assert store.size == 2 * 8 + 2 + 4
+
+
+def test_least_recently_used_checkpoints_are_evicted(tmp_path):
+    store = CheckpointStore(tmp_path, budget=2 * 8 * 2)
+    config_id = uuid4()
+    for index, speed in enumerate((10.0, 20.0)):
+        store.put(config_id, index, case(speed), {"solution": [speed, speed]})
+    store.get(config_id, 0)
+    store.put(config_id, 2, case(30.0), {"solution": [30.0, 30.0]})
+
+    assert store.get(config_id, 1) is None
+    assert not (tmp_path / str(config_id) / "1").exists()
+    assert store.get(config_id, 0) is not None and store.get(config_id, 2) is not None
+
+
+def test_checkpoints_are_indexed_on_load(tmp_path):
+    config_id = uuid4()
+    CheckpointStore(tmp_path).put(config_id, 0, case(20.0), {"solution": [20.0]})
+
+    store = CheckpointStore(tmp_path)
+
+    assert store.find(config_id, case(20.0)).field("solution").tolist() == [20.0]
+    store.discard(config_id)
+    assert store.find(config_id, case(20.0)) is None and store.size == 0
+
+
+def test_nearest_counts_grid_steps_and_respects_fixed_parameters(tmp_path):
+    store = CheckpointStore(tmp_path)
+    config_id = uuid4()
+    store.put(config_id, 0, case(10.0), {"solution": [10.0]})
+    store.put(config_id, 5, case(30.0, "k-omega"), {"solution": [30.0]})
+
+    checkpoint, distance = store.nearest(config_id, parameters(), case(20.0))
+    # One value step, against one value step plus one for the turbulence model
+    assert (checkpoint.case_index, distance) == (0, 1)
+
+    checkpoint, distance = store.nearest(
+        config_id, parameters(), case(20.0, "k-omega"), fixed=["turbulence_model"]
+    )
+    assert (checkpoint.case_index, distance) == (5, 1)
+    assert store.nearest(config_id, parameters(), case(20.0), max_distance=0) is None
+
+
+def test_off_grid_values_are_ranked_between_their_neighbours(tmp_path):
+    store = CheckpointStore(tmp_path)
+    config_id = uuid4()
+    store.put(config_id, 0, case(10.0), {"solution": [10.0]})
+    store.put(config_id, 7, case(27.5), {"solution": [27.5]})
+
+    # Refined cases lie between grid values: 15.0 is half a step from 10.0
+    checkpoint, distance = store.nearest(config_id, parameters(), case(15.0))
+    assert (checkpoint.case_index, distance) == (0, 0.5)
+    checkpoint, distance = store.nearest(config_id, parameters(), case(30.0))
+    assert (checkpoint.case_index, distance) == (7, 0.25)
+
+    assert grid_position([10.0, 20.0, 30.0], 5.0) == -1.0
+    assert grid_position([10.0, 20.0, 30.0], 35.0) == 3.0
+
+
+def test_fixed_parameter_index_follows_puts_and_evictions(tmp_path):
+    store = CheckpointStore(tmp_path, budget=3 * 8)
+    config_id = uuid4()
+    store.put(config_id, 0, case(10.0), {"solution": [10.0]})
+    store.put(config_id, 1, case(20.0, "k-omega"), {"solution": [20.0]})
+
+    def nearest(model: str):
+        found = store.nearest(
+            config_id, parameters(), case(30.0, model), fixed=["turbulence_model"]
+        )
+        return found[0].case_index if found is not None else None
+
+    assert (nearest("k-epsilon"), nearest("k-omega")) == (0, 1)
+    # Checkpoints stored after the index was built are grouped too
+    store.put(config_id, 2, case(30.0, "k-omega"), {"solution": [30.0]})
+    assert nearest("k-omega") == 2
+    # Storing a fourth checkpoint evicts the least recently used, case 0
+    store.put(config_id, 3, case(20.0, "k-omega"), {"solution": [20.0]})
+    assert nearest("k-epsilon") is None
+    store.discard(config_id)
+    assert nearest("k-omega") is None
+
+
+def test_seeds_are_looked_up_off_the_event_loop(tmp_path, repository):
+    manager = SimulationManager(repository=repository)
+    manager.checkpoints = CheckpointStore(tmp_path)
+    config_id = uuid4()
+    manager.checkpoints.put(config_id, 0, case(10.0), {"solution": [10.0]})
+    threads = []
+    nearest = manager.checkpoints.nearest
+
+    def record_thread(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return nearest(*args, **kwargs)
+
+    manager.checkpoints.nearest = record_thread
+
+    seed = asyncio.run(manager._find_seed(config_id, parameters(), case(20.0), set()))
+
+    assert seed.case_index == 0 and seed.field("solution").tolist() == [10.0]
+    assert threads and threads[0] != threading.get_ident()
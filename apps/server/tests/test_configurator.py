@@ -0,0 +1,125 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from psc.configurator.configurator import ParameterSweepConfigurator
+from psc.configurator.errors import ConfigurationExistsError
+from psc.configurator.hashing import compute_parameters_hash
+from psc.configurator.ordering import CaseOrdering
+from psc.configurator.registry import ParameterRegistry
+from psc.models import ParameterSweepConfigurationRequest
+from psc.server import create_config
+from psc.simulation import SimulationManager, demo
+
+
+def speed(values: list) -> dict:
+    return {"key": "speed", "type": "float", "values": values}
+
+
+def angle(values: list) -> dict:
+    return {"key": "angle_of_attack", "type": "float", "values": values}
+
+
+def load(*parameters: dict) -> list:
+    registry = ParameterRegistry()
+    return [registry.load(param) for param in parameters]
+
+
+def test_hash_normalizes_value_types():
+    assert compute_parameters_hash([speed([10, 20])]) == compute_parameters_hash(
+        [speed([10.0, 20.0])]
+    )
+
+
+def test_hash_depends_on_value_and_parameter_order():
+    assert compute_parameters_hash([speed([0, 10])]) != compute_parameters_hash([speed([10, 0])])
+    assert compute_parameters_hash([speed([1]), angle([2])]) != compute_parameters_hash(
+        [angle([2]), speed([1])]
+    )
+
+
+def test_create_rejects_identical_configuration():
+    async def create(name: str, values: list) -> ParameterSweepConfigurator:
+        return await ParameterSweepConfigurator.create(name, "", load(speed(values)))
+
+    async def scenario():
+        first = await create("first", [0, 10])
+        with pytest.raises(ConfigurationExistsError) as error:
+            await create("second", [0.0, 10.0])
+        assert error.value.id == first.id
+
+        # Reordered values are a different sweep
+        reordered = await create("reordered", [10, 0])
+        assert reordered.id != first.id
+
+    asyncio.run(scenario())
+
+
+def test_create_endpoint_returns_conflict_for_duplicate():
+    request = ParameterSweepConfigurationRequest(
+        name="wing", description="", parameters=[speed([10, 20])]
+    )
+
+    async def scenario():
+        created = await create_config(request, mode="sync")
+        with pytest.raises(HTTPException) as error:
+            await create_config(request, mode="sync")
+        assert error.value.status_code == 409
+        assert error.value.headers["Location"] == f"/configs/{created.id}"
+
+    asyncio.run(scenario())
+
+
+def test_ordering_is_part_of_the_identity(repository, monkeypatch):
+    monkeypatch.setattr(demo, "SIMULATION_WORKERS", 1)
+    parameters = [angle([0, 5]), speed([10, 20])]
+
+    def request(ordering: str) -> ParameterSweepConfigurationRequest:
+        return ParameterSweepConfigurationRequest(
+            name="wing", description="", parameters=parameters, ordering=ordering
+        )
+
+    async def scenario() -> ParameterSweepConfigurator:
+        cartesian = await create_config(request("cartesian"), mode="sync")
+        gray = await create_config(request("gray"), mode="sync")
+        assert gray.id != cartesian.id
+
+        configurator = await ParameterSweepConfigurator.load(gray.id)
+        await SimulationManager(repository=repository).run_simulation(
+            configurator.id,
+            configurator.parameters,
+            configurator.parameters_hash,
+            configurator.ordering,
+        )
+        return configurator
+
+    configurator = asyncio.run(scenario())
+
+    assert configurator.ordering is CaseOrdering.GRAY
+    # (0, 10), (0, 20), (5, 20), (5, 10): one step in one parameter at a time
+    assert [case_run.case_index for case_run in repository._case_runs] == [0, 1, 3, 2]
+
+
+def test_same_parameters_in_another_ordering_run_concurrently(repository):
+    parameters = load(angle([0, 5]), speed([10, 20]))
+    parameters_hash = compute_parameters_hash(parameters)
+    cartesian, gray, duplicate = uuid4(), uuid4(), uuid4()
+    manager = SimulationManager(repository=repository)
+
+    async def scenario() -> tuple[bool, bool, bool]:
+        manager.start_simulation(cartesian, parameters, parameters_hash)
+        gray_running = manager.is_running(gray, parameters_hash, CaseOrdering.GRAY)
+        manager.start_simulation(gray, parameters, parameters_hash, CaseOrdering.GRAY)
+        manager.start_simulation(duplicate, parameters, parameters_hash)
+        running = gray in manager._running_tasks, duplicate in manager._running_tasks
+        await asyncio.gather(*manager._running_tasks.values())
+        return gray_running, *running
+
+    gray_running, gray_started, duplicate_started = asyncio.run(scenario())
+
+    assert not gray_running and gray_started
+    # An identical sweep in the same ordering is not simulated twice
+    assert not duplicate_started
+    assert {case_run.config_id for case_run in repository._case_runs} == {cartesian, gray}
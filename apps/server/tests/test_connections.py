@@ -0,0 +1,76 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from psc.simulation import SimulationManager
+from psc.simulation.connections import WS_IDLE_TIMEOUT, ConnectionLimitError, ConnectionRegistry
+from psc.simulation.demo import HEARTBEAT_MESSAGE, WS_CLOSE_GOING_AWAY
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages: list[str] = []
+        self.close_code: int | None = None
+
+    async def send_text(self, message: str) -> None:
+        self.messages.append(message)
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.close_code = code
+
+
+def test_per_config_and_total_limits():
+    registry = ConnectionRegistry(max_connections=3, max_per_config=2, shards=4)
+    first, second = uuid4(), uuid4()
+    registry.add(first, FakeWebSocket())
+    registry.add(first, FakeWebSocket())
+
+    with pytest.raises(ConnectionLimitError) as error:
+        registry.add(first, FakeWebSocket())
+    assert error.value.config_id == first
+
+    registry.add(second, FakeWebSocket())
+    with pytest.raises(ConnectionLimitError) as error:
+        registry.add(second, FakeWebSocket())
+    assert (error.value.limit, error.value.config_id) == (3, None)
+
+
+def test_remove_frees_the_slot_and_empty_configs():
+    registry = ConnectionRegistry(max_connections=0, max_per_config=1)
+    config_id, websocket = uuid4(), FakeWebSocket()
+    registry.add(config_id, websocket)
+
+    assert registry.remove(websocket).config_id == config_id
+    assert registry.listeners(config_id) == [] and len(registry) == 0
+    registry.add(config_id, FakeWebSocket())
+
+
+def test_adding_a_registered_socket_again_is_a_no_op():
+    registry = ConnectionRegistry(max_connections=1)
+    config_id, websocket = uuid4(), FakeWebSocket()
+
+    assert registry.add(config_id, websocket) is registry.add(config_id, websocket)
+    assert len(registry) == 1
+
+
+def test_heartbeat_reaps_idle_connections():
+    manager = SimulationManager(ConnectionRegistry(shards=1))
+    config_id = uuid4()
+    live, idle, quiet = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    for websocket in (live, idle):
+        manager.add_connection(config_id, websocket)
+    # Subscribers without heartbeats (SSE streams) are never reaped
+    manager.add_connection(config_id, quiet, heartbeat=False)
+    for websocket in (idle, quiet):
+        manager.connections.get(websocket).last_seen -= WS_IDLE_TIMEOUT + 1
+
+    asyncio.run(manager._heartbeat_shard(0))
+
+    assert live.messages == [HEARTBEAT_MESSAGE]
+    assert idle.close_code == WS_CLOSE_GOING_AWAY
+    assert quiet.messages == [] and quiet.close_code is None
+    assert {connection.websocket for connection in manager.connections.listeners(config_id)} == {
+        live,
+        quiet,
+    }
@@ -0,0 +1,65 @@
+import math
+
+import pytest
+
+from psc.simulation.estimator import RunEstimate, RuntimeModel, pack_batches
+
+
+def duration(case: dict) -> float:
+    return 0.5 * case["speed"] * (3.0 if case["model"] == "k-omega" else 1.0)
+
+
+def samples() -> list[tuple[dict, float]]:
+    cases = [
+        {"speed": speed, "model": model}
+        for speed in (10.0, 20.0, 40.0)
+        for model in ("k-epsilon", "k-omega")
+    ]
+    return [(case, duration(case)) for case in cases]
+
+
+def test_fit_recovers_multiplicative_effects():
+    model = RuntimeModel.fit(samples())
+
+    assert model.samples == 6
+    for case, seconds in samples():
+        assert model.predict(case) == pytest.approx(seconds)
+
+
+def test_unseen_values_are_interpolated_or_ignored():
+    model = RuntimeModel.fit(samples())
+    low = model.predict({"speed": 10.0, "model": "k-epsilon"})
+    high = model.predict({"speed": 20.0, "model": "k-epsilon"})
+
+    assert model.predict({"speed": 15.0, "model": "k-epsilon"}) == pytest.approx(
+        math.sqrt(low * high)
+    )
+    assert model.predict({"speed": 80.0, "model": "k-epsilon"}) == pytest.approx(20.0)
+    assert model.predict({"speed": 10.0, "model": "laminar"}) == pytest.approx(
+        math.exp(model.intercept + model._effect("speed", 10.0))
+    )
+
+
+def test_unfitted_model_predicts_the_default():
+    assert RuntimeModel.fit([], default_seconds=2.0).predict({"speed": 1.0}) == pytest.approx(2.0)
+
+
+def test_pack_batches_balances_costs():
+    costs = {0: 8.0, 1: 7.0, 2: 6.0, 3: 5.0, 4: 4.0}
+
+    batches = pack_batches(costs, workers=2)
+
+    assert batches == [[0, 3, 4], [1, 2]]
+    assert sorted(sum(costs[index] for index in batch) for batch in batches) == [13.0, 17.0]
+    assert pack_batches({0: 1.0}, workers=4) == [[0]]
+
+
+def test_run_estimate_is_corrected_by_actual_durations():
+    costs = {0: 2.0, 1: 2.0, 2: 4.0}
+    estimate = RunEstimate([[2], [0, 1]], costs)
+    estimate.start(1, 0)
+    estimate.finish(1, 0, duration=4.0)
+
+    assert estimate.correction == 2.0
+    # Worker 0 still has its 4 second case, worker 1 one 2 second case, both twice as slow
+    assert estimate.eta() == pytest.approx(8.0)
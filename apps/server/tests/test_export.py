@@ -0,0 +1,66 @@
+import ast
+import json
+import struct
+
+from psc.configurator.export import CaseFormat, export_cases, npy_size
+from psc.configurator.registry import ParameterRegistry
+
+
+def parameters() -> list:
+    registry = ParameterRegistry()
+    return [
+        registry.load({"key": "speed", "type": "float", "values": [10.0, 20.0]}),
+        registry.load({"key": "angle_of_attack", "type": "float", "values": [0.0, 5.0, 7.5]}),
+        registry.load({"key": "turbulence_model", "type": "enum", "values": ["k-omega", 'a,"b"']}),
+    ]
+
+
+def export(format: CaseFormat, start: int = 0, stop: int | None = None) -> bytes:
+    return b"".join(export_cases(parameters(), format, start, stop))
+
+
+def test_csv_slices_are_quoted_and_chunked():
+    chunks = list(export_cases(parameters(), CaseFormat.CSV, 2, 5, chunk_cases=2))
+
+    assert len(chunks) == 3
+    assert b"".join(chunks).decode().split("\r\n") == [
+        "index,speed,angle_of_attack,turbulence_model",
+        "2,10.0,5.0,k-omega",
+        '3,10.0,5.0,"a,""b"""',
+        "4,10.0,7.5,k-omega",
+        "",
+    ]
+
+
+def test_ndjson_rows_match_the_full_export():
+    rows = [json.loads(line) for line in export(CaseFormat.NDJSON).splitlines()]
+    sliced = [json.loads(line) for line in export(CaseFormat.NDJSON, 10, 100).splitlines()]
+
+    assert len(rows) == 12
+    assert rows[11] == {
+        "index": 11,
+        "speed": 20.0,
+        "angle_of_attack": 7.5,
+        "turbulence_model": 'a,"b"',
+    }
+    assert sliced == rows[10:]
+    assert export(CaseFormat.NDJSON, 5, 3) == b""
+
+
+def test_npy_header_and_rows():
+    data = export(CaseFormat.NPY, 1, 4)
+    (length,) = struct.unpack("<H", data[8:10])
+    header = ast.literal_eval(data[10 : 10 + length].decode("latin-1"))
+    rows = data[10 + length :]
+
+    assert data[:8] == b"\x93NUMPY\x01\x00" and (10 + length) % 64 == 0
+    assert header["shape"] == (3,)
+    assert header["descr"] == [
+        ("index", "<i8"),
+        ("speed", "<f8"),
+        ("angle_of_attack", "<f8"),
+        ("turbulence_model", "<U7"),
+    ]
+    assert len(data) == npy_size(parameters(), 3) and len(rows) == 3 * (24 + 28)
+    assert struct.unpack("<qdd", rows[:24]) == (1, 10.0, 0.0)
+    assert rows[24:52].decode("utf-32-le") == 'a,"b"\0\0'
@@ -0,0 +1,98 @@
+import asyncio
+import json
+from uuid import uuid4
+
+from psc.simulation import SimulationManager
+from psc.simulation.connections import ConnectionRegistry
+from psc.simulation.history import HistoryStore, ProgressEvent, ProgressHistory
+from psc.simulation.sse import EventStreamSubscriber, format_event
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages: list[dict] = []
+
+    async def send_text(self, message: str) -> None:
+        self.messages.append(json.loads(message))
+
+
+def history_with(count: int, maxlen: int = 128) -> ProgressHistory:
+    history = ProgressHistory(maxlen=maxlen)
+    for _ in range(count):
+        seq = history.next_seq()
+        history.append(ProgressEvent(seq=seq, status={"seq": seq}))
+    return history
+
+
+def test_since_returns_missed_events():
+    history = history_with(5)
+
+    assert [event.seq for event in history.since(2)] == [3, 4, 5]
+    assert history.since(5) == []
+
+
+def test_since_requires_snapshot_when_events_are_evicted_or_seq_is_stale():
+    assert history_with(10, maxlen=4).since(2) is None
+    # A sequence number from before an eviction or restart
+    assert history_with(3).since(40) is None
+
+
+def test_store_evicts_least_recently_updated_history():
+    store = HistoryStore(max_configs=2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    store.get_or_create(first)
+    store.get_or_create(second)
+    store.get_or_create(first)
+    store.get_or_create(third)
+
+    assert store.get(second) is None
+    assert store.get(first) is not None
+
+
+def subscribe(manager: SimulationManager, config_id, last_seq: int | None) -> list[dict]:
+    websocket = FakeWebSocket()
+    asyncio.run(manager.subscribe(config_id, websocket, last_seq=last_seq, heartbeat=False))
+    manager.remove_connection(config_id, websocket)
+    return websocket.messages
+
+
+def test_resume_sends_only_missed_updates():
+    manager = SimulationManager(ConnectionRegistry())
+    config_id = uuid4()
+    for progress in (10, 20, 30):
+        asyncio.run(manager.broadcast_status(config_id, {"progress": progress, "state": "RUNNING"}))
+
+    assert [message["seq"] for message in subscribe(manager, config_id, last_seq=1)] == [2, 3]
+    assert subscribe(manager, config_id, last_seq=3) == []
+
+
+def test_stale_resume_gets_a_snapshot():
+    manager = SimulationManager(ConnectionRegistry())
+    config_id = uuid4()
+    asyncio.run(manager.broadcast_status(config_id, {"progress": 10, "state": "RUNNING"}))
+
+    # The client last saw seq 7 from a history that has since been evicted
+    assert subscribe(manager, config_id, last_seq=7) == [
+        {"progress": 10, "state": "RUNNING", "seq": 1}
+    ]
+
+
+def test_sse_subscriber_queues_formatted_events():
+    subscriber = EventStreamSubscriber()
+
+    async def stream() -> list[str]:
+        await subscriber.send_text('{"seq": 4, "progress": 40}')
+        await subscriber.close()
+        return [event async for event in subscriber.events()]
+
+    assert asyncio.run(stream()) == ['id: 4\nevent: status\ndata: {"seq": 4, "progress": 40}\n\n']
+    assert not hasattr(subscriber, "send_bytes")
+
+
+def test_format_event_parses_a_broadcast_message_once():
+    format_event.cache_clear()
+    message = json.dumps({"seq": 9})
+    for _ in range(3):
+        format_event(message)
+
+    assert format_event.cache_info().misses == 1
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from psc import lifecycle as lifecycle_module
+from psc.lifecycle import Lifecycle, Phase
+from psc.server import readiness_check
+from psc.simulation import SimulationManager
+from psc.storage import MemoryRepository, set_repository
+
+
+class UnreachableRepository(MemoryRepository):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    async def start(self, warm_connections: int = 0) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database is unreachable")
+
+
+@pytest.fixture
+def manager(monkeypatch) -> SimulationManager:
+    manager = SimulationManager()
+    monkeypatch.setattr(lifecycle_module, "simulation_manager", manager)
+    monkeypatch.setattr(lifecycle_module, "RATE_LIMIT_ENABLED", False)
+    return manager
+
+
+def test_startup_opens_storage_and_becomes_ready(manager):
+    lifecycle = Lifecycle()
+
+    asyncio.run(lifecycle.startup(FastAPI()))
+
+    assert lifecycle.phase is Phase.READY
+    assert {"precompute", "storage"} <= set(lifecycle.stages)
+
+
+def test_warmup_is_retried_until_the_database_is_reachable(monkeypatch):
+    monkeypatch.setattr(lifecycle_module, "STARTUP_RETRY_SECONDS", 0.01)
+    repository = UnreachableRepository(failures=2)
+    set_repository(repository)
+    lifecycle = Lifecycle()
+
+    asyncio.run(lifecycle._warm_until_ready())
+
+    assert lifecycle.phase is Phase.READY and repository.failures == 0
+
+
+def test_shutdown_drains_the_manager_and_stops(manager):
+    lifecycle = Lifecycle()
+
+    async def scenario() -> None:
+        await lifecycle.startup(FastAPI())
+        await lifecycle.shutdown(timeout=1.0)
+
+    asyncio.run(scenario())
+
+    assert manager.draining
+    assert lifecycle.phase is Phase.STOPPED
+
+
+def test_readiness_fails_unless_ready(monkeypatch):
+    lifecycle = Lifecycle()
+    monkeypatch.setattr("psc.server.lifecycle", lifecycle)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(readiness_check())
+    assert (error.value.status_code, error.value.detail) == (503, "Server is starting")
+
+    lifecycle.phase = Phase.READY
+    assert asyncio.run(readiness_check()).status == "ready"
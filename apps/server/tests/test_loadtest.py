@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+import pytest
+
+from loadtest.harness import LoadTest, LoadTestConfig, Watcher, summarize
+
+
+def test_config_rejects_unknown_settings(tmp_path):
+    path = tmp_path / "loadtest.toml"
+    path.write_text("configs = 3\nwatcher = 5\n")
+
+    with pytest.raises(ValueError, match="watcher"):
+        LoadTestConfig.from_file(path)
+
+
+def test_parameter_sets_are_seeded_and_unique_per_index():
+    first, second = LoadTest(LoadTestConfig(seed=7)), LoadTest(LoadTestConfig(seed=7))
+
+    sets = [first.parameters(index) for index in range(5)]
+    assert sets == [second.parameters(index) for index in range(5)]
+    assert len({json.dumps(parameters) for parameters in sets}) == 5
+
+
+def test_summarize_uses_nearest_rank_percentiles():
+    summary = summarize([float(value) for value in range(1, 101)])
+
+    assert (summary["p50"], summary["p90"], summary["p99"], summary["max"]) == (50, 90, 99, 100)
+    assert summarize([]) is None
+
+
+def test_watcher_counts_gaps_in_seq_as_dropped():
+    watcher = Watcher(config_id="c")
+    for seq in (3, 4, 7):
+        status = {"seq": seq, "progress": seq, "created_at": "2026-01-01T00:00:00+00:00"}
+        assert watcher.receive(json.dumps(status)) is False
+    assert watcher.receive('{"type": "heartbeat"}') is True
+
+    assert (watcher.messages, watcher.expected, watcher.dropped) == (3, 5, 2)
+
+
+def test_rerun_reuses_conflicting_configuration():
+    load_test = LoadTest(LoadTestConfig())
+
+    async def request(method, path, body=None):
+        return 409, {"detail": "exists"}, 0.01, {"Location": "/configs/existing-id"}
+
+    load_test.request = request
+
+    assert asyncio.run(load_test.create_config(0)) == (409, "existing-id", 0.01)
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from psc import instrumentation, metrics
+from psc.server import get_metrics, get_profile
+
+
+def test_render_labelled_counter_and_gauge():
+    registry = metrics.MetricsRegistry()
+    requests = metrics.Counter("test_render_requests_total", "Requests", ("route",))
+    connections = metrics.Gauge("test_render_connections", "Open connections")
+    registry.register(requests)
+    registry.register(connections)
+
+    requests.labels('/configs/"x"').inc()
+    requests.labels('/configs/"x"').inc(2)
+    connections.set_function(lambda: 3)
+
+    assert metrics.render(registry).splitlines() == [
+        "# HELP test_render_requests_total Requests",
+        "# TYPE test_render_requests_total counter",
+        'test_render_requests_total{route="/configs/\\"x\\""} 3',
+        "# HELP test_render_connections Open connections",
+        "# TYPE test_render_connections gauge",
+        "test_render_connections 3",
+    ]
+
+
+def test_render_histogram_buckets_are_cumulative():
+    registry = metrics.MetricsRegistry()
+    latency = metrics.Histogram("test_render_latency_seconds", "Latency", buckets=(0.1, 1.0))
+    registry.register(latency)
+
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.observe(value)
+
+    assert metrics.render(registry).splitlines()[2:] == [
+        'test_render_latency_seconds_bucket{le="0.1"} 1',
+        'test_render_latency_seconds_bucket{le="1.0"} 3',
+        'test_render_latency_seconds_bucket{le="+Inf"} 4',
+        "test_render_latency_seconds_sum 6.05",
+        "test_render_latency_seconds_count 4",
+    ]
+
+
+def test_labels_requires_every_label_value():
+    counter = metrics.Counter("test_labels_total", "Labelled", ("method", "route"))
+    with pytest.raises(ValueError):
+        counter.labels("GET")
+
+
+def test_duplicate_metric_names_are_rejected():
+    metrics.Counter("test_duplicate_total", "First")
+    with pytest.raises(ValueError):
+        metrics.Counter("test_duplicate_total", "Second")
+
+
+def test_disabled_metrics_and_profiles_are_not_found(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_metrics())
+    assert error.value.status_code == 404
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_profile("run-profile.collapsed"))
+    assert error.value.status_code == 404
+    assert error.value.detail == "Profiling is disabled"
+
+
+@pytest.mark.parametrize(("platform", "expected"), [("linux", 2048 * 1024), ("darwin", 2048)])
+def test_peak_memory_fallback_is_in_bytes(monkeypatch, platform, expected):
+    def unavailable(*args):
+        raise OSError
+
+    monkeypatch.setattr("builtins.open", unavailable)
+    monkeypatch.setattr(instrumentation.sys, "platform", platform)
+    monkeypatch.setattr(
+        instrumentation.resource,
+        "getrusage",
+        lambda who: type("Usage", (), {"ru_maxrss": 2048})(),
+    )
+
+    assert instrumentation._resident_memory_bytes() == expected
@@ -0,0 +1,86 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from psc.configurator.registry import ParameterRegistry
+from psc.simulation import SimulationManager
+from psc.simulation.policies import RunStopped, StopMonitor, StopPolicy
+from psc.simulation.runs import CaseResult
+
+
+def observe(policy: StopPolicy, results: list[CaseResult]) -> RunStopped | None:
+    monitor = StopMonitor(policy)
+    try:
+        for result in results:
+            monitor.observe(result)
+    except RunStopped as stopped:
+        return stopped
+    return None
+
+
+def failed(index: int) -> CaseResult:
+    return CaseResult(index=index, duration=1.0, state="FAILED")
+
+
+def completed(index: int, **metrics: float) -> CaseResult:
+    return CaseResult(index=index, duration=1.0, metrics=metrics)
+
+
+def test_consecutive_failures_fail_the_run():
+    policy = StopPolicy(max_consecutive_failures=2)
+
+    assert observe(policy, [failed(0), completed(1), failed(2)]) is None
+    stopped = observe(policy, [failed(0), failed(1)])
+    assert (stopped.state, stopped.reason) == ("FAILED", "2 consecutive cases failed")
+
+
+def test_failure_rate_waits_for_min_cases():
+    policy = StopPolicy(max_failure_rate=0.5, min_cases=4)
+
+    assert observe(policy, [failed(0), failed(1), completed(2)]) is None
+    stopped = observe(policy, [failed(0), failed(1), completed(2), failed(3)])
+    assert stopped.reason == "3 of 4 cases failed, over the maximum failure rate of 50%"
+
+
+def test_target_metric_stops_the_run():
+    below = StopPolicy(target_metric="drag", target_value=0.1, target_mode="below")
+
+    assert observe(below, [completed(0, drag=0.2)]) is None
+    stopped = observe(below, [completed(0, drag=0.2), completed(1, drag=0.05)])
+    assert (stopped.state, stopped.reason) == ("STOPPED", "drag reached 0.05 at case 1")
+
+
+def test_cpu_budget_sums_case_durations():
+    stopped = observe(StopPolicy(max_cpu_seconds=2.5), [completed(index) for index in range(3)])
+
+    assert stopped.reason == "CPU budget of 2.5s spent"
+
+
+def test_wall_clock_budget():
+    monitor = StopMonitor(StopPolicy(max_wall_seconds=10))
+    monitor.check_budget()
+    monitor.started -= 10
+
+    with pytest.raises(RunStopped, match="Wall-clock budget of 10s spent"):
+        monitor.check_budget()
+
+
+def test_run_ends_with_the_policy_state_and_reason(repository):
+    registry = ParameterRegistry()
+    parameters = [
+        registry.load({"key": "angle_of_attack", "type": "float", "values": [0.0, 10.0]}),
+        registry.load({"key": "speed", "type": "float", "values": [10.0, 20.0, 30.0]}),
+    ]
+    config_id = uuid4()
+    policy = StopPolicy(target_metric="lift_coefficient", target_value=1.0)
+
+    asyncio.run(
+        SimulationManager(repository=repository).run_simulation(
+            config_id, parameters, stop_policy=policy
+        )
+    )
+
+    status = asyncio.run(repository.latest_status(config_id))
+    assert status.state == "STOPPED"
+    assert status.reason.startswith("lift_coefficient reached ")
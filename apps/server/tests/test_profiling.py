@@ -0,0 +1,123 @@
+import asyncio
+import pstats
+import time
+from uuid import uuid4
+
+import pytest
+
+from psc import profiling
+from psc.configurator.registry import ParameterRegistry
+from psc.simulation import demo
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    return tmp_path
+
+
+async def respond(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def call(scope: dict) -> list[dict]:
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def receive():
+        return {"type": "http.request"}
+
+    asyncio.run(profiling.ProfilingMiddleware(respond)(scope, receive, send))
+    return messages
+
+
+def http_scope(query_string: bytes = b"", headers: list | None = None) -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/configs",
+        "query_string": query_string,
+        "headers": headers or [],
+    }
+
+
+def test_opted_in_request_is_profiled(profile_dir):
+    start, _ = call(http_scope(b"limit=10&profile=request"))
+
+    name = dict(start["headers"])[b"x-psc-profile"].decode()
+    assert name.startswith("request-GET-") and name.endswith(".pstats")
+    assert profiling.get_profile_path(name) == profile_dir / name
+    pstats.Stats(str(profile_dir / name))
+    assert [profile["name"] for profile in profiling.list_profiles()] == [name]
+
+
+def test_other_requests_are_not_profiled(profile_dir):
+    start, _ = call(http_scope(b"profile=requests"))
+
+    assert start["headers"] == []
+    assert profiling.list_profiles() == []
+
+
+def test_profile_header_opts_in(profile_dir):
+    start, _ = call(http_scope(headers=[(b"x-psc-profile", b"1")]))
+
+    assert b"x-psc-profile" in dict(start["headers"])
+
+
+def test_profile_path_stays_in_profile_directory(profile_dir):
+    (profile_dir / "run.collapsed").write_text("")
+
+    assert profiling.get_profile_path("run.collapsed") == profile_dir / "run.collapsed"
+    for name in ("../run.collapsed", ".hidden", "missing.pstats"):
+        assert profiling.get_profile_path(name) is None
+
+
+@profiling.register_entrypoint
+def busy(config_id, seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_run_profiler_keeps_only_the_runs_samples(profile_dir):
+    config_id = uuid4()
+    with profiling.RunProfiler(config_id, interval=0.001) as profiler:
+        busy(uuid4(), 0.05)
+        busy(config_id, 0.05)
+
+    assert profiler.samples
+    assert all(";busy (test_profiling.py:" in stack for stack in profiler.samples)
+    assert profiler.path.parent == profile_dir
+    assert profiler.path.read_text().splitlines()[0].rsplit(" ", 1)[0] in profiler.samples
+
+
+def test_run_profiler_keeps_the_batch_samples_of_a_real_run(profile_dir, monkeypatch, repository):
+    registry = ParameterRegistry()
+    parameters = [registry.load({"key": "speed", "type": "float", "values": [10.0, 20.0]})]
+    config_id = uuid4()
+    metrics = demo.demo_metrics
+
+    def slow_metrics(case: dict) -> dict:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return metrics(case)
+
+    monkeypatch.setattr(demo, "demo_metrics", slow_metrics)
+    manager = demo.SimulationManager(repository=repository)
+
+    async def scenario():
+        with profiling.RunProfiler(config_id, interval=0.001) as profiler:
+            await manager.run_simulation(config_id, parameters)
+        return profiler
+
+    profiler = asyncio.run(scenario())
+
+    # Batches run as their own tasks, so `run_simulation` is not on their stacks
+    assert any(
+        ";_run_batch (demo.py:" in stack and ";execute_case (demo.py:" in stack
+        for stack in profiler.samples
+    )
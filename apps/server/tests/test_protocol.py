@@ -0,0 +1,84 @@
+import pytest
+
+from psc.simulation import protocol
+from psc.simulation.protocol import ProgressEncoder, RunProgress, decode_frame
+
+
+def test_negotiates_only_the_offered_subprotocol():
+    assert protocol.negotiate_subprotocol(["json", protocol.SUBPROTOCOL]) == protocol.SUBPROTOCOL
+    assert protocol.negotiate_subprotocol(["json"]) is None
+
+
+@pytest.mark.parametrize("value", [0, 1, -1, 127, 128, -300, 2**40])
+def test_svarint_round_trip(value):
+    out = bytearray()
+    protocol._svarint(value, out)
+
+    assert protocol._read_svarint(bytes(out), 0) == (value, len(out))
+
+
+def test_snapshot_round_trip():
+    run = RunProgress(total_cases=20)
+    run.update(1, progress=10, state="RUNNING", new_cases=[0, 1, 2, 7])
+    run.update(2, progress=25, state="RUNNING", new_cases=range(10, 20))
+
+    assert decode_frame(run.snapshot_frame()) == {
+        "type": "snapshot",
+        "seq": 2,
+        "state": "RUNNING",
+        "progress": 25,
+        "total_cases": 20,
+        "completed_count": 14,
+        "cases": [0, 1, 2, 7, *range(10, 20)],
+    }
+
+
+def test_delta_counts_only_newly_completed_cases():
+    run = RunProgress(total_cases=10)
+    run.update(1, progress=50, state="RUNNING", new_cases=range(5))
+    run.update(2, progress=40, state="FAILED", new_cases=[3, 4, 5])
+
+    assert decode_frame(run.delta_frame()) == {
+        "type": "delta",
+        "seq": 2,
+        "state": "FAILED",
+        "d_progress": -10,
+        "d_completed": 1,
+        "cases": [3, 4, 5],
+    }
+
+
+def test_scattered_cases_use_the_smaller_bitmap_encoding():
+    cases = list(range(100, 400, 2))
+    run = RunProgress(total_cases=400)
+    run.update(1, progress=1, state="RUNNING", new_cases=cases)
+
+    frame = run.delta_frame()
+    # 150 ranges would take two bytes each; the bitmap spans 300 indices in 38 bytes
+    assert len(frame) < 50
+    assert decode_frame(frame)["cases"] == cases
+
+
+def test_encoder_sends_deltas_in_sync_and_snapshots_otherwise():
+    run = RunProgress(total_cases=8)
+    encoder = ProgressEncoder(snapshot_interval=2)
+
+    kinds = []
+    for seq in (1, 2, 3, 4, 6):
+        run.update(seq, progress=seq * 10, state="RUNNING", new_cases=[seq])
+        kinds.append(decode_frame(encoder.encode(run))["type"])
+
+    # First frame, then deltas until the interval, then a snapshot after the gap at 5
+    assert kinds == ["snapshot", "delta", "delta", "snapshot", "snapshot"]
+
+
+def test_frames_are_encoded_once_per_sequence_number():
+    run = RunProgress(total_cases=4)
+    run.update(1, progress=25, state="RUNNING", new_cases=[0])
+    first, second = ProgressEncoder(), ProgressEncoder()
+
+    assert first.encode(run) is second.encode(run)
+
+
+def test_heartbeat_frame():
+    assert decode_frame(protocol.HEARTBEAT_FRAME) == {"type": "heartbeat"}
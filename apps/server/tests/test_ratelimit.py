@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import pytest
+
+from psc.ratelimit import (
+    LIMITS,
+    Limit,
+    LoadShedder,
+    MemoryBucketStore,
+    RateLimitMiddleware,
+    SQLiteBucketStore,
+    route_class,
+)
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def create(client: str = "10.0.0.1") -> dict:
+    return {"type": "http", "method": "POST", "path": "/configs", "client": (client, 1234)}
+
+
+def call(middleware: RateLimitMiddleware, scope: dict) -> tuple[int, dict, dict]:
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, None, send))
+    start, body = messages
+    return start["status"], dict(start["headers"]), json.loads(body["body"] or b"{}")
+
+
+def test_limit_parse_and_take():
+    limit = Limit.parse("2/10")
+
+    assert (limit.rate, limit.burst) == (0.2, 2)
+    assert limit.take(2, 0) == (1, 0.0)
+    assert limit.take(0.5, 0) == (0.5, pytest.approx(2.5))
+    # Refilling never overflows the burst
+    assert limit.take(1, 100) == (1, 0.0)
+    for value in ("10", "ten/60", "0/60"):
+        with pytest.raises(ValueError, match="Invalid rate limit"):
+            Limit.parse(value)
+
+
+def test_route_classes():
+    assert route_class(create()) == "create"
+    assert route_class({"type": "http", "method": "POST", "path": "/configs/run/1"}) == "run"
+    assert route_class({"type": "websocket", "path": "/ws/configs/1"}) == "subscribe"
+    assert route_class({"type": "http", "method": "GET", "path": "/configs"}) is None
+
+
+def test_clients_over_the_limit_get_429(monkeypatch):
+    monkeypatch.setitem(LIMITS, "create", Limit.parse("1/60"))
+    middleware = RateLimitMiddleware(app, MemoryBucketStore(), LoadShedder(loop_lag=0))
+
+    assert call(middleware, create())[0] == 201
+    status, headers, body = call(middleware, create())
+    assert (status, headers[b"retry-after"], body) == (
+        429,
+        b"60",
+        {"detail": "Rate limit exceeded"},
+    )
+    # Buckets are per client
+    assert call(middleware, create("10.0.0.2"))[0] == 201
+
+
+def test_shed_requests_keep_their_token(monkeypatch):
+    monkeypatch.setitem(LIMITS, "create", Limit.parse("1/60"))
+    shedder = LoadShedder(max_concurrent=1, loop_lag=0)
+    middleware = RateLimitMiddleware(app, MemoryBucketStore(), shedder)
+
+    shedder.in_flight = 1
+    status, _, body = call(middleware, create())
+    assert (status, body) == (503, {"detail": "Server is overloaded"})
+
+    shedder.in_flight = 0
+    assert call(middleware, create())[0] == 201
+    assert shedder.in_flight == 0
+
+
+def test_sqlite_buckets_are_shared(tmp_path):
+    limit = Limit.parse("1/60")
+    first = SQLiteBucketStore(tmp_path / "buckets.sqlite3", ttl=60)
+    second = SQLiteBucketStore(tmp_path / "buckets.sqlite3", ttl=60)
+
+    async def scenario():
+        waits = [await first.take("create:a", limit), await second.take("create:a", limit)]
+        await asyncio.gather(first.close(), second.close())
+        return waits
+
+    taken, wait = asyncio.run(scenario())
+    assert taken == 0.0 and wait == pytest.approx(60, abs=1)
@@ -0,0 +1,36 @@
+from uuid import uuid4
+
+from psc.configurator.registry import ParameterRegistry
+from psc.simulation.runs import CaseResult, RunState
+
+
+def parameters(values: int) -> list:
+    registry = ParameterRegistry()
+    return [
+        registry.load(
+            {"key": "speed", "type": "float", "values": [float(v) for v in range(values)]}
+        ),
+        registry.load(
+            {"key": "angle_of_attack", "type": "float", "values": [float(v) for v in range(values)]}
+        ),
+    ]
+
+
+def test_grid_cases_are_computed_on_demand():
+    # 10^12 cases, which could never be held in memory
+    run = RunState(uuid4(), parameters(1_000_000), None, planned_cases=10**12)
+
+    assert run.case_count == 10**12
+    assert run.case(10**12 - 1) == {"speed": 999_999.0, "angle_of_attack": 999_999.0}
+    assert run.case(1_000_001) == {"speed": 1.0, "angle_of_attack": 1.0}
+
+
+def test_refined_cases_are_numbered_after_the_grid():
+    run = RunState(uuid4(), parameters(2), None, planned_cases=6)
+
+    indices = run.add_cases([{"speed": 0.5, "angle_of_attack": 0.5}])
+    run.record([CaseResult(index, 1.0) for index in (3, *indices)])
+
+    assert indices == [4] and run.case_count == 5
+    assert run.case(4) == {"speed": 0.5, "angle_of_attack": 0.5}
+    assert [result.index for result in run.unreported] == [3, 4] and run.completed == 2
@@ -0,0 +1,244 @@
+import asyncio
+import os
+import sqlite3
+from uuid import uuid4
+
+import pytest
+
+from psc.storage import (
+    CaseRunRecord,
+    ConfigRecord,
+    Repository,
+    SQLiteRepository,
+    StatusRecord,
+    create_repository,
+)
+
+# The Postgres backend runs against `DATABASE_URL`, migrated to the head revision
+requires_postgres = pytest.mark.skipif(
+    not os.getenv("PSC_TEST_POSTGRES"), reason="PSC_TEST_POSTGRES is not set"
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", pytest.param("postgres", marks=requires_postgres)])
+def backend(request, tmp_path) -> Repository:
+    if request.param == "sqlite":
+        return SQLiteRepository(tmp_path / "psc.sqlite3")
+    return create_repository(request.param)
+
+
+def config(name: str = "wing", parameters_hash: str | None = "hash", **fields) -> ConfigRecord:
+    return ConfigRecord(
+        name=name,
+        description="",
+        parameters=[{"key": "speed", "type": "float", "values": [10.0]}],
+        parameter_count=1,
+        parameters_hash=parameters_hash,
+        **fields,
+    )
+
+
+def run(backend: Repository, scenario):
+    async def main():
+        await backend.start()
+        try:
+            return await scenario()
+        finally:
+            await backend.close()
+
+    return asyncio.run(main())
+
+
+def test_configs_are_stored_listed_and_deleted(backend):
+    first, second = config("first", uuid4().hex), config("second", uuid4().hex)
+
+    async def scenario():
+        stored = [await backend.upsert_config(record) for record in (first, second)]
+        listed = [record.id for record in await backend.list_configs()]
+        fetched = await backend.get_config(first.id, primary=True)
+        deleted = await backend.delete_config(first.id), await backend.delete_config(first.id)
+        return stored, listed, fetched, deleted, await backend.get_config(first.id)
+
+    stored, listed, fetched, deleted, missing = run(backend, scenario)
+
+    assert all(record.created_at is not None for record in stored)
+    assert listed.index(second.id) < listed.index(first.id)
+    assert (fetched.name, fetched.parameters, fetched.ordering) == (
+        "first",
+        first.parameters,
+        "cartesian",
+    )
+    assert deleted == (True, False) and missing is None
+
+
+def test_validation_outcome_is_recorded(backend):
+    pending = config("pending", None, status="PENDING_VALIDATION")
+    other = config("other", uuid4().hex)
+    parameters = [{"key": "speed", "type": "float", "values": [10.0, 20.0]}, {"key": "angle"}]
+
+    async def scenario():
+        await backend.upsert_config(pending)
+        await backend.upsert_config(other)
+        waiting = await backend.pending_config_ids()
+        taken = await backend.set_config_status(
+            pending.id,
+            "READY",
+            parameters=parameters,
+            parameters_hash=other.parameters_hash,
+            total_cases=2,
+        )
+        invalid = await backend.set_config_status(pending.id, "INVALID", reason="bad values")
+        return (
+            waiting,
+            taken,
+            invalid,
+            await backend.pending_config_ids(),
+            await backend.set_config_status(uuid4(), "READY"),
+        )
+
+    waiting, taken, invalid, validated, missing = run(backend, scenario)
+
+    assert pending.id in waiting and other.id not in waiting and pending.id not in validated
+    # The other configuration stays the deduplication target for its hash
+    assert (taken.status, taken.duplicate_of, taken.parameters_hash) == ("INVALID", other.id, None)
+    assert taken.reason == f"An identical configuration already exists with id {other.id}"
+    assert (taken.parameters, taken.parameter_count, taken.total_cases) == (parameters, 2, None)
+    assert (invalid.status, invalid.reason, invalid.parameters, invalid.total_cases) == (
+        "INVALID",
+        "bad values",
+        parameters,
+        None,
+    )
+    assert invalid.duplicate_of is None
+    assert missing is None
+
+
+def test_statuses_and_case_runs(backend):
+    stored = config("runs", uuid4().hex)
+    case_runs = [
+        CaseRunRecord(config_id=stored.id, case_index=0, parameters={"speed": 10.0}, duration=1.0),
+        CaseRunRecord(
+            config_id=stored.id,
+            case_index=1,
+            parameters={"speed": 20.0},
+            duration=2.0,
+            state="FAILED",
+        ),
+        CaseRunRecord(config_id=stored.id, case_index=2, parameters={"speed": 30.0}, duration=3.0),
+    ]
+
+    async def scenario():
+        await backend.upsert_config(stored)
+        running = await backend.add_status(
+            StatusRecord(config_id=stored.id, progress=50, state="RUNNING"), case_runs[:2]
+        )
+        await backend.add_status(
+            StatusRecord(config_id=stored.id, progress=100, state="COMPLETED", total_cases=3),
+            case_runs[2:],
+        )
+        return (
+            running,
+            await backend.latest_status(stored.id),
+            await backend.list_statuses(stored.id),
+            await backend.case_durations(2),
+            await backend.latest_status(uuid4()),
+        )
+
+    running, latest, statuses, durations, missing = run(backend, scenario)
+
+    assert running.created_at is not None
+    assert (latest.state, latest.total_cases) == ("COMPLETED", 3)
+    assert [status.progress for status in statuses] == [100, 50]
+    # Failed case runs are not samples of the runtime model
+    assert durations == [({"speed": 30.0}, 3.0), ({"speed": 10.0}, 1.0)]
+    assert missing is None
+
+
+def test_configs_are_deduplicated_by_hash_and_ordering(backend):
+    parameters_hash = uuid4().hex
+
+    async def scenario():
+        first = await backend.upsert_config(config("first", parameters_hash))
+        duplicate = await backend.upsert_config(config("duplicate", parameters_hash))
+        gray = await backend.upsert_config(config("gray", parameters_hash, ordering="gray"))
+        return first, duplicate, gray
+
+    first, duplicate, gray = run(backend, scenario)
+
+    assert duplicate.id == first.id and duplicate.name == "first"
+    assert gray.id != first.id and gray.ordering == "gray"
+
+
+def test_sqlite_counts_the_cases_of_configs_stored_before_the_count(tmp_path):
+    path = tmp_path / "psc.sqlite3"
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE parameter_sweep_configs (id TEXT PRIMARY KEY, name TEXT NOT NULL, "
+        "description TEXT NOT NULL DEFAULT '', parameters TEXT NOT NULL, "
+        "parameter_count INTEGER NOT NULL, parameters_hash TEXT, "
+        "ordering TEXT NOT NULL DEFAULT 'cartesian', status TEXT NOT NULL DEFAULT 'READY', "
+        "reason TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO parameter_sweep_configs VALUES ('6f1c1a52-8a35-4a3e-9d0c-1d1f1e5b7a10', "
+        '\'old\', \'\', \'[{"key": "speed", "values": [1, 2, 3]}, '
+        '{"key": "turbulence_model", "values": ["k-omega", "k-epsilon"]}]\', '
+        "2, 'hash', 'cartesian', 'READY', NULL, 0, 0)"
+    )
+    connection.commit()
+    connection.close()
+    repository = SQLiteRepository(path)
+
+    configs = run(repository, repository.list_configs)
+
+    assert [stored.total_cases for stored in configs] == [6]
+
+
+def test_sqlite_drops_the_old_hash_only_constraint(tmp_path):
+    path = tmp_path / "psc.sqlite3"
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE parameter_sweep_configs (id TEXT PRIMARY KEY, name TEXT NOT NULL, "
+        "description TEXT NOT NULL DEFAULT '', parameters TEXT NOT NULL, "
+        "parameter_count INTEGER NOT NULL, parameters_hash TEXT UNIQUE, "
+        "ordering TEXT NOT NULL DEFAULT 'cartesian', created_at REAL NOT NULL, "
+        "updated_at REAL NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO parameter_sweep_configs VALUES "
+        "('6f1c1a52-8a35-4a3e-9d0c-1d1f1e5b7a10', 'old', '', '[]', 0, 'hash', 'cartesian', 0, 0)"
+    )
+    connection.commit()
+    connection.close()
+
+    repository = SQLiteRepository(path)
+
+    async def scenario():
+        gray = await repository.upsert_config(config("gray", ordering="gray"))
+        configs = await repository.list_configs()
+        await repository.close()
+        return gray, configs
+
+    gray, configs = asyncio.run(scenario())
+
+    assert gray.name == "gray"
+    assert {(stored.name, stored.status) for stored in configs} == {
+        ("old", "READY"),
+        ("gray", "READY"),
+    }
+
+
+def test_rehashed_configs_no_longer_deduplicate_under_their_old_hash(backend):
+    old_hash, new_hash = uuid4().hex, uuid4().hex
+
+    async def scenario():
+        stored = await backend.upsert_config(config("first", old_hash))
+        await backend.set_config_status(stored.id, "READY", parameters_hash=new_hash)
+        reused = await backend.upsert_config(config("second", old_hash))
+        duplicate = await backend.upsert_config(config("third", new_hash))
+        return stored, reused, duplicate
+
+    stored, reused, duplicate = run(backend, scenario)
+
+    assert reused.id != stored.id and reused.name == "second"
+    assert duplicate.id == stored.id
@@ -0,0 +1,103 @@
+import asyncio
+from uuid import UUID
+
+from fastapi import Response
+
+from psc import server
+from psc.configurator.configurator import ParameterSweepConfigurator
+from psc.configurator.registry import ParameterRegistry
+from psc.configurator.validation import ConfigValidator, config_validator
+from psc.models import ParameterSweepConfigurationRequest
+from psc.server import config_status, create_config, get_config_status, get_configs
+from psc.storage import ConfigRecord
+
+PARAMETERS = [
+    {"key": "speed", "type": "float", "values": [10.0, 20.0, 30.0]},
+    {"key": "turbulence_model", "type": "enum", "values": ["k-omega", "k-epsilon"]},
+]
+
+
+def validate(repository, parameters: list[dict]) -> ConfigRecord:
+    async def scenario():
+        validator = ConfigValidator(repository=repository)
+        config = await validator.submit("wing", "", parameters, "cartesian")
+        assert config_status(config).status == "PENDING_VALIDATION"
+        await validator.wait(config.id, timeout=5)
+        return await repository.get_config(config.id)
+
+    return asyncio.run(scenario())
+
+
+def test_valid_submissions_become_ready_with_their_case_count(repository):
+    config = validate(repository, PARAMETERS)
+
+    assert config.status == "READY" and config.parameters_hash is not None
+    assert config_status(config).total_cases == 6
+
+
+def test_invalid_submissions_record_the_error(repository):
+    config = validate(repository, [{"key": "speed", "type": "float", "values": [-1.0]}])
+
+    assert config.status == "INVALID" and config.total_cases is None
+    assert config.reason.startswith("Parameter validation failed: ")
+
+
+def test_pending_validations_resume_on_start(repository):
+    pending = ConfigRecord(
+        name="wing",
+        description="",
+        parameters=PARAMETERS,
+        parameter_count=2,
+        parameters_hash=None,
+        status="PENDING_VALIDATION",
+    )
+
+    async def scenario():
+        await repository.upsert_config(pending)
+        validator = ConfigValidator(repository=repository)
+        await validator.start()
+        await validator.wait(pending.id, timeout=5)
+        return await repository.get_config(pending.id)
+
+    config = asyncio.run(scenario())
+
+    assert (config.status, config.total_cases) == ("READY", 6)
+
+
+def test_synchronous_creates_store_their_case_count(repository):
+    registry = ParameterRegistry()
+    parameters = [registry.load(param) for param in PARAMETERS]
+
+    async def scenario():
+        configurator = await ParameterSweepConfigurator.create("wing", "", parameters)
+        return await repository.get_config(configurator.id)
+
+    assert asyncio.run(scenario()).total_cases == 6
+
+
+def test_large_sweeps_submitted_twice_are_marked_duplicates(monkeypatch):
+    monkeypatch.setattr(server, "ASYNC_VALIDATION_VALUES", 4)
+    request = ParameterSweepConfigurationRequest(name="wing", description="", parameters=PARAMETERS)
+
+    async def submit() -> UUID:
+        accepted = await create_config(request)
+        assert accepted.status_code == 202
+        return UUID(accepted.headers["Location"].split("/")[2])
+
+    async def scenario():
+        first, second = await submit(), await submit()
+        await asyncio.gather(config_validator.wait(first, 5), config_validator.wait(second, 5))
+        statuses = {}
+        for id in (first, second):
+            response = Response()
+            statuses[id] = (await get_config_status(id, response), response.headers)
+        return first, second, statuses, await get_configs()
+
+    first, second, statuses, configs = asyncio.run(scenario())
+
+    (original, _), (duplicate, headers) = statuses[first], statuses[second]
+    assert original.status == "READY" and original.duplicate_of is None
+    assert (duplicate.status, duplicate.duplicate_of) == ("INVALID", first)
+    assert duplicate.reason == f"An identical configuration already exists with id {first}"
+    assert headers["Location"] == f"/configs/{first}"
+    assert [config.id for config in configs] == [first]